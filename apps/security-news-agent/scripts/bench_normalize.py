@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for Marp slide post-processing.
+
+Compares the chained helpers (strip_whole_code_fence, insert_separators,
+dedupe_separators, ensure_marp_header, remove_presenter_lines) with the
+single-pass normalize_marp_markdown() on large decks, and checks that both
+produce identical output.
+
+Usage:
+    python scripts/bench_normalize.py                 # synthetic 64KB deck
+    python scripts/bench_normalize.py --size-kb 256   # bigger deck
+    python scripts/bench_normalize.py slides/*.md     # archived decks
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from security_news_agent.utils.helpers import (  # noqa: E402
+    dedupe_separators,
+    ensure_marp_header,
+    insert_separators,
+    normalize_marp_markdown,
+    remove_presenter_lines,
+    strip_whole_code_fence,
+)
+
+TITLE = "Daily Security Briefing"
+
+
+def chained(md: str) -> str:
+    """Post-process a deck the way write_slides used to."""
+    md = strip_whole_code_fence(md.strip())
+    md = insert_separators(md)
+    md = dedupe_separators(md)
+    md = ensure_marp_header(md, TITLE)
+    return remove_presenter_lines(md)
+
+
+def single_pass(md: str) -> str:
+    """Post-process a deck with the single-pass normaliser."""
+    return normalize_marp_markdown(md, TITLE)
+
+
+def synthetic_deck(size_kb: int) -> str:
+    """Build raw LLM-style slide output of roughly the given size."""
+    parts = ["```markdown", f"# {TITLE}", "Latest threats and advisories", ""]
+    index = 0
+    while sum(len(part) + 1 for part in parts) < size_kb * 1024:
+        index += 1
+        parts += [
+            f"## CVE-2025-{index:05d} exploited in the wild",
+            "",
+            f"- Vendor advisory {index} covers a remote code execution flaw",
+            "- Patches are available; apply them before the weekend",
+            f"- Source: https://example.com/advisories/{index}",
+            "",
+        ]
+        if index % 10 == 0:
+            parts += ["---", "", "```bash", "---", "apt upgrade", "```", ""]
+    parts.append("```")
+    return "\n".join(parts)
+
+
+def bench(func: Callable[[str], str], decks: List[str], repeat: int) -> float:
+    """Return the best wall time in seconds for processing all decks once."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for deck in decks:
+            func(deck)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Markdown decks to process")
+    parser.add_argument(
+        "--size-kb", type=int, default=64, help="Synthetic deck size in KB"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Timing repetitions"
+    )
+    args = parser.parse_args()
+
+    if args.paths:
+        decks = [Path(p).read_text(encoding="utf-8") for p in args.paths]
+    else:
+        decks = [synthetic_deck(args.size_kb)]
+
+    for deck in decks:
+        if chained(deck) != single_pass(deck):
+            print("ERROR: outputs differ", file=sys.stderr)
+            return 1
+
+    total_mb = sum(len(deck.encode("utf-8")) for deck in decks) / 1024 / 1024
+    print(f"{len(decks)} deck(s), {total_mb * 1024:.0f} KB total")
+    results = {}
+    for name, func in (("chained", chained), ("single-pass", single_pass)):
+        seconds = bench(func, decks, args.repeat)
+        results[name] = seconds
+        print(
+            f"{name:>12}: {seconds * 1000:8.2f} ms  "
+            f"{total_mb / seconds:8.1f} MB/s"
+        )
+    print(f"{'speed-up':>12}: {results['chained'] / results['single-pass']:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Start-up import benchmark for the security_news_agent CLI.
+
+Runs the CLI under ``python -X importtime`` for commands that should start
+quickly, reports the import time of each, and fails if it exceeds the
+threshold or if a heavy dependency that should be deferred is imported.
+
+Usage:
+    python scripts/bench_startup.py                  # default threshold
+    python scripts/bench_startup.py --max-ms 150     # stricter threshold
+    python scripts/bench_startup.py --repeat 10      # more samples
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess  # nosec B404
+import sys
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+SRC = Path(__file__).parent.parent / "src"
+
+# Packages that take most of the start-up time and are only needed once a
+# real workflow runs
+HEAVY = ("langchain_google_genai", "langgraph", "langsmith", "requests", "tenacity")
+
+# (name, CLI arguments, heavy packages it must not import)
+SCENARIOS: List[Tuple[str, List[str], Tuple[str, ...]]] = [
+    ("--help", ["--help"], HEAVY),
+    ("--version", ["--version"], HEAVY),
+    (
+        "--test-mode --validate-only",
+        ["--test-mode", "--validate-only"],
+        ("langchain_google_genai",),
+    ),
+]
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def run_importtime(args: List[str]) -> Tuple[float, Set[str]]:
+    """Run the CLI once and parse its ``-X importtime`` report.
+
+    Args:
+        args: CLI arguments
+
+    Returns:
+        Tuple of the total import time in ms and the imported module names
+    """
+    # No API keys, so --test-mode uses the mock clients
+    env = {"PATH": os.environ.get("PATH", ""), "PYTHONPATH": str(SRC)}
+    result = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-m", "security_news_agent", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            total_us += int(match.group(1))
+            modules.add(match.group(4))
+    return total_us / 1000, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=250.0,
+        help="Fail if the median import time of a command exceeds this",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per command"
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for name, cli_args, forbidden in SCENARIOS:
+        samples = []
+        imported: Dict[str, bool] = {}
+        for _ in range(args.repeat):
+            ms, modules = run_importtime(cli_args)
+            samples.append(ms)
+            for package in forbidden:
+                imported[package] = imported.get(package, False) or any(
+                    m == package or m.startswith(package + ".") for m in modules
+                )
+
+        median = statistics.median(samples)
+        heavy = [package for package, seen in imported.items() if seen]
+        # Only the quick commands are held to the threshold; the test-mode
+        # run builds the LangGraph workflow on purpose
+        over = forbidden == HEAVY and median > args.max_ms
+        status = "FAIL" if over or heavy else "ok"
+        print(
+            f"{name:>28}: {median:8.1f} ms median  "
+            f"({min(samples):.1f}-{max(samples):.1f})  {status}"
+        )
+        if heavy:
+            print(f"{'':>28}  imported: {', '.join(heavy)}")
+        if over:
+            print(f"{'':>28}  over the {args.max_ms:.0f} ms threshold")
+        failed = failed or over or bool(heavy)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
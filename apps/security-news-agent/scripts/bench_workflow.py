@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Offline throughput benchmark for the full workflow on mock clients.
+
+Runs SecurityNewsWorkflow end to end against MockTavilyClient and
+MockChatGoogleGenerativeAI with injected latency, payload sizes and
+failure rates, then reports runs/sec, p50/p95 latency per node and for
+the whole run, and the peak RSS. Injected latency dominates the timings,
+so a scenario gives comparable numbers on different machines.
+
+With --baseline the results are compared with a stored baseline of the
+same scenario and the script fails if throughput, a p95 latency or the
+peak RSS regressed by more than the tolerance.
+
+Usage:
+    python scripts/bench_workflow.py                          # default scenario
+    python scripts/bench_workflow.py --runs 50 --llm-latency-ms 50
+    python scripts/bench_workflow.py --llm-failure-rate 0.05 --search-failure-rate 0.2
+    python scripts/bench_workflow.py --baseline scripts/bench_workflow_baseline.json
+    python scripts/bench_workflow.py --save-baseline scripts/bench_workflow_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# Keep the benchmark offline even if tracing is configured in the shell
+os.environ["LANGCHAIN_TRACING_V2"] = "false"
+
+from security_news_agent.config.settings import AgentConfig  # noqa: E402
+from security_news_agent.processing.mock_clients import (  # noqa: E402
+    MockChatGoogleGenerativeAI,
+    MockTavilyClient,
+)
+from security_news_agent.processing.workflow import (  # noqa: E402
+    SecurityNewsWorkflow,
+)
+from security_news_agent.utils.metrics import RunMetrics  # noqa: E402
+
+# Options that define a scenario; a baseline only applies to the same ones
+SCENARIO_KEYS = (
+    "runs",
+    "search_latency_ms",
+    "search_failure_rate",
+    "search_workers",
+    "results_per_query",
+    "content_chars",
+    "llm_latency_ms",
+    "llm_failure_rate",
+    "slides_kb",
+    "seed",
+)
+
+# Latency differences below this are noise, however small the baseline
+MIN_SLACK_MS = 2.0
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sample list."""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, if the OS reports it."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_once(
+    config: AgentConfig,
+    tavily: MockTavilyClient,
+    llm: MockChatGoogleGenerativeAI,
+) -> Dict[str, Any]:
+    """Run the workflow once and collect its timings.
+
+    Returns:
+        Dictionary with the run's wall time, per-node seconds and whether
+        it ended with an error
+    """
+    metrics = RunMetrics()
+    workflow = SecurityNewsWorkflow(config, tavily, llm_client=llm, metrics=metrics)
+    started = time.perf_counter()
+    result = workflow.run()
+    seconds = time.perf_counter() - started
+    nodes = {
+        name: stats["seconds"] for name, stats in metrics.report()["nodes"].items()
+    }
+    return {"seconds": seconds, "nodes": nodes, "failed": bool(result.get("error"))}
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-run timings into throughput and latency percentiles."""
+    total = sum(run["seconds"] for run in runs)
+    latencies = [run["seconds"] * 1000 for run in runs]
+    node_samples: Dict[str, List[float]] = {}
+    for run in runs:
+        for name, seconds in run["nodes"].items():
+            node_samples.setdefault(name, []).append(seconds * 1000)
+
+    return {
+        "runs_per_sec": len(runs) / total if total else 0.0,
+        "failed_runs": sum(run["failed"] for run in runs),
+        "run_p50_ms": percentile(latencies, 50),
+        "run_p95_ms": percentile(latencies, 95),
+        "nodes": {
+            name: {
+                "p50_ms": percentile(samples, 50),
+                "p95_ms": percentile(samples, 95),
+            }
+            for name, samples in sorted(node_samples.items())
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """List the metrics that regressed against a baseline.
+
+    Args:
+        results: Summary of this benchmark
+        baseline: Summary of the baseline
+        tolerance: Allowed relative regression (0.25 = 25%)
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+
+    def slower(name: str, value: float, base: float) -> None:
+        limit = max(base * (1 + tolerance), base + MIN_SLACK_MS)
+        if value > limit:
+            regressions.append(f"{name}: {value:.1f} ms > {limit:.1f} ms")
+
+    floor = baseline["runs_per_sec"] * (1 - tolerance)
+    if results["runs_per_sec"] < floor:
+        regressions.append(
+            f"runs/sec: {results['runs_per_sec']:.2f} < {floor:.2f}"
+        )
+    slower("run p95", results["run_p95_ms"], baseline["run_p95_ms"])
+    for name, stats in baseline["nodes"].items():
+        if name in results["nodes"]:
+            slower(
+                f"{name} p95", results["nodes"][name]["p95_ms"], stats["p95_ms"]
+            )
+
+    rss, base_rss = results["peak_rss_mb"], baseline.get("peak_rss_mb")
+    if rss is not None and base_rss is not None:
+        limit = base_rss * (1 + tolerance)
+        if rss > limit:
+            regressions.append(f"peak RSS: {rss:.1f} MB > {limit:.1f} MB")
+    return regressions
+
+
+def print_summary(summary: Dict[str, Any], runs: int) -> None:
+    """Print a summary as a table."""
+    print(
+        f"{runs} runs, {summary['failed_runs']} failed, "
+        f"{summary['runs_per_sec']:.2f} runs/sec"
+    )
+    print(f"{'':>16}  {'p50 ms':>9}  {'p95 ms':>9}")
+    for name, stats in summary["nodes"].items():
+        print(f"{name:>16}  {stats['p50_ms']:9.1f}  {stats['p95_ms']:9.1f}")
+    print(
+        f"{'run':>16}  {summary['run_p50_ms']:9.1f}  {summary['run_p95_ms']:9.1f}"
+    )
+    if summary["peak_rss_mb"] is not None:
+        print(f"{'peak RSS':>16}  {summary['peak_rss_mb']:9.1f} MB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Measured runs")
+    parser.add_argument(
+        "--warmup", type=int, default=2, help="Unmeasured runs before timing"
+    )
+    parser.add_argument(
+        "--search-latency-ms", type=float, default=20, help="Latency per search"
+    )
+    parser.add_argument(
+        "--search-failure-rate",
+        type=float,
+        default=0.0,
+        help="Share of searches that fail",
+    )
+    parser.add_argument(
+        "--search-workers", type=int, default=4, help="Concurrent searches"
+    )
+    parser.add_argument(
+        "--results-per-query", type=int, default=5, help="Results per search"
+    )
+    parser.add_argument(
+        "--content-chars", type=int, default=600, help="Length of each result"
+    )
+    parser.add_argument(
+        "--llm-latency-ms", type=float, default=20, help="Latency per LLM call"
+    )
+    parser.add_argument(
+        "--llm-failure-rate",
+        type=float,
+        default=0.0,
+        help="Share of LLM calls that fail",
+    )
+    parser.add_argument(
+        "--slides-kb", type=int, default=16, help="Size of the generated deck"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--baseline", help="Fail on regressions against this baseline file"
+    )
+    parser.add_argument(
+        "--save-baseline", help="Write the results as a new baseline file"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative regression against the baseline",
+    )
+    args = parser.parse_args()
+    scenario = {key: getattr(args, key) for key in SCENARIO_KEYS}
+
+    config = AgentConfig(
+        google_api_key="mock-google-key",
+        langchain_api_key="mock-langchain-key",
+        tavily_api_key="mock-tavily-key",
+        langchain_tracing_v2=False,
+        search_max_workers=args.search_workers,
+    )
+    tavily = MockTavilyClient(
+        config.tavily_api_key,
+        latency=args.search_latency_ms / 1000,
+        failure_rate=args.search_failure_rate,
+        results_per_query=args.results_per_query,
+        content_chars=args.content_chars,
+        seed=args.seed,
+        max_workers=args.search_workers,
+    )
+    llm = MockChatGoogleGenerativeAI(
+        model=config.gemini_model_name,
+        latency=args.llm_latency_ms / 1000,
+        failure_rate=args.llm_failure_rate,
+        slides_chars=args.slides_kb * 1024,
+        seed=args.seed,
+        verbose=False,
+    )
+
+    # Injected failures are logged as errors; keep the report readable
+    logging.disable(logging.CRITICAL)
+    runs = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index in range(args.warmup + args.runs):
+            run = run_once(config, tavily, llm)
+            if index >= args.warmup:
+                runs.append(run)
+    logging.disable(logging.NOTSET)
+    tavily.close()
+
+    summary = summarize(runs)
+    print_summary(summary, args.runs)
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(
+            json.dumps({"scenario": scenario, **summary}, indent=2) + "\n",
+            encoding="utf-8",
+        )
+        print(f"Baseline written to {args.save_baseline}")
+
+    if not args.baseline:
+        return 0
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    if baseline.get("scenario") != scenario:
+        print(
+            "ERROR: the baseline was recorded for a different scenario: "
+            f"{baseline.get('scenario')}",
+            file=sys.stderr,
+        )
+        return 2
+    regressions = compare(summary, baseline, args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print(f"No regressions against {args.baseline} (±{args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
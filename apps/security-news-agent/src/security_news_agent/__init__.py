@@ -1,15 +1,32 @@
 """Security News Agent - AI-powered security news collection and reporting."""
 
+from typing import TYPE_CHECKING
+
+from .utils.lazy import lazy_exports
+
 __version__ = "0.2.0"
 __author__ = "Jules"
 __description__ = (
     "An AI agent that collects security news and generates reports"
 )
 
-from .config.settings import AgentConfig
-from .output.renderer import ReportRenderer
-from .processing.workflow import SecurityNewsWorkflow
-from .search.tavily_client import TavilyClient
+if TYPE_CHECKING:
+    from .config.settings import AgentConfig
+    from .output.renderer import ReportRenderer
+    from .processing.workflow import SecurityNewsWorkflow
+    from .search.tavily_client import TavilyClient
+
+# LangChain, LangGraph and the HTTP stack take seconds to import, so the
+# public classes are only imported when first used
+__getattr__ = lazy_exports(
+    globals(),
+    {
+        "AgentConfig": ".config.settings",
+        "ReportRenderer": ".output.renderer",
+        "SecurityNewsWorkflow": ".processing.workflow",
+        "TavilyClient": ".search.tavily_client",
+    },
+)
 
 __all__ = [
     "AgentConfig",
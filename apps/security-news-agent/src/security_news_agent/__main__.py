@@ -8,19 +8,34 @@ Refactored from monolithic script to use proper separation of concerns.
 
 import argparse
 import sys
+from pathlib import Path
 
-from .config.settings import AgentConfig, ConfigurationError
-from .output.renderer import ReportRenderer
-from .processing.mock_clients import (
-    MockChatGoogleGenerativeAI,
-    MockTavilyClient,
+from .config.settings import (
+    DEFAULT_CHECKPOINT_PATH,
+    AgentConfig,
+    ConfigurationError,
 )
-from .processing.workflow import SecurityNewsWorkflow
-from .search.tavily_client import TavilyClient
+from .output.render_cache import RenderCache
+from .output.renderer import ReportRenderer
+from .processing.llm_cache import LLMResponseCache
+from .search.cache import SearchCache
+from .search.rate_limit import RequestBudget, TokenBucket
 from .utils.error_handling import SecurityNewsAgentError, handle_errors
+from .utils.helpers import read_topics_file
 from .utils.logging_config import ProgressLogger, setup_logging
+from .utils.metrics import RunMetrics
 from .processing.state import State
-from typing import Any, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+# The workflow and the real clients pull in LangChain, LangGraph and the
+# HTTP stack, so they are imported where first used; --help, --version and
+# mock test runs then start without them
+if TYPE_CHECKING:
+    from .processing.checkpoint import SQLiteCheckpointer
+    from .processing.mock_clients import MockTavilyClient
+    from .processing.sources import SourceStore
+    from .processing.workflow import SecurityNewsWorkflow
+    from .search.tavily_client import TavilyClient
 
 
 def create_argument_parser() -> argparse.ArgumentParser:
@@ -38,6 +53,8 @@ Examples:
   python -m security_news_agent --test-mode        # Run in test mode
   python -m security_news_agent --log-level DEBUG # Debug logging
   python -m security_news_agent --output-dir ./reports
+  python -m security_news_agent --topics-file topics.txt --workers 4
+  python -m security_news_agent --resume 20250914-063000-1a2b3c4d
         """,
     )
 
@@ -47,6 +64,32 @@ Examples:
         help="Topic for the security briefing (default: %(default)s)",
     )
 
+    # A checkpointed run is a single briefing; batches cannot be resumed
+    run_mode = parser.add_mutually_exclusive_group()
+
+    run_mode.add_argument(
+        "--topics-file",
+        help=(
+            "Run one briefing per line of this file in a single process, "
+            "sharing clients and the collected news"
+        ),
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help=(
+            "Number of briefings run concurrently with --topics-file "
+            "(default: BATCH_MAX_WORKERS)"
+        ),
+    )
+
+    run_mode.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Continue a checkpointed run from its last completed step",
+    )
+
     parser.add_argument(
         "--test-mode",
         action="store_true",
@@ -90,13 +133,173 @@ Examples:
     return parser
 
 
+def create_tavily_client(
+    config: AgentConfig,
+    metrics: Optional[RunMetrics] = None,
+    persistent: bool = True,
+) -> "TavilyClient":
+    """Create a Tavily client with caching, pacing and budgets from config.
+
+    With ``persistent=False`` the search cache and request budget, which
+    keep files, are left out.
+    """
+    from .search.tavily_client import TavilyClient
+
+    search_cache = None
+    if persistent and config.search_cache_path:
+        search_cache = SearchCache(
+            config.search_cache_path,
+            max_bytes=config.search_cache_max_mb * 1024 * 1024,
+        )
+
+    rate_limiter = None
+    if config.search_rate_limit_per_minute:
+        rate_limiter = TokenBucket(
+            config.search_rate_limit_per_minute, burst=config.search_rate_burst
+        )
+
+    budget = None
+    budgeted = config.search_budget_per_run or config.search_budget_per_day
+    if persistent and budgeted:
+        budget = RequestBudget(
+            per_run=config.search_budget_per_run,
+            per_day=config.search_budget_per_day,
+            path=config.search_budget_path or None,
+        )
+
+    return TavilyClient(
+        config.tavily_api_key,
+        max_workers=config.search_max_workers,
+        pool_size=config.search_pool_size,
+        cache=search_cache,
+        rate_limiter=rate_limiter,
+        budget=budget,
+        near_duplicate_distance=config.search_near_duplicate_distance or None,
+        metrics=metrics,
+    )
+
+
+def create_clients(
+    args: argparse.Namespace,
+    config: AgentConfig,
+    metrics: Optional[RunMetrics],
+    persistent: bool,
+) -> Tuple[Union["TavilyClient", "MockTavilyClient"], Any]:
+    """Create the search and LLM clients; mocks in test mode without keys.
+
+    Returns:
+        Tavily client and the LLM client, which is None when the workflow
+        creates the Gemini client itself
+    """
+    if not (args.test_mode and "mock" in config.google_api_key):
+        if args.test_mode:
+            print("🧪 Running in test mode with REAL API keys.")
+        return create_tavily_client(config, metrics, persistent), None
+
+    from .processing.mock_clients import (
+        MockChatGoogleGenerativeAI,
+        MockTavilyClient,
+    )
+
+    print("🧪 API keys not found or incomplete. Using MOCK clients for test mode.")
+    return (
+        MockTavilyClient(api_key=config.tavily_api_key),
+        MockChatGoogleGenerativeAI(model=config.gemini_model_name),
+    )
+
+
+def create_llm_cache(config: AgentConfig) -> Optional[LLMResponseCache]:
+    """Create the LLM response cache from config, if enabled."""
+    if not config.llm_cache_path:
+        return None
+    return LLMResponseCache(
+        config.llm_cache_path,
+        max_bytes=config.llm_cache_max_mb * 1024 * 1024,
+        ttl=config.llm_cache_ttl_hours * 60 * 60,
+    )
+
+
+@handle_errors(reraise=True)
+def create_render_cache(config: AgentConfig) -> Optional[RenderCache]:
+    """Create the rendered deck cache from config, if enabled."""
+    if not config.render_cache_path:
+        return None
+    return RenderCache(
+        config.render_cache_path,
+        max_bytes=config.render_cache_max_mb * 1024 * 1024,
+    )
+
+
 @handle_errors(reraise=True)
+def create_checkpointer(config: AgentConfig) -> Optional["SQLiteCheckpointer"]:
+    """Create the workflow checkpoint store from config, if enabled."""
+    if not config.checkpoint_path:
+        return None
+    from .processing.checkpoint import SQLiteCheckpointer
+
+    return SQLiteCheckpointer(
+        config.checkpoint_path, max_age_days=config.checkpoint_max_age_days
+    )
+
+
+def create_source_store(
+    config: AgentConfig, tavily_client: Union["TavilyClient", "MockTavilyClient"]
+) -> Optional["SourceStore"]:
+    """Create a disk-backed source store next to the checkpoints, if enabled.
+
+    Checkpoints refer to the collected news by id, so a run resumed in a
+    new process needs the news saved alongside them.
+    """
+    if not config.checkpoint_path:
+        return None
+    from .processing.sources import SourceStore
+
+    return SourceStore(
+        render=tavily_client.format_context_as_markdown,
+        directory=str(Path(config.checkpoint_path).parent / "sources"),
+        max_age_days=config.checkpoint_max_age_days,
+    )
+
+
+def create_run_metrics(config: AgentConfig) -> Optional[RunMetrics]:
+    """Create the run metrics collector if a metrics file is configured."""
+    if not (config.metrics_path or config.metrics_prometheus_path):
+        return None
+    return RunMetrics(
+        input_cost_per_mtok=config.llm_input_cost_per_mtok,
+        output_cost_per_mtok=config.llm_output_cost_per_mtok,
+    )
+
+
+def write_run_metrics(config: AgentConfig, metrics: RunMetrics) -> None:
+    """Write the run metrics to the configured JSON and Prometheus files."""
+    outputs = [
+        (config.metrics_path, metrics.write_json),
+        (config.metrics_prometheus_path, metrics.write_prometheus),
+    ]
+    for path, write in outputs:
+        if not path:
+            continue
+        try:
+            write(path)
+        except OSError as e:
+            print(f"⚠️ Failed to write metrics to {path}: {e}")
+            continue
+        print(f"📈 Metrics written to: {path}")
+
+
 def load_configuration(
-    config_file: Optional[str] = None, test_mode: bool = False
+    config_file: Optional[str] = None, test_mode: bool = False, resume: bool = False
 ) -> AgentConfig:
-    """Load and validate configuration."""
+    """Load and validate configuration.
+
+    ``--resume`` needs checkpoints, so without CHECKPOINT_PATH it reads
+    them from the default location.
+    """
     try:
         config = AgentConfig.from_env(config_file, test_mode=test_mode)
+        if resume and not config.checkpoint_path:
+            config.checkpoint_path = DEFAULT_CHECKPOINT_PATH
         config.setup_environment()
         return config
     except ConfigurationError as e:
@@ -113,8 +316,8 @@ def load_configuration(
 
 def validate_prerequisites(
     config: AgentConfig,
-    tavily_client: TavilyClient,
-    workflow: SecurityNewsWorkflow,
+    tavily_client: "TavilyClient",
+    workflow: "SecurityNewsWorkflow",
 ) -> bool:
     """Validate all prerequisites for running the workflow."""
     print("🔍 Validating prerequisites...")
@@ -137,7 +340,7 @@ def validate_prerequisites(
 
 
 def print_workflow_summary(
-    workflow: SecurityNewsWorkflow, config: AgentConfig, output_dir: str
+    workflow: "SecurityNewsWorkflow", config: AgentConfig, output_dir: str
 ) -> None:
     """Print summary of workflow configuration."""
     summary = workflow.get_workflow_summary()
@@ -152,34 +355,53 @@ def print_workflow_summary(
 
 
 def _setup_workflow_environment(
-    config: AgentConfig, workflow: SecurityNewsWorkflow, topic: str, test_mode: bool
+    config: AgentConfig, workflow: "SecurityNewsWorkflow", topic: str, test_mode: bool
 ) -> State:
     """Set up the workflow environment and create initial state."""
     initial_state = workflow.create_initial_state(topic)
 
     if test_mode:
-        print("🧪 Running in test mode - using limited API calls")
-        # Set test-specific search queries
-        config._test_queries = [
-            {
-                "q": "cybersecurity news",
-                "include_domains": ["thehackernews.com"],
-                "time_range": "week",
-            }
-        ]
+        _use_test_queries(config)
 
     return initial_state
 
 
+def _use_test_queries(config: AgentConfig) -> None:
+    """Limit the search queries for test mode."""
+    print("🧪 Running in test mode - using limited API calls")
+    # Set test-specific search queries
+    config._test_queries = [
+        {
+            "q": "cybersecurity news",
+            "include_domains": ["thehackernews.com"],
+            "time_range": "week",
+        }
+    ]
+
+
 def _execute_workflow_steps(
-    workflow: SecurityNewsWorkflow, initial_state: State
+    workflow: "SecurityNewsWorkflow",
+    initial_state: State,
+    resume: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Execute the workflow and return the result."""
-    return workflow.run(initial_state)
+    """Execute or resume the workflow and return the result."""
+    if resume:
+        return workflow.resume(resume)
+
+    run_id = workflow.new_run_id() if workflow.checkpointer else None
+    if run_id:
+        print(f"🧷 Run ID: {run_id}")
+    result = workflow.run(initial_state, run_id=run_id)
+    if run_id and result.get("error"):
+        print(f"💡 Continue this run with: --resume {run_id}")
+    return result
 
 
 def _handle_workflow_results(
-    result: Dict[str, Any], renderer: ReportRenderer, progress: ProgressLogger
+    result: Dict[str, Any],
+    renderer: ReportRenderer,
+    progress: ProgressLogger,
+    filename: str = "",
 ) -> bool:
     """Handle workflow results including validation, rendering, and output display."""
     # Check for errors
@@ -209,7 +431,7 @@ def _handle_workflow_results(
 
     # Save and render output
     render_result = renderer.save_and_render(
-        result["slide_md"], result.get("title", "Security News Report")
+        result["slide_md"], result.get("title", "Security News Report"), filename
     )
 
     if not render_result["success"]:
@@ -222,8 +444,11 @@ def _handle_workflow_results(
     print("\n🎉 Security news report generated successfully!")
     print(f"📄 Markdown: {render_result['markdown_path']}")
 
-    if render_result["rendered_path"]:
-        print(f"📊 Rendered: {render_result['rendered_path']}")
+    for output_format, path in render_result["rendered_paths"].items():
+        seconds = render_result["render_seconds"][output_format]
+        print(f"📊 Rendered {output_format}: {path} ({seconds:.1f}s)")
+    if render_result["error"]:
+        print(f"⚠️ Rendering: {render_result['error']}")
 
     # Display workflow statistics
     print("\n📊 Workflow Statistics:")
@@ -239,13 +464,14 @@ def _handle_workflow_results(
 
 def run_workflow(
     config: AgentConfig,
-    tavily_client: Union[TavilyClient, MockTavilyClient],
-    workflow: SecurityNewsWorkflow,
+    tavily_client: Union["TavilyClient", "MockTavilyClient"],
+    workflow: "SecurityNewsWorkflow",
     renderer: ReportRenderer,
     topic: str,
     test_mode: bool = False,
+    resume: Optional[str] = None,
 ) -> bool:
-    """Run the complete security news workflow."""
+    """Run the complete security news workflow, or resume a checkpointed run."""
 
     # Create progress logger
     logger = setup_logging(level="INFO")
@@ -258,7 +484,7 @@ def run_workflow(
 
         # Step 2: Execute workflow
         progress.step("Executing security news workflow")
-        result = _execute_workflow_steps(workflow, initial_state)
+        result = _execute_workflow_steps(workflow, initial_state, resume)
 
         # Step 3-6: Handle results, validation, rendering, and display
         progress.step("Checking workflow results")
@@ -283,6 +509,121 @@ def run_workflow(
         return False
 
 
+def run_batch_workflow(
+    config: AgentConfig,
+    workflow: "SecurityNewsWorkflow",
+    renderer: ReportRenderer,
+    topics: List[str],
+    max_workers: int,
+    test_mode: bool = False,
+) -> bool:
+    """Run one briefing per topic and save each report."""
+    logger = setup_logging(level="INFO")
+    progress = ProgressLogger(logger, "Security News Batch", 2)
+
+    try:
+        if test_mode:
+            _use_test_queries(config)
+
+        progress.step(f"Executing {len(topics)} briefings")
+        results = workflow.run_batch(topics, max_workers=max_workers)
+
+        progress.step("Saving and rendering reports")
+        succeeded = 0
+        for topic, result in zip(topics, results):
+            print(f"\n📰 {topic}")
+            topic_progress = ProgressLogger(logger, f"Briefing '{topic}'", 1)
+            topic_progress.step("Saving and rendering report")
+            # Titles do not depend on the topic, so name files after it
+            filename = renderer.generate_filename(topic).name
+            if _handle_workflow_results(
+                result, renderer, topic_progress, filename
+            ):
+                topic_progress.complete(success=True)
+                succeeded += 1
+
+        print(f"\n📦 Batch finished: {succeeded}/{len(topics)} briefings succeeded")
+        progress.complete(success=succeeded == len(topics))
+        return succeeded == len(topics)
+
+    except SecurityNewsAgentError as e:
+        print(f"❌ Security News Agent Error: {e.message}")
+        if e.details:
+            print(f"   Details: {e.details}")
+        progress.complete(success=False)
+        return False
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        progress.complete(success=False)
+        return False
+
+
+def apply_report_retention(config: AgentConfig, renderer: ReportRenderer) -> None:
+    """Delete old reports according to the configured retention policy."""
+    limits = (
+        config.report_keep,
+        config.report_max_age_days,
+        config.report_max_total_mb,
+    )
+    if not any(limits):
+        return
+
+    deleted = renderer.cleanup_old_files(
+        keep_count=config.report_keep,
+        max_age_days=config.report_max_age_days,
+        max_total_bytes=config.report_max_total_mb * 1024 * 1024,
+    )
+    if deleted:
+        print(f"🧹 Removed {deleted} old report files")
+
+
+def run_topics_file(
+    args: argparse.Namespace,
+    config: AgentConfig,
+    workflow: "SecurityNewsWorkflow",
+    renderer: ReportRenderer,
+) -> bool:
+    """Run a batch over the topics listed in ``--topics-file``."""
+    topics = read_topics_file(args.topics_file)
+    if not topics:
+        print(f"❌ No topics found in {args.topics_file}")
+        return False
+
+    workers = args.workers or config.batch_max_workers
+    print(f"\n🚀 Starting batch of {len(topics)} briefings with {workers} workers")
+    return run_batch_workflow(
+        config=config,
+        workflow=workflow,
+        renderer=renderer,
+        topics=topics,
+        max_workers=workers,
+        test_mode=args.test_mode,
+    )
+
+
+def run_single_topic(
+    args: argparse.Namespace,
+    config: AgentConfig,
+    tavily_client: Union["TavilyClient", "MockTavilyClient"],
+    workflow: "SecurityNewsWorkflow",
+    renderer: ReportRenderer,
+) -> bool:
+    """Run the briefing for ``--topic``, or continue the ``--resume`` run."""
+    if args.resume:
+        print(f"\n♻️ Resuming run {args.resume}")
+    else:
+        print(f"\n🚀 Starting workflow with topic: '{args.topic}'")
+    return run_workflow(
+        config=config,
+        tavily_client=tavily_client,
+        workflow=workflow,
+        renderer=renderer,
+        topic=args.topic,
+        test_mode=args.test_mode,
+        resume=args.resume,
+    )
+
+
 def main() -> None:
     """Main entry point."""
     parser = create_argument_parser()
@@ -296,36 +637,46 @@ def main() -> None:
     print("🔐 Security News Agent v0.2.0")
     print("=" * 50)
 
+    tavily_client: Optional[Union["TavilyClient", "MockTavilyClient"]] = None
+    llm_cache: Optional[LLMResponseCache] = None
+    checkpointer: Optional["SQLiteCheckpointer"] = None
+    renderer: Optional[ReportRenderer] = None
+    metrics: Optional[RunMetrics] = None
+
     try:
         # Load configuration
         print("⚙️ Loading configuration...")
-        config = load_configuration(args.config_file, test_mode=args.test_mode)
+        config = load_configuration(
+            args.config_file, test_mode=args.test_mode, resume=bool(args.resume)
+        )
 
         # Create components
         print("🔧 Initializing components...")
+        from .processing.workflow import SecurityNewsWorkflow
 
-        use_mock_clients = args.test_mode and "mock" in config.google_api_key
+        # A validation-only run must leave nothing behind, so it gets no
+        # caches, checkpoints, budget or metrics files
+        persistent = not args.validate_only
+        checkpointer = create_checkpointer(config) if persistent else None
+        metrics = create_run_metrics(config) if persistent else None
 
-        tavily_client: Union[TavilyClient, MockTavilyClient]
-        if use_mock_clients:
-            print(
-                "🧪 API keys not found or incomplete. "
-                "Using MOCK clients for test mode."
-            )
-            tavily_client = MockTavilyClient(api_key=config.tavily_api_key)
-            llm_client = MockChatGoogleGenerativeAI(
-                model=config.gemini_model_name
-            )
-            workflow = SecurityNewsWorkflow(
-                config, tavily_client, llm_client=llm_client
-            )
-        else:
-            if args.test_mode:
-                print("🧪 Running in test mode with REAL API keys.")
-            tavily_client = TavilyClient(config.tavily_api_key)
-            workflow = SecurityNewsWorkflow(config, tavily_client)
-
-        renderer = ReportRenderer(config, args.output_dir)
+        tavily_client, llm_client = create_clients(
+            args, config, metrics, persistent
+        )
+        source_store = (
+            create_source_store(config, tavily_client) if persistent else None
+        )
+        if persistent and llm_client is None:
+            llm_cache = create_llm_cache(config)
+        workflow = SecurityNewsWorkflow(
+            config,
+            tavily_client,
+            llm_client=llm_client,
+            llm_cache=llm_cache,
+            checkpointer=checkpointer,
+            metrics=metrics,
+            source_store=source_store,
+        )
 
         # Validate prerequisites
         if not validate_prerequisites(config, tavily_client, workflow):
@@ -339,18 +690,20 @@ def main() -> None:
             print("\n✅ Validation complete - all systems ready")
             sys.exit(0)
 
-        # Run workflow
-        print(f"\n🚀 Starting workflow with topic: '{args.topic}'")
-        success = run_workflow(
-            config=config,
-            tavily_client=tavily_client,
-            workflow=workflow,
-            renderer=renderer,
-            topic=args.topic,
-            test_mode=args.test_mode,
+        renderer = ReportRenderer(
+            config, args.output_dir, render_cache=create_render_cache(config)
         )
 
+        # Run workflow
+        if args.topics_file:
+            success = run_topics_file(args, config, workflow, renderer)
+        else:
+            success = run_single_topic(
+                args, config, tavily_client, workflow, renderer
+            )
+
         if success:
+            apply_report_retention(config, renderer)
             print("\n✅ Security news agent completed successfully!")
             sys.exit(0)
         else:
@@ -364,6 +717,17 @@ def main() -> None:
         logger.error(f"Unexpected error in main: {e}", exc_info=True)
         print(f"\n❌ Unexpected error: {e}")
         sys.exit(1)
+    finally:
+        if tavily_client is not None:
+            tavily_client.close()
+        if llm_cache is not None:
+            llm_cache.close()
+        if checkpointer is not None:
+            checkpointer.close()
+        if renderer is not None:
+            renderer.close()
+        if metrics is not None:
+            write_run_metrics(config, metrics)
 
 
 if __name__ == "__main__":
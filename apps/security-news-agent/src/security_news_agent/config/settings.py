@@ -1,11 +1,15 @@
 """Configuration management for the security news agent."""
 
+import importlib.util
 import os
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
 
+# Checkpoint store --resume reads when CHECKPOINT_PATH is not set
+DEFAULT_CHECKPOINT_PATH = ".cache/checkpoints.sqlite3"
+
 
 class ConfigurationError(Exception):
     """Raised when configuration is invalid or missing."""
@@ -13,6 +17,50 @@ class ConfigurationError(Exception):
     pass
 
 
+def _int_env(name: str, default: int) -> int:
+    """Read an integer environment variable.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or empty
+
+    Returns:
+        Parsed integer value
+
+    Raises:
+        ConfigurationError: If the value is not a valid integer
+    """
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise ConfigurationError(f"Invalid {name} '{raw}'. Must be an integer")
+
+
+def _float_env(name: str, default: float) -> float:
+    """Read a floating point environment variable.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or empty
+
+    Returns:
+        Parsed float value
+
+    Raises:
+        ConfigurationError: If the value is not a valid number
+    """
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        raise ConfigurationError(f"Invalid {name} '{raw}'. Must be a number")
+
+
 @dataclass
 class AgentConfig:
     """Configuration settings for the security news agent."""
@@ -24,9 +72,43 @@ class AgentConfig:
     slide_format: str = "pdf"
     marp_theme: str = "default"
     marp_paginate: bool = True
+    marp_server: bool = False
+    marp_server_workers: int = 2
+    render_max_workers: int = 3
+    render_cache_path: str = ""
+    render_cache_max_mb: int = 512
+    report_keep: int = 0
+    report_max_age_days: int = 0
+    report_max_total_mb: int = 0
+    report_compression: str = ""
     langchain_tracing_v2: bool = True
     langchain_endpoint: str = "https://api.smith.langchain.com"
     langchain_project: str = "security-news-agent"
+    search_max_workers: int = 4
+    search_pool_size: int = 10
+    search_cache_path: str = ""
+    search_cache_max_mb: int = 64
+    search_rate_limit_per_minute: int = 60
+    search_rate_burst: int = 5
+    search_budget_per_run: int = 0
+    search_budget_per_day: int = 0
+    search_budget_path: str = ".cache/tavily_budget.sqlite3"
+    search_near_duplicate_distance: int = 10
+    outline_context_tokens: int = 4000
+    slides_context_tokens: int = 8000
+    llm_cache_path: str = ""
+    llm_cache_ttl_hours: int = 24
+    llm_cache_max_mb: int = 64
+    slide_repair: bool = True
+    slides_streaming: bool = False
+    slides_partial_path: str = ""
+    batch_max_workers: int = 4
+    checkpoint_path: str = ""
+    checkpoint_max_age_days: int = 7
+    metrics_path: str = ""
+    metrics_prometheus_path: str = ""
+    llm_input_cost_per_mtok: float = 0.0
+    llm_output_cost_per_mtok: float = 0.0
     _test_queries: Optional[List[Dict[str, Any]]] = field(
         default=None, repr=False, compare=False
     )
@@ -94,6 +176,15 @@ class AgentConfig:
         slide_format = os.getenv("SLIDE_FORMAT", "pdf").lower().strip()
         marp_theme = os.getenv("MARP_THEME", "default")
         marp_paginate = os.getenv("MARP_PAGINATE", "true").lower() == "true"
+        marp_server = os.getenv("MARP_SERVER", "false").lower() == "true"
+        marp_server_workers = _int_env("MARP_SERVER_WORKERS", 2)
+        render_max_workers = _int_env("RENDER_MAX_WORKERS", 3)
+        render_cache_path = os.getenv("RENDER_CACHE_PATH", "").strip()
+        render_cache_max_mb = _int_env("RENDER_CACHE_MAX_MB", 512)
+        report_keep = _int_env("REPORT_KEEP", 0)
+        report_max_age_days = _int_env("REPORT_MAX_AGE_DAYS", 0)
+        report_max_total_mb = _int_env("REPORT_MAX_TOTAL_MB", 0)
+        report_compression = os.getenv("REPORT_COMPRESSION", "").lower().strip()
         langchain_tracing_v2 = (
             os.getenv("LANGCHAIN_TRACING_V2", "true").lower() == "true"
         )
@@ -103,6 +194,39 @@ class AgentConfig:
         langchain_project = os.getenv(
             "LANGCHAIN_PROJECT", "security-news-agent"
         )
+        search_max_workers = _int_env("SEARCH_MAX_WORKERS", 4)
+        search_pool_size = _int_env("SEARCH_POOL_SIZE", 10)
+        search_cache_path = os.getenv("SEARCH_CACHE_PATH", "").strip()
+        search_cache_max_mb = _int_env("SEARCH_CACHE_MAX_MB", 64)
+        search_rate_limit_per_minute = _int_env(
+            "SEARCH_RATE_LIMIT_PER_MINUTE", 60
+        )
+        search_rate_burst = _int_env("SEARCH_RATE_BURST", 5)
+        search_budget_per_run = _int_env("SEARCH_BUDGET_PER_RUN", 0)
+        search_budget_per_day = _int_env("SEARCH_BUDGET_PER_DAY", 0)
+        search_budget_path = os.getenv(
+            "SEARCH_BUDGET_PATH", ".cache/tavily_budget.sqlite3"
+        ).strip()
+        search_near_duplicate_distance = _int_env(
+            "SEARCH_NEAR_DUPLICATE_DISTANCE", 10
+        )
+        outline_context_tokens = _int_env("OUTLINE_CONTEXT_TOKENS", 4000)
+        slides_context_tokens = _int_env("SLIDES_CONTEXT_TOKENS", 8000)
+        llm_cache_path = os.getenv("LLM_CACHE_PATH", "").strip()
+        llm_cache_ttl_hours = _int_env("LLM_CACHE_TTL_HOURS", 24)
+        llm_cache_max_mb = _int_env("LLM_CACHE_MAX_MB", 64)
+        slide_repair = os.getenv("SLIDE_REPAIR", "true").lower() == "true"
+        slides_streaming = (
+            os.getenv("SLIDES_STREAMING", "false").lower() == "true"
+        )
+        slides_partial_path = os.getenv("SLIDES_PARTIAL_PATH", "").strip()
+        batch_max_workers = _int_env("BATCH_MAX_WORKERS", 4)
+        checkpoint_path = os.getenv("CHECKPOINT_PATH", "").strip()
+        checkpoint_max_age_days = _int_env("CHECKPOINT_MAX_AGE_DAYS", 7)
+        metrics_path = os.getenv("METRICS_PATH", "").strip()
+        metrics_prometheus_path = os.getenv("METRICS_PROMETHEUS_PATH", "").strip()
+        llm_input_cost_per_mtok = _float_env("LLM_INPUT_COST_PER_MTOK", 0.0)
+        llm_output_cost_per_mtok = _float_env("LLM_OUTPUT_COST_PER_MTOK", 0.0)
 
         config = cls(
             google_api_key=google_api_key,
@@ -112,9 +236,43 @@ class AgentConfig:
             slide_format=slide_format,
             marp_theme=marp_theme,
             marp_paginate=marp_paginate,
+            marp_server=marp_server,
+            marp_server_workers=marp_server_workers,
+            render_max_workers=render_max_workers,
+            render_cache_path=render_cache_path,
+            render_cache_max_mb=render_cache_max_mb,
+            report_keep=report_keep,
+            report_max_age_days=report_max_age_days,
+            report_max_total_mb=report_max_total_mb,
+            report_compression=report_compression,
             langchain_tracing_v2=langchain_tracing_v2,
             langchain_endpoint=langchain_endpoint,
             langchain_project=langchain_project,
+            search_max_workers=search_max_workers,
+            search_pool_size=search_pool_size,
+            search_cache_path=search_cache_path,
+            search_cache_max_mb=search_cache_max_mb,
+            search_rate_limit_per_minute=search_rate_limit_per_minute,
+            search_rate_burst=search_rate_burst,
+            search_budget_per_run=search_budget_per_run,
+            search_budget_per_day=search_budget_per_day,
+            search_budget_path=search_budget_path,
+            search_near_duplicate_distance=search_near_duplicate_distance,
+            outline_context_tokens=outline_context_tokens,
+            slides_context_tokens=slides_context_tokens,
+            llm_cache_path=llm_cache_path,
+            llm_cache_ttl_hours=llm_cache_ttl_hours,
+            llm_cache_max_mb=llm_cache_max_mb,
+            slide_repair=slide_repair,
+            slides_streaming=slides_streaming,
+            slides_partial_path=slides_partial_path,
+            batch_max_workers=batch_max_workers,
+            checkpoint_path=checkpoint_path,
+            checkpoint_max_age_days=checkpoint_max_age_days,
+            metrics_path=metrics_path,
+            metrics_prometheus_path=metrics_prometheus_path,
+            llm_input_cost_per_mtok=llm_input_cost_per_mtok,
+            llm_output_cost_per_mtok=llm_output_cost_per_mtok,
         )
 
         config.validate()
@@ -126,12 +284,27 @@ class AgentConfig:
         Raises:
             ConfigurationError: If configuration values are invalid
         """
-        # Validate slide format
-        valid_formats = {"pdf", "png", "html", ""}
-        if self.slide_format not in valid_formats:
+        # Validate slide formats (comma-separated; empty for markdown only)
+        valid_formats = {"pdf", "png", "html"}
+        for slide_format in self.get_slide_formats():
+            if slide_format not in valid_formats:
+                raise ConfigurationError(
+                    f"Invalid SLIDE_FORMAT '{self.slide_format}'. "
+                    f"Must be empty or a comma-separated list of: "
+                    f"{', '.join(sorted(valid_formats))}"
+                )
+
+        # Validate report compression ("zstd" needs the optional zstandard)
+        if self.report_compression not in ("", "gzip", "zstd"):
             raise ConfigurationError(
-                f"Invalid SLIDE_FORMAT '{self.slide_format}'. "
-                f"Must be one of: {', '.join(valid_formats)}"
+                f"Invalid REPORT_COMPRESSION '{self.report_compression}'. "
+                "Must be empty, 'gzip' or 'zstd'"
+            )
+        zstd_missing = importlib.util.find_spec("zstandard") is None
+        if self.report_compression == "zstd" and zstd_missing:
+            raise ConfigurationError(
+                "REPORT_COMPRESSION 'zstd' requires the zstandard package "
+                "(pip install zstandard)"
             )
 
         # Validate model name
@@ -149,6 +322,40 @@ class AgentConfig:
                 "Must be a valid HTTP/HTTPS URL"
             )
 
+        # Validate numeric settings (a minimum of 0 means 0 disables the feature)
+        minimums = {
+            "SEARCH_MAX_WORKERS": (self.search_max_workers, 1),
+            "SEARCH_POOL_SIZE": (self.search_pool_size, 1),
+            "SEARCH_CACHE_MAX_MB": (self.search_cache_max_mb, 1),
+            "SEARCH_RATE_LIMIT_PER_MINUTE": (self.search_rate_limit_per_minute, 0),
+            "SEARCH_RATE_BURST": (self.search_rate_burst, 1),
+            "SEARCH_BUDGET_PER_RUN": (self.search_budget_per_run, 0),
+            "SEARCH_BUDGET_PER_DAY": (self.search_budget_per_day, 0),
+            "SEARCH_NEAR_DUPLICATE_DISTANCE": (
+                self.search_near_duplicate_distance,
+                0,
+            ),
+            "OUTLINE_CONTEXT_TOKENS": (self.outline_context_tokens, 0),
+            "SLIDES_CONTEXT_TOKENS": (self.slides_context_tokens, 0),
+            "LLM_CACHE_TTL_HOURS": (self.llm_cache_ttl_hours, 1),
+            "LLM_CACHE_MAX_MB": (self.llm_cache_max_mb, 1),
+            "BATCH_MAX_WORKERS": (self.batch_max_workers, 1),
+            "CHECKPOINT_MAX_AGE_DAYS": (self.checkpoint_max_age_days, 0),
+            "LLM_INPUT_COST_PER_MTOK": (self.llm_input_cost_per_mtok, 0),
+            "LLM_OUTPUT_COST_PER_MTOK": (self.llm_output_cost_per_mtok, 0),
+            "MARP_SERVER_WORKERS": (self.marp_server_workers, 1),
+            "RENDER_MAX_WORKERS": (self.render_max_workers, 1),
+            "RENDER_CACHE_MAX_MB": (self.render_cache_max_mb, 1),
+            "REPORT_KEEP": (self.report_keep, 0),
+            "REPORT_MAX_AGE_DAYS": (self.report_max_age_days, 0),
+            "REPORT_MAX_TOTAL_MB": (self.report_max_total_mb, 0),
+        }
+        for name, (value, minimum) in minimums.items():
+            if value < minimum:
+                raise ConfigurationError(
+                    f"Invalid {name} '{value}'. Must be at least {minimum}"
+                )
+
     def setup_environment(self) -> None:
         """Set up environment variables for LangChain and other services."""
         os.environ["LANGCHAIN_TRACING_V2"] = str(
@@ -160,6 +367,16 @@ class AgentConfig:
         os.environ["GOOGLE_API_KEY"] = self.google_api_key
         os.environ["TAVILY_API_KEY"] = self.tavily_api_key
 
+    def get_slide_formats(self) -> List[str]:
+        """Get the formats the slides are rendered to besides markdown.
+
+        Returns:
+            Formats listed in ``slide_format`` (e.g. "pdf,html"), in order
+            and without repeats; empty for markdown only
+        """
+        formats = (part.strip().lower() for part in self.slide_format.split(","))
+        return list(dict.fromkeys(fmt for fmt in formats if fmt))
+
     def get_search_queries(self) -> List[Dict[str, Any]]:
         """Get search queries for security news collection.
 
@@ -1,5 +1,7 @@
 """Output rendering and file operations."""
 
+from .marp_server import MarpRenderServer
+from .render_cache import RenderCache
 from .renderer import ReportRenderer
 
-__all__ = ["ReportRenderer"]
+__all__ = ["ReportRenderer", "MarpRenderServer", "RenderCache"]
@@ -0,0 +1,65 @@
+"""Compressed archiving of text report artifacts."""
+
+import gzip
+from pathlib import Path
+from typing import Any, Dict
+
+from ..utils.fileio import atomic_write_bytes
+
+# File suffix added by each compression method
+COMPRESSION_SUFFIXES: Dict[str, str] = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _zstd() -> Any:
+    """Import the optional ``zstandard`` package."""
+    import zstandard
+
+    return zstandard
+
+
+def compress_bytes(data: bytes, method: str) -> bytes:
+    """Compress data with a supported method.
+
+    Args:
+        data: Raw bytes
+        method: "gzip" or "zstd"
+
+    Returns:
+        Compressed bytes
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method == "gzip":
+        # A fixed mtime keeps archives of identical decks identical
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if method == "zstd":
+        compressed: bytes = _zstd().ZstdCompressor(level=19).compress(data)
+        return compressed
+    raise ValueError(f"Unsupported compression: {method}")
+
+
+def compress_file(path: Path, method: str) -> Path:
+    """Replace a file with a compressed copy next to it.
+
+    The copy is written atomically and never overwrites an existing
+    archive; the original is removed only once the copy is on disk.
+
+    Args:
+        path: File to compress
+        method: "gzip" or "zstd"
+
+    Returns:
+        Path of the compressed file (e.g. ``deck.md.gz``)
+
+    Raises:
+        FileExistsError: If the compressed file already exists
+        OSError: If reading or writing fails
+    """
+    path = Path(path)
+    target = path.with_name(path.name + COMPRESSION_SUFFIXES[method])
+    atomic_write_bytes(
+        target, compress_bytes(path.read_bytes(), method), overwrite=False
+    )
+    path.unlink()
+    return target
@@ -0,0 +1,214 @@
+"""Long-lived Marp render server shared by many render jobs."""
+
+import logging
+import os
+import socket
+import subprocess  # nosec B404
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from ..utils.fileio import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+# Query string asking ``marp --server`` for each output format; plain
+# requests for a deck return HTML
+_FORMAT_QUERIES = {"pdf": "?pdf", "png": "?png", "html": ""}
+
+
+class MarpServerError(Exception):
+    """Raised when the render server cannot start or fails a job."""
+
+    pass
+
+
+def _free_port() -> int:
+    """Ask the OS for a free local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+class MarpRenderServer:
+    """Render decks through one ``marp --server`` process.
+
+    A one-off ``marp`` run boots Node and, for PDF and PNG, launches
+    Chromium for every deck. The server process keeps both running and
+    converts a deck when it is requested with a format query string. Jobs
+    are queued on a small thread pool and the rendered bytes are written
+    next to the markdown file, like the CLI's ``-o`` output.
+
+    The process is started on the first job and serves files under
+    ``root`` only.
+    """
+
+    def __init__(
+        self,
+        marp_cli: str,
+        root: Path,
+        max_workers: int = 2,
+        timeout: float = 120,
+        startup_timeout: float = 30,
+    ) -> None:
+        """Initialize the server without starting it.
+
+        Args:
+            marp_cli: Path to the marp executable
+            root: Directory served to the renderer
+            max_workers: Render jobs sent to the server at once
+            timeout: Seconds a single render may take
+            startup_timeout: Seconds to wait for the server to listen
+        """
+        self.marp_cli = marp_cli
+        self.root = Path(root).resolve()
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.port = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="marp-render"
+        )
+
+    @property
+    def running(self) -> bool:
+        """Whether the server process is alive."""
+        return self._process is not None and self._process.poll() is None
+
+    def serves(self, md_path: Path) -> bool:
+        """Check whether a deck lies under the served directory.
+
+        Args:
+            md_path: Path to the markdown file
+
+        Returns:
+            True if the server can render the deck
+        """
+        return self.root in Path(md_path).resolve().parents
+
+    def start(self) -> None:
+        """Start the server process if it is not running.
+
+        Raises:
+            MarpServerError: If the server does not come up in time
+        """
+        with self._lock:
+            if self.running:
+                return
+
+            self.port = _free_port()
+            cmd = [self.marp_cli, "--server", str(self.root)]
+            logger.info(f"Starting Marp render server on port {self.port}")
+            try:
+                self._process = subprocess.Popen(  # nosec B603
+                    cmd,
+                    env={**os.environ, "PORT": str(self.port)},
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+            except OSError as e:
+                raise MarpServerError(f"Failed to start Marp server: {e}")
+
+            self._wait_until_listening()
+
+    def _wait_until_listening(self) -> None:
+        """Poll the server port until it accepts connections."""
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self._process is None or self._process.poll() is not None:
+                raise MarpServerError("Marp server exited during start-up")
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), 0.5):
+                    return
+            except OSError:
+                time.sleep(0.1)
+
+        self._stop_process()
+        raise MarpServerError(
+            f"Marp server did not start within {self.startup_timeout:.0f}s"
+        )
+
+    def submit(self, md_path: Path, output_format: str) -> "Future[Path]":
+        """Queue a render job.
+
+        Args:
+            md_path: Path to a markdown file under the served directory
+            output_format: Output format ("pdf", "png", "html")
+
+        Returns:
+            Future resolving to the rendered file's path
+        """
+        return self._executor.submit(self._render, Path(md_path), output_format)
+
+    def render(self, md_path: Path, output_format: str) -> Path:
+        """Render a deck and wait for the result.
+
+        Args:
+            md_path: Path to a markdown file under the served directory
+            output_format: Output format ("pdf", "png", "html")
+
+        Returns:
+            Path to the rendered file
+
+        Raises:
+            MarpServerError: If the server is unavailable or the render fails
+        """
+        return self.submit(md_path, output_format).result()
+
+    def _render(self, md_path: Path, output_format: str) -> Path:
+        """Fetch one rendered deck from the server and write it to disk."""
+        if output_format not in _FORMAT_QUERIES:
+            raise MarpServerError(f"Unsupported output format: {output_format}")
+        if not self.serves(md_path):
+            raise MarpServerError(f"{md_path} is outside {self.root}")
+
+        self.start()
+        relative = md_path.resolve().relative_to(self.root).as_posix()
+        url = (
+            f"http://127.0.0.1:{self.port}/{urllib.parse.quote(relative)}"
+            f"{_FORMAT_QUERIES[output_format]}"
+        )
+        output_path = md_path.with_suffix(f".{output_format}")
+
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(  # nosec B310
+                url, timeout=self.timeout
+            ) as response:
+                body = response.read()
+        except (urllib.error.URLError, OSError) as e:
+            raise MarpServerError(f"Marp server render failed: {e}")
+
+        atomic_write_bytes(output_path, body)
+        logger.info(
+            f"Rendered {md_path.name} to {output_format} via Marp server "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+        return output_path
+
+    def _stop_process(self) -> None:
+        """Terminate the server process, killing it if it does not exit."""
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        self._process = None
+
+    def close(self) -> None:
+        """Finish queued jobs and stop the server."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._stop_process()
@@ -0,0 +1,187 @@
+"""Content-addressed cache of rendered slide decks."""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _copy_atomic(src: Path, dest: Path) -> None:
+    """Copy ``src`` to ``dest``, replacing any existing file atomically.
+
+    Outputs and cache entries never share an inode, so refreshing an entry's
+    mtime on a hit leaves the report's own mtime (which retention sorts on)
+    alone.
+    """
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class RenderCache:
+    """Directory of rendered artifacts keyed on everything that shapes them.
+
+    The key hashes the markdown together with the Marp theme, pagination
+    and output format, so an unchanged deck is never rendered twice. Hits
+    are copied to the requested path.
+    When the artifacts exceed ``max_bytes``, the least recently used ones
+    are evicted first. Cache failures are logged and treated as misses so
+    that a broken cache never blocks rendering.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024) -> None:
+        """Initialize the cache, creating the directory if needed.
+
+        Args:
+            path: Directory holding the cached artifacts
+            max_bytes: Maximum total size of cached artifacts in bytes
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Initialized render cache at: {self.path}")
+
+    @staticmethod
+    def make_key(
+        content: bytes, theme: str, paginate: bool, output_format: str
+    ) -> str:
+        """Build a stable cache key for a render.
+
+        Args:
+            content: Markdown file contents
+            theme: Marp theme
+            paginate: Whether slides are paginated
+            output_format: Output format ("pdf", "png", "html")
+
+        Returns:
+            Hex digest identifying the rendered artifact
+        """
+        digest = hashlib.sha256(
+            json.dumps([theme, paginate, output_format]).encode("utf-8")
+        )
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _entry(self, key: str, output_format: str) -> Path:
+        """Path of the cached artifact for a key."""
+        return self.path / key[:2] / f"{key}.{output_format}"
+
+    def fetch(self, key: str, output_format: str, dest: Path) -> bool:
+        """Place a cached artifact at ``dest`` if there is one.
+
+        Args:
+            key: Cache key from make_key()
+            output_format: Output format, used as the file extension
+            dest: Path the rendered file is expected at
+
+        Returns:
+            True on a hit
+        """
+        entry = self._entry(key, output_format)
+        try:
+            _copy_atomic(entry, dest)
+            os.utime(entry)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        logger.info(f"Render cache hit for {dest.name}")
+        return True
+
+    def store(self, key: str, output_format: str, rendered: Path) -> None:
+        """Add a freshly rendered artifact and evict entries over the limit.
+
+        Args:
+            key: Cache key from make_key()
+            output_format: Output format, used as the file extension
+            rendered: Path of the rendered file
+        """
+        entry = self._entry(key, output_format)
+        try:
+            entry.parent.mkdir(exist_ok=True)
+            _copy_atomic(rendered, entry)
+            with self._lock:
+                self._evict()
+        except OSError as e:
+            logger.warning(f"Render cache write failed: {e}")
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """List cached artifacts as (last use, size, path) tuples."""
+        entries = []
+        for shard in os.scandir(self.path):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self) -> None:
+        """Drop least recently used artifacts while over the size limit."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+
+        logger.debug(f"Evicted {evicted} render cache entries")
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counts, entry count and stored bytes
+        """
+        with self._lock:
+            try:
+                entries = self._entries()
+            except OSError:
+                entries = []
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+            }
+
+    def clear(self) -> None:
+        """Remove all cached artifacts."""
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
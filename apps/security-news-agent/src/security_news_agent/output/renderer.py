@@ -4,11 +4,18 @@ import logging
 import re
 import shutil
 import subprocess  # nosec B404
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from ..config.settings import AgentConfig
-from ..utils.helpers import slugify_en, today_iso
+from ..utils.fileio import atomic_write_text, reserve_path
+from ..utils.helpers import format_file_size, slugify_en, today_iso
+from .archive import COMPRESSION_SUFFIXES, compress_file
+from .marp_server import MarpRenderServer, MarpServerError
+from .render_cache import RenderCache
+from .retention import RetentionPolicy, apply_retention
 
 logger = logging.getLogger(__name__)
 
@@ -34,16 +41,30 @@ class FileOperationError(RenderError):
 class ReportRenderer:
     """Handles report rendering and file operations."""
 
-    def __init__(self, config: AgentConfig, output_dir: str = "slides"):
+    def __init__(
+        self,
+        config: AgentConfig,
+        output_dir: str = "slides",
+        render_cache: Optional[RenderCache] = None,
+    ):
         """Initialize the renderer.
 
         Args:
             config: Agent configuration
             output_dir: Directory for output files
+            render_cache: Optional cache of rendered decks
         """
         self.config = config
         self.output_dir = Path(output_dir)
+        self.render_cache = render_cache
         self.marp_cli = shutil.which("marp")
+        self.marp_server: Optional[MarpRenderServer] = None
+        if self.marp_cli and config.marp_server:
+            self.marp_server = MarpRenderServer(
+                self.marp_cli,
+                self.output_dir,
+                max_workers=config.marp_server_workers,
+            )
 
         logger.info(
             f"Initialized ReportRenderer with output_dir: {self.output_dir}"
@@ -95,6 +116,10 @@ class ReportRenderer:
     ) -> Path:
         """Save markdown content to file.
 
+        The file is written atomically under a name no other run is using:
+        if the name is taken (also by a compressed archive of it), a
+        ``-2``, ``-3``, ... suffix is added instead of overwriting.
+
         Args:
             content: Markdown content
             title: Report title (used for filename if filename not provided)
@@ -106,21 +131,27 @@ class ReportRenderer:
         Raises:
             FileOperationError: If file saving fails
         """
+        file_path: Optional[Path] = None
         try:
             self.ensure_output_directory()
 
             if not filename:
-                file_path = self.generate_filename(title, "md")
+                preferred = self.generate_filename(title, "md")
             else:
-                file_path = self.output_dir / filename
+                preferred = self.output_dir / filename
 
-            # Write content with UTF-8 encoding
-            file_path.write_text(content, encoding="utf-8")
+            file_path = reserve_path(
+                preferred, taken_suffixes=tuple(COMPRESSION_SUFFIXES.values())
+            )
+            atomic_write_text(file_path, content)
 
             logger.info(f"Markdown saved to: {file_path}")
             return file_path
 
         except Exception as e:
+            if file_path is not None:
+                # Release the reserved name instead of leaving an empty file
+                file_path.unlink(missing_ok=True)
             raise FileOperationError(f"Failed to save markdown file: {e}")
 
     def render_with_marp(
@@ -128,6 +159,50 @@ class ReportRenderer:
     ) -> Optional[Path]:
         """Render markdown to specified format using Marp CLI.
 
+        With a render cache, a deck rendered before with the same theme,
+        pagination and format is served from the cache without running
+        Marp.
+
+        Args:
+            md_path: Path to markdown file
+            output_format: Output format ("pdf", "png", "html")
+
+        Returns:
+            Path to rendered file, or None if rendering failed
+
+        Raises:
+            MarpNotFoundError: If Marp CLI is not available
+            RenderError: If rendering fails
+        """
+        if output_format not in {"pdf", "png", "html"}:
+            raise RenderError(f"Unsupported output format: {output_format}")
+
+        if self.render_cache is None:
+            return self._render_uncached(md_path, output_format)
+
+        output_path = md_path.parent / f"{md_path.stem}.{output_format}"
+        try:
+            key = self.render_cache.make_key(
+                md_path.read_bytes(),
+                self.config.marp_theme,
+                self.config.marp_paginate,
+                output_format,
+            )
+        except OSError as e:
+            raise RenderError(f"Failed to read {md_path}: {e}")
+        if self.render_cache.fetch(key, output_format, output_path):
+            return output_path
+
+        rendered = self._render_uncached(md_path, output_format)
+        if rendered:
+            self.render_cache.store(key, output_format, rendered)
+        return rendered
+
+    def _render_uncached(
+        self, md_path: Path, output_format: str
+    ) -> Optional[Path]:
+        """Render a deck with the Marp server or a one-off Marp run.
+
         Args:
             md_path: Path to markdown file
             output_format: Output format ("pdf", "png", "html")
@@ -144,16 +219,37 @@ class ReportRenderer:
                 "Marp CLI not found. Install with 'npm install -g @marp-team/marp-cli'"
             )
 
-        if output_format not in {"pdf", "png", "html"}:
-            raise RenderError(f"Unsupported output format: {output_format}")
+        if self.marp_server and self.marp_server.serves(md_path):
+            try:
+                return self.marp_server.render(md_path, output_format)
+            except MarpServerError as e:
+                logger.warning(f"{e}; falling back to a one-off Marp run")
+
+        return self._run_marp_cli(self.marp_cli, md_path, output_format)
+
+    def _run_marp_cli(
+        self, marp_cli: str, md_path: Path, output_format: str
+    ) -> Optional[Path]:
+        """Render a deck with a one-off Marp CLI process.
+
+        Args:
+            marp_cli: Path to the marp executable
+            md_path: Path to markdown file
+            output_format: Output format ("pdf", "png", "html")
 
+        Returns:
+            Path to rendered file, or None if Marp wrote no output
+
+        Raises:
+            RenderError: If rendering fails
+        """
         # Generate output filename
         output_filename = md_path.stem + f".{output_format}"
         output_path = md_path.parent / output_filename
 
         # Build Marp command
         cmd = [
-            self.marp_cli,
+            marp_cli,
             str(md_path),
             f"--{output_format}",
             "-o",
@@ -191,19 +287,76 @@ class ReportRenderer:
             logger.error(f"Unexpected error during Marp rendering: {e}")
             raise RenderError(f"Unexpected rendering error: {e}")
 
-    def save_and_render(self, content: str, title: str) -> Dict[str, Any]:
-        """Save markdown and optionally render to configured format.
+    def close(self) -> None:
+        """Stop the Marp render server, if one was started."""
+        if self.marp_server is not None:
+            self.marp_server.close()
+
+    def render_formats(
+        self, md_path: Path, formats: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Render a deck to several formats concurrently.
+
+        Each format is rendered by its own Marp job on a pool of at most
+        ``render_max_workers`` threads; a failing format does not stop the
+        others.
+
+        Args:
+            md_path: Path to markdown file
+            formats: Output formats ("pdf", "png", "html")
+
+        Returns:
+            Per format, the rendered ``path`` (None on failure), the
+            ``seconds`` the render took and an ``error`` message or None
+        """
+
+        def render(output_format: str) -> Dict[str, Any]:
+            started = time.perf_counter()
+            outcome: Dict[str, Any] = {"path": None, "error": None}
+            try:
+                rendered_path = self.render_with_marp(md_path, output_format)
+                if rendered_path:
+                    outcome["path"] = str(rendered_path)
+                else:
+                    outcome["error"] = "Rendering failed but markdown was saved"
+            except RenderError as e:
+                outcome["error"] = str(e)
+            outcome["seconds"] = time.perf_counter() - started
+            if outcome["error"]:
+                logger.warning(
+                    f"Rendering {output_format} failed: {outcome['error']}"
+                )
+            return outcome
+
+        if len(formats) == 1:
+            return {formats[0]: render(formats[0])}
+
+        workers = min(len(formats), self.config.render_max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(formats, executor.map(render, formats)))
+
+    def save_and_render(
+        self, content: str, title: str, filename: str = ""
+    ) -> Dict[str, Any]:
+        """Save markdown and optionally render to the configured formats.
 
         Args:
             content: Markdown content
             title: Report title
+            filename: Optional custom markdown filename
 
         Returns:
-            Dictionary with file paths and rendering results
+            Dictionary with file paths and rendering results.
+            ``rendered_paths`` and ``render_seconds`` hold each successful
+            format's path and every format's render time;
+            ``rendered_path`` is the path of the first format listed.
         """
-        result = {
+        formats = self.config.get_slide_formats()
+        result: Dict[str, Any] = {
             "markdown_path": None,
             "rendered_path": None,
+            "rendered_paths": {},
+            "render_seconds": {},
             "format": self.config.slide_format,
             "success": False,
             "error": None,
@@ -211,33 +364,35 @@ class ReportRenderer:
 
         try:
             # Save markdown file
-            md_path = self.save_markdown(content, title)
+            md_path = self.save_markdown(content, title, filename)
             result["markdown_path"] = str(md_path)
 
-            # Render to additional format if configured
-            if self.config.slide_format and self.config.slide_format in {
-                "pdf",
-                "png",
-                "html",
-            }:
-                try:
-                    rendered_path = self.render_with_marp(
-                        md_path, self.config.slide_format
-                    )
-                    if rendered_path:
-                        result["rendered_path"] = str(rendered_path)
-                        logger.info("Report saved and rendered successfully")
+            # Render to additional formats if configured
+            if formats:
+                outcomes = self.render_formats(md_path, formats)
+                errors = []
+                for output_format, outcome in outcomes.items():
+                    result["render_seconds"][output_format] = outcome["seconds"]
+                    if outcome["path"]:
+                        result["rendered_paths"][output_format] = outcome["path"]
                     else:
-                        logger.warning("Markdown saved but rendering failed")
-                        result["error"] = (
-                            "Rendering failed but markdown was saved"
-                        )
-                except (MarpNotFoundError, RenderError) as e:
-                    logger.warning(f"Rendering failed: {e}")
-                    result["error"] = str(e)
+                        errors.append((output_format, outcome["error"]))
+                result["rendered_path"] = result["rendered_paths"].get(formats[0])
+
+                if len(errors) == 1 and len(formats) == 1:
+                    result["error"] = errors[0][1]
+                elif errors:
+                    result["error"] = "; ".join(
+                        f"{output_format}: {error}" for output_format, error in errors
+                    )
+                else:
+                    logger.info("Report saved and rendered successfully")
             else:
                 logger.info("No additional rendering requested")
 
+            if self.config.report_compression:
+                self._compress_text_artifacts(result)
+
             result["success"] = True
             return result
 
@@ -250,11 +405,49 @@ class ReportRenderer:
             result["error"] = f"Unexpected error: {e}"
             return result
 
-    def cleanup_old_files(self, keep_count: int = 10) -> int:
-        """Clean up old report files, keeping only the most recent ones.
+    def _compress_text_artifacts(self, result: Dict[str, Any]) -> None:
+        """Replace the saved markdown and HTML with compressed copies.
+
+        Runs after rendering, which needs the plain markdown. PDF and PNG
+        are already compressed and are left alone. A file that cannot be
+        compressed is kept as is.
 
         Args:
-            keep_count: Number of recent files to keep
+            result: save_and_render() result, updated with the new paths
+        """
+        result["markdown_path"] = self._compress(result["markdown_path"])
+
+        html_path = result["rendered_paths"].get("html")
+        if html_path:
+            archived = self._compress(html_path)
+            result["rendered_paths"]["html"] = archived
+            if result["rendered_path"] == html_path:
+                result["rendered_path"] = archived
+
+    def _compress(self, path: str) -> str:
+        """Compress one artifact, returning its new path (or the old one)."""
+        try:
+            return str(compress_file(Path(path), self.config.report_compression))
+        except (OSError, ValueError, ImportError) as e:
+            logger.warning(f"Could not compress {Path(path).name}: {e}")
+            return path
+
+    def cleanup_old_files(
+        self,
+        keep_count: int = 10,
+        max_age_days: float = 0,
+        max_total_bytes: int = 0,
+    ) -> int:
+        """Clean up old reports, keeping only the most recent ones.
+
+        A report's markdown and rendered files share a stem and are kept or
+        deleted together. A limit of 0 disables that rule.
+
+        Args:
+            keep_count: Number of recent reports to keep
+            max_age_days: Delete reports older than this many days
+            max_total_bytes: Keep the most recent reports that fit in this
+                many bytes
 
         Returns:
             Number of files deleted
@@ -262,39 +455,20 @@ class ReportRenderer:
         if not self.output_dir.exists():
             return 0
 
+        policy = RetentionPolicy(keep_count, max_age_days, max_total_bytes)
         try:
-            # Get all report files (markdown and rendered)
-            all_files: List[Path] = []
-            for pattern in ["*.md", "*.pdf", "*.png", "*.html"]:
-                all_files.extend(self.output_dir.glob(pattern))
-
-            if len(all_files) <= keep_count:
-                return 0
-
-            # Sort by modification time (newest first)
-            all_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-
-            # Delete old files
-            files_to_delete = all_files[keep_count:]
-            deleted_count = 0
-
-            for file_path in files_to_delete:
-                try:
-                    file_path.unlink()
-                    deleted_count += 1
-                    logger.debug(f"Deleted old file: {file_path.name}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete {file_path.name}: {e}")
-
-            if deleted_count > 0:
-                logger.info(f"Cleaned up {deleted_count} old report files")
-
-            return deleted_count
-
-        except Exception as e:
+            deleted_count, freed = apply_retention(str(self.output_dir), policy)
+        except OSError as e:
             logger.error(f"Error during cleanup: {e}")
             return 0
 
+        if deleted_count > 0:
+            logger.info(
+                f"Cleaned up {deleted_count} old report files "
+                f"({format_file_size(freed)})"
+            )
+        return deleted_count
+
     def get_output_info(self) -> Dict[str, Any]:
         """Get information about output configuration and status.
 
@@ -305,10 +479,15 @@ class ReportRenderer:
             "output_dir": str(self.output_dir),
             "output_dir_exists": self.output_dir.exists(),
             "slide_format": self.config.slide_format,
+            "slide_formats": self.config.get_slide_formats(),
             "marp_theme": self.config.marp_theme,
             "marp_paginate": self.config.marp_paginate,
             "marp_cli_available": self.marp_cli is not None,
             "marp_cli_path": self.marp_cli,
+            "marp_server": self.marp_server is not None,
+            "render_cache": (
+                str(self.render_cache.path) if self.render_cache else None
+            ),
         }
 
     def validate_markdown_content(self, content: str) -> Dict[str, Any]:
@@ -0,0 +1,139 @@
+"""Retention of archived reports in the output directory."""
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .archive import COMPRESSION_SUFFIXES
+
+logger = logging.getLogger(__name__)
+
+# Artifacts that make up a report: the markdown and its rendered formats
+REPORT_EXTENSIONS = (".md", ".pdf", ".png", ".html")
+
+
+def _split_name(name: str) -> Tuple[str, str]:
+    """Split a file name into stem and extension, ignoring ``.gz``/``.zst``."""
+    for suffix in COMPRESSION_SUFFIXES.values():
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+            break
+    return os.path.splitext(name)
+
+
+@dataclass
+class RetentionPolicy:
+    """Which reports to keep; a limit of 0 disables that rule.
+
+    Attributes:
+        keep: Number of most recent reports to keep
+        max_age_days: Delete reports last written longer ago than this
+        max_total_bytes: Keep the most recent reports that fit in this size
+    """
+
+    keep: int = 0
+    max_age_days: float = 0
+    max_total_bytes: int = 0
+
+
+@dataclass
+class Report:
+    """Artifacts sharing a file stem, e.g. ``2025-01-01_briefing.md/.pdf``."""
+
+    stem: str
+    files: List[Tuple[str, int]] = field(default_factory=list)
+    size: int = 0
+    mtime: float = 0.0
+
+
+def scan_reports(
+    directory: str, extensions: Tuple[str, ...] = REPORT_EXTENSIONS
+) -> List[Report]:
+    """Group the report artifacts in a directory by stem.
+
+    The directory is read with a single ``os.scandir`` pass and each file
+    is stat'ed once.
+
+    Args:
+        directory: Output directory
+        extensions: File extensions that belong to reports
+
+    Returns:
+        Reports, newest first by their most recently written artifact
+    """
+    reports: Dict[str, Report] = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            stem, extension = _split_name(entry.name)
+            if extension not in extensions or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            report = reports.get(stem)
+            if report is None:
+                report = reports[stem] = Report(stem)
+            report.files.append((entry.path, stat.st_size))
+            report.size += stat.st_size
+            report.mtime = max(report.mtime, stat.st_mtime)
+
+    return sorted(reports.values(), key=lambda r: r.mtime, reverse=True)
+
+
+def select_expired(
+    reports: List[Report], policy: RetentionPolicy, now: Optional[float] = None
+) -> List[Report]:
+    """Pick the reports a policy no longer keeps.
+
+    Args:
+        reports: Reports, newest first, as returned by scan_reports()
+        policy: Retention policy
+        now: Current timestamp (defaults to time.time())
+
+    Returns:
+        Reports to delete; the newest report is never deleted for size
+    """
+    now = time.time() if now is None else now
+    cutoff = now - policy.max_age_days * 86400 if policy.max_age_days else None
+
+    expired = []
+    total = 0
+    for index, report in enumerate(reports):
+        total += report.size
+        over_count = 0 < policy.keep <= index
+        too_old = cutoff is not None and report.mtime < cutoff
+        over_size = 0 < policy.max_total_bytes < total and index > 0
+        if over_count or too_old or over_size:
+            expired.append(report)
+    return expired
+
+
+def apply_retention(
+    directory: str, policy: RetentionPolicy, now: Optional[float] = None
+) -> Tuple[int, int]:
+    """Delete the reports in a directory that a policy no longer keeps.
+
+    Args:
+        directory: Output directory
+        policy: Retention policy
+        now: Current timestamp (defaults to time.time())
+
+    Returns:
+        Tuple of the number of files deleted and the bytes freed
+    """
+    deleted = 0
+    freed = 0
+    for report in select_expired(scan_reports(directory), policy, now):
+        for path, size in report.files:
+            try:
+                os.unlink(path)
+            except OSError as e:
+                logger.warning(f"Failed to delete {os.path.basename(path)}: {e}")
+                continue
+            deleted += 1
+            freed += size
+            logger.debug(f"Deleted old file: {os.path.basename(path)}")
+    return deleted, freed
@@ -1,7 +1,29 @@
 """Processing modules for the LangGraph workflow."""
 
-from .nodes import WorkflowNodes
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+from .llm_cache import LLMResponseCache
 from .state import State
-from .workflow import SecurityNewsWorkflow
 
-__all__ = ["SecurityNewsWorkflow", "WorkflowNodes", "State"]
+if TYPE_CHECKING:
+    from .checkpoint import SQLiteCheckpointer
+    from .nodes import WorkflowNodes
+    from .workflow import SecurityNewsWorkflow
+
+__getattr__ = lazy_exports(
+    globals(),
+    {
+        "SecurityNewsWorkflow": ".workflow",
+        "WorkflowNodes": ".nodes",
+        "SQLiteCheckpointer": ".checkpoint",
+    },
+)
+
+__all__ = [
+    "SecurityNewsWorkflow",
+    "WorkflowNodes",
+    "State",
+    "LLMResponseCache",
+    "SQLiteCheckpointer",
+]
@@ -0,0 +1,340 @@
+"""SQLite checkpointer that makes workflow runs resumable."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SQLiteCheckpointer(BaseCheckpointSaver[int]):
+    """Persist LangGraph checkpoints in a local SQLite database.
+
+    LangGraph saves a checkpoint after every step and the writes of each
+    finished node as soon as it returns, keyed by the run's ``thread_id``.
+    Invoking the graph again with that id continues after the last saved
+    step instead of collecting the news and calling the LLM again. Runs
+    older than ``max_age_days`` are dropped when the database is opened.
+    """
+
+    def __init__(self, path: str, max_age_days: float = 7) -> None:
+        """Initialize the checkpointer, creating the database if needed.
+
+        Args:
+            path: Path to the SQLite database file
+            max_age_days: Delete runs last checkpointed longer ago than
+                this (0 keeps every run)
+        """
+        super().__init__()
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "thread_id TEXT NOT NULL, "
+            "checkpoint_ns TEXT NOT NULL, "
+            "checkpoint_id TEXT NOT NULL, "
+            "parent_id TEXT, "
+            "type TEXT NOT NULL, "
+            "checkpoint BLOB NOT NULL, "
+            "metadata_type TEXT NOT NULL, "
+            "metadata BLOB NOT NULL, "
+            "created_at REAL NOT NULL, "
+            "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS writes ("
+            "thread_id TEXT NOT NULL, "
+            "checkpoint_ns TEXT NOT NULL, "
+            "checkpoint_id TEXT NOT NULL, "
+            "task_id TEXT NOT NULL, "
+            "idx INTEGER NOT NULL, "
+            "channel TEXT NOT NULL, "
+            "type TEXT NOT NULL, "
+            "value BLOB NOT NULL, "
+            "task_path TEXT NOT NULL, "
+            "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))"
+        )
+        if max_age_days:
+            self.prune(time.time() - max_age_days * 86400)
+        self._conn.commit()
+
+        logger.info(f"Initialized checkpointer at: {self.path}")
+
+    def prune(self, before: float) -> int:
+        """Delete runs whose last checkpoint is older than a timestamp.
+
+        Args:
+            before: Cut-off timestamp
+
+        Returns:
+            Number of runs deleted
+        """
+        with self._lock:
+            stale = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT thread_id FROM checkpoints "
+                    "GROUP BY thread_id HAVING MAX(created_at) < ?",
+                    (before,),
+                )
+            ]
+            for thread_id in stale:
+                self._delete(thread_id)
+            self._conn.commit()
+
+        if stale:
+            logger.debug(f"Pruned {len(stale)} checkpointed runs")
+        return len(stale)
+
+    def _delete(self, thread_id: str) -> None:
+        """Delete a run's checkpoints and writes (lock held by the caller)."""
+        for table in ("checkpoints", "writes"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,)
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints and writes of a run.
+
+        Args:
+            thread_id: Run identifier
+        """
+        with self._lock:
+            self._delete(thread_id)
+            self._conn.commit()
+
+    def _pending_writes(
+        self, thread_id: str, checkpoint_ns: str, checkpoint_id: str
+    ) -> List[Tuple[str, str, Any]]:
+        """Load the node writes saved against a checkpoint."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT task_id, channel, type, value FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+                "ORDER BY task_id, idx",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            ).fetchall()
+        return [
+            (task_id, channel, self.serde.loads_typed((type_, value)))
+            for task_id, channel, type_, value in rows
+        ]
+
+    def _to_tuple(self, thread_id: str, row: Sequence[Any]) -> CheckpointTuple:
+        """Build a checkpoint tuple from a ``checkpoints`` row."""
+        checkpoint_ns, checkpoint_id, parent_id = row[:3]
+        type_, checkpoint, metadata_type, metadata = row[3:]
+
+        def run_config(checkpoint_id: str) -> RunnableConfig:
+            return {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            }
+
+        return CheckpointTuple(
+            config=run_config(checkpoint_id),
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=run_config(parent_id) if parent_id else None,
+            pending_writes=self._pending_writes(
+                thread_id, checkpoint_ns, checkpoint_id
+            ),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """Get a checkpoint, or the latest one of a run.
+
+        Args:
+            config: Config with ``thread_id`` and optionally ``checkpoint_id``
+
+        Returns:
+            The checkpoint tuple, or None if there is none
+        """
+        return next(iter(self.list(config, limit=1)), None)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List a run's checkpoints, newest first.
+
+        Args:
+            config: Config with ``thread_id`` and optionally
+                ``checkpoint_ns`` and ``checkpoint_id``
+            filter: Metadata values the checkpoints must have
+            before: Only list checkpoints older than this one
+            limit: Maximum number of checkpoints
+
+        Yields:
+            Matching checkpoint tuples
+        """
+        if config is None:
+            return
+        configurable = config["configurable"]
+        query = (
+            "SELECT checkpoint_ns, checkpoint_id, parent_id, type, checkpoint, "
+            "metadata_type, metadata FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ?"
+        )
+        params: List[Any] = [
+            configurable["thread_id"],
+            configurable.get("checkpoint_ns", ""),
+        ]
+        checkpoint_id = get_checkpoint_id(config)
+        if checkpoint_id:
+            query += " AND checkpoint_id = ?"
+            params.append(checkpoint_id)
+        before_id = get_checkpoint_id(before) if before else None
+        if before_id:
+            query += " AND checkpoint_id < ?"
+            params.append(before_id)
+        # Checkpoint ids are time-ordered UUIDs (uuid6)
+        query += " ORDER BY checkpoint_id DESC"
+        if limit is not None and not filter:
+            query += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        count = 0
+        for row in rows:
+            if limit is not None and count >= limit:
+                return
+            item = self._to_tuple(configurable["thread_id"], row)
+            if filter and any(
+                item.metadata.get(key) != value for key, value in filter.items()
+            ):
+                continue
+            count += 1
+            yield item
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint.
+
+        Args:
+            config: Config of the parent checkpoint
+            checkpoint: Checkpoint to save
+            metadata: Checkpoint metadata
+            new_versions: Channel versions written in this step
+
+        Returns:
+            Config pointing at the saved checkpoint
+        """
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        type_, blob = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_blob = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    configurable.get("checkpoint_id"),
+                    type_,
+                    blob,
+                    metadata_type,
+                    metadata_blob,
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Save the writes of a finished node.
+
+        Args:
+            config: Config of the checkpoint the node ran from
+            writes: (channel, value) pairs written by the node
+            task_id: Identifier of the node's task
+            task_path: Path of the node's task
+        """
+        configurable = config["configurable"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            rows.append(
+                (
+                    configurable["thread_id"],
+                    configurable.get("checkpoint_ns", ""),
+                    configurable["checkpoint_id"],
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    type_,
+                    blob,
+                    task_path,
+                )
+            )
+
+        # Writes to special channels (errors, interrupts) have negative
+        # indexes and replace earlier ones; a node's regular writes are
+        # saved once
+        replace = [row for row in rows if row[4] < 0]
+        keep = [row for row in rows if row[4] >= 0]
+        with self._lock:
+            for verb, batch in (("REPLACE", replace), ("IGNORE", keep)):
+                self._conn.executemany(
+                    f"INSERT OR {verb} INTO writes "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    batch,
+                )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
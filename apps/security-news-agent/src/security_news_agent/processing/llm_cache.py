@@ -0,0 +1,156 @@
+"""Persistent cache of LLM responses keyed on the rendered prompt."""
+
+import hashlib
+import json
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from ..utils.logging_config import get_logger
+from ..utils.sqlite_cache import SQLiteCache
+
+logger = get_logger(__name__)
+
+DEFAULT_LLM_CACHE_TTL = 24 * 60 * 60
+
+
+def message_text(msg: Any) -> str:
+    """Get the text of an LLM response message.
+
+    Args:
+        msg: Message returned by ``llm.invoke``
+
+    Returns:
+        Message content as a string
+    """
+    return msg.content if isinstance(msg.content, str) else str(msg.content)
+
+
+class LLMResponseCache(SQLiteCache):
+    """SQLite-backed cache of LLM completions with TTL and LRU eviction.
+
+    Keys are derived from the model name, temperature and the fully rendered
+    prompt, plus a sample index so that a deliberate retry of an identical
+    prompt asks the model again instead of replaying the rejected answer.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: int = DEFAULT_LLM_CACHE_TTL,
+    ) -> None:
+        """Initialize the cache, creating the database if needed.
+
+        Args:
+            path: Path to the SQLite database file
+            max_bytes: Maximum total size of cached responses in bytes
+            ttl: Seconds a cached response stays fresh
+        """
+        super().__init__(path, max_bytes=max_bytes, table="llm_cache")
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(
+        model: str,
+        temperature: Optional[float],
+        prompt: str,
+        sample: int = 0,
+    ) -> str:
+        """Build a stable cache key for a completion.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            prompt: Fully rendered prompt
+            sample: Index of the sample for this prompt (e.g. retry attempt)
+
+        Returns:
+            Hex digest identifying the completion
+        """
+        raw = json.dumps([model, temperature, sample, prompt], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def key_for(self, llm: Any, prompt: str, sample: int = 0) -> str:
+        """Build the cache key for a prompt sent to a model client.
+
+        Args:
+            llm: Language model client
+            prompt: Fully rendered prompt
+            sample: Index of the sample for this prompt
+
+        Returns:
+            Cache key from make_key()
+        """
+        temperature = getattr(llm, "temperature", None)
+        return self.make_key(
+            str(getattr(llm, "model", "")),
+            temperature if isinstance(temperature, (int, float)) else None,
+            prompt,
+            sample,
+        )
+
+    def invoke(
+        self,
+        llm: Any,
+        prompt: str,
+        sample: int = 0,
+        on_message: Optional[Callable[[Any], None]] = None,
+    ) -> Tuple[str, bool]:
+        """Return a cached completion, or call the model and cache its answer.
+
+        Args:
+            llm: Language model client with an ``invoke`` method
+            prompt: Fully rendered prompt
+            sample: Index of the sample for this prompt
+            on_message: Optional callback receiving the model's message on a
+                miss (e.g. to read its token usage)
+
+        Returns:
+            Tuple of the response text and whether it came from the cache
+        """
+        key = self.key_for(llm, prompt, sample)
+
+        cached = self.get(key)
+        if isinstance(cached, str):
+            logger.info("LLM response served from cache")
+            return cached, True
+
+        msg = llm.invoke(prompt)
+        if on_message is not None:
+            on_message(msg)
+        content = message_text(msg)
+        self.put(key, content, self.ttl)
+        return content, False
+
+    def stream(
+        self, llm: Any, prompt: str, sample: int = 0
+    ) -> Tuple[Iterator[str], bool]:
+        """Stream a completion, replaying it from the cache when possible.
+
+        A cached completion is returned as a single chunk. Otherwise the
+        model's chunks are passed through and the full answer is cached once
+        the stream has been consumed to the end.
+
+        Args:
+            llm: Language model client with a ``stream`` method
+            prompt: Fully rendered prompt
+            sample: Index of the sample for this prompt
+
+        Returns:
+            Tuple of an iterator over text chunks and whether it is a cache hit
+        """
+        key = self.key_for(llm, prompt, sample)
+
+        cached = self.get(key)
+        if isinstance(cached, str):
+            logger.info("LLM response served from cache")
+            return iter([cached]), True
+
+        def chunks() -> Iterator[str]:
+            parts: List[str] = []
+            for chunk in llm.stream(prompt):
+                text = message_text(chunk)
+                parts.append(text)
+                yield text
+            self.put(key, "".join(parts), self.ttl)
+
+        return chunks(), False
@@ -1,13 +1,23 @@
 """Mock API clients for running the agent in test mode without real API
-keys."""
+keys.
 
-from typing import Any, Dict, List, Union
+Both clients can also inject latency, payload size and failures, which
+lets scripts/bench_workflow.py load the real workflow offline. Injected
+failures are drawn from a seeded generator keyed on the request and on
+how often it has been made, so a scenario fails the same calls every
+time it is replayed, regardless of thread scheduling.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
-from ..search.tavily_client import TavilyClient
+from ..search.tavily_client import TavilyAPIError, TavilyClient
 
 
 # Mock data for Tavily search results, matching the expected output type
-MOCK_TAVILY_SEARCH_RESULTS: List[Dict[str, str]] = [
+MOCK_TAVILY_SEARCH_RESULTS: List[Dict[str, Any]] = [
     {
         "url": "https://mock-news.com/article1",
         "content": (
@@ -74,19 +84,129 @@ of users.**
 """
 
 
+# Words the synthetic search results are made of
+_MOCK_WORDS = (
+    "ransomware exploit patch vendor advisory breach credential phishing "
+    "botnet malware zero-day firmware supply-chain backdoor loader wiper "
+    "espionage campaign researchers disclosed attackers customers cloud "
+    "endpoint kernel driver certificate token outage extortion leak"
+).split()
+
+
+def _request_rng(seed: int, *parts: Any) -> random.Random:
+    """Seeded generator for one request, independent of call order."""
+    return random.Random(":".join(str(part) for part in (seed, *parts)))
+
+
+class _CallCounter:
+    """Thread-safe count of how often each request has been made."""
+
+    def __init__(self) -> None:
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def next(self, key: str) -> int:
+        """Return how often ``key`` was seen before and count this call."""
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        return count
+
+
+class MockLLMError(Exception):
+    """Failure injected by MockChatGoogleGenerativeAI."""
+
+    pass
+
+
 class MockTavilyClient(TavilyClient):
-    """A mock Tavily client that returns pre-defined search results."""
+    """A mock Tavily client that returns pre-defined search results.
+
+    By default every run returns the same two articles for the first
+    query. With ``results_per_query`` set, each query is answered with
+    synthetic articles instead and goes through the real client's
+    concurrent search, caching, metrics and deduplication code; only the
+    HTTP request is simulated.
+    """
 
-    def __init__(self, api_key: str):
-        super().__init__(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        results_per_query: Optional[int] = None,
+        content_chars: int = 300,
+        seed: int = 0,
+        **client_kwargs: Any,
+    ):
+        """Initialize the mock client.
+
+        Args:
+            api_key: Tavily API key (unused)
+            latency: Seconds each simulated search takes
+            failure_rate: Share of simulated searches that fail (0-1)
+            results_per_query: Synthetic results per query (None returns the
+                fixed articles for the first query)
+            content_chars: Approximate length of each synthetic article
+            seed: Seed for the synthetic content and injected failures
+            **client_kwargs: Passed to TavilyClient (max_workers, cache, ...)
+        """
+        super().__init__(api_key=api_key, **client_kwargs)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.results_per_query = results_per_query
+        self.content_chars = content_chars
+        self.seed = seed
+        self._calls = _CallCounter()
+
+    def _search_remote(  # type: ignore[override]
+        self,
+        query: str,
+        max_results: int,
+        include_domains: Optional[List[str]],
+        time_range: str,
+        search_depth: str,
+    ) -> Dict[str, Any]:
+        """Simulate a Tavily request with synthetic results.
+
+        Raises:
+            TavilyAPIError: For the searches picked to fail
+        """
+        call = self._calls.next(query)
+        if self.latency:
+            time.sleep(self.latency)
+        if _request_rng(self.seed, query, call).random() < self.failure_rate:
+            raise TavilyAPIError(f"Injected failure for query '{query}'")
+
+        # The same query always returns the same articles
+        rng = _request_rng(self.seed, query, time_range)
+
+        count = min(max_results, self.results_per_query or 0)
+        results = []
+        for index in range(count):
+            words: List[str] = []
+            while sum(len(word) + 1 for word in words) < self.content_chars:
+                words.append(rng.choice(_MOCK_WORDS))
+            results.append(
+                {
+                    "url": f"https://mock-news.com/{rng.getrandbits(64):x}",
+                    "title": f"{query.title()} #{index + 1}: {words[0]} {words[1]}",
+                    "content": " ".join(words).capitalize() + ".",
+                }
+            )
+        return {"query": query, "results": results}
 
     def collect_context(
         self,
         queries: List[Union[str, Dict[str, Any]]],
         max_per_query: int = 5,
         default_time_range: str = "day",
-    ) -> Dict[str, List[Dict[str, str]]]:
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """Mocks the context collection, returning a fixed list of results."""
+        if self.results_per_query is not None:
+            return super().collect_context(
+                queries, max_per_query, default_time_range
+            )
         print(
             f"--- MOCK Tavily: Collecting context for {len(queries)} queries ---"
         )
@@ -98,10 +218,29 @@ class MockTavilyClient(TavilyClient):
 
         return {first_query: MOCK_TAVILY_SEARCH_RESULTS}
 
+    def iter_context(
+        self,
+        queries: List[Union[str, Dict[str, Any]]],
+        max_per_query: int = 5,
+        default_time_range: str = "day",
+        late_links: Optional[Dict[str, List[str]]] = None,
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Mocks the streaming context collection."""
+        if self.results_per_query is not None:
+            yield from super().iter_context(
+                queries, max_per_query, default_time_range, late_links
+            )
+            return
+        yield from self.collect_context(
+            queries, max_per_query, default_time_range
+        ).items()
+
     def format_context_as_markdown(
         self, context: Dict[str, List[Dict[str, Any]]]
     ) -> str:
         """Mocks the markdown formatting."""
+        if self.results_per_query is not None:
+            return super().format_context_as_markdown(context)
         print("--- MOCK Tavily: Formatting context as markdown ---")
         bullets = []
         for query, items in context.items():
@@ -117,6 +256,8 @@ class MockTavilyClient(TavilyClient):
         self, context: Dict[str, List[Dict[str, Any]]]
     ) -> int:
         """Mocks the result counting."""
+        if self.results_per_query is not None:
+            return super().get_total_results_count(context)
         print("--- MOCK Tavily: Counting total results ---")
         return sum(len(results) for results in context.values())
 
@@ -132,10 +273,58 @@ class MockChatGoogleGenerativeAI:
     """A mock Google Gemini client."""
 
     def __init__(
-        self, model: str, convert_system_message_to_human: bool = False
+        self,
+        model: str,
+        convert_system_message_to_human: bool = False,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        slides_chars: int = 0,
+        seed: int = 0,
+        verbose: bool = True,
     ):
-        # Model and other parameters are ignored in the mock client
+        """Initialize the mock client.
+
+        Args:
+            model: Model name (only reported)
+            convert_system_message_to_human: Ignored
+            latency: Seconds each call takes
+            failure_rate: Share of calls that raise MockLLMError (0-1)
+            slides_chars: Pad the slide deck with extra slides up to about
+                this many characters (0 keeps the fixed deck)
+            seed: Seed for the injected failures
+            verbose: Print a line for every call
+        """
         self.model = model
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.slides_chars = slides_chars
+        self.seed = seed
+        self.verbose = verbose
+        self._calls = _CallCounter()
+
+    def _inject(self, prompt: str) -> None:
+        """Apply the configured latency and maybe fail this call."""
+        call = self._calls.next(prompt)
+        if self.latency:
+            time.sleep(self.latency)
+        if _request_rng(self.seed, prompt, call).random() < self.failure_rate:
+            raise MockLLMError("Injected LLM failure")
+
+    def _slides(self) -> str:
+        """The fixed slide deck, padded to ``slides_chars``."""
+        parts = [MOCK_GEMINI_SLIDES_RESPONSE]
+        size = len(MOCK_GEMINI_SLIDES_RESPONSE)
+        index = 0
+        while size < self.slides_chars:
+            index += 1
+            extra = (
+                f"\n---\n\n## Advisory {index}: patch the affected systems\n\n"
+                f"- Vendor advisory {index} fixes a remote code execution flaw\n"
+                "- Exploitation has been reported; apply the update promptly\n"
+            )
+            parts.append(extra)
+            size += len(extra)
+        return "".join(parts)
 
     def invoke(self, messages: Union[list[Any], str]) -> MockAIMessage:
         """
@@ -148,10 +337,18 @@ class MockChatGoogleGenerativeAI:
         else:
             prompt_content = messages[0].content.lower()
 
-        print(f"--- MOCK Gemini: Invoking model '{self.model}' ---")
+        if self.verbose:
+            print(f"--- MOCK Gemini: Invoking model '{self.model}' ---")
+        self._inject(prompt_content)
 
         if "outline" in prompt_content:
             return MockAIMessage(MOCK_GEMINI_OUTLINE_RESPONSE)
         if "slide" in prompt_content:
-            return MockAIMessage(MOCK_GEMINI_SLIDES_RESPONSE)
+            return MockAIMessage(self._slides())
         return MockAIMessage("This is a generic mock AI response.")
+
+    def stream(self, messages: Union[list[Any], str]) -> Iterator[MockAIMessage]:
+        """Mocks the AI model's `stream` method by chunking `invoke`'s reply."""
+        content = self.invoke(messages).content
+        for start in range(0, len(content), 64):
+            yield MockAIMessage(content[start:start + 64])
@@ -2,36 +2,62 @@
 
 import json
 import logging
-from typing import Any, Dict
-
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langsmith import traceable
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+)
 
+from ..search.cache import SearchCache
+from ..search.dedup import apply_late_links
+from ..search.packing import estimate_tokens, pack_context
 from ..search.tavily_client import TavilyClient, TavilyError
 from ..utils.helpers import (
     clean_title,
-    dedupe_separators,
-    ensure_marp_header,
     find_json,
-    insert_separators,
-    log_message,
-    remove_presenter_lines,
+    join_slides,
+    normalize_marp_markdown,
+    split_slides,
     strip_bullets,
     strip_whole_code_fence,
     today_iso,
 )
+from ..utils.lazy import lazy_traceable
+from ..utils.marp_stream import MarpStreamNormalizer
+from ..utils.metrics import RunMetrics
+from .llm_cache import LLMResponseCache, message_text
+from .sources import SourceSet, SourceStore
 from .state import State
 
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
 logger = logging.getLogger(__name__)
 
 
+def _cache_note(cached: bool) -> str:
+    """Suffix for node log lines whose LLM response came from the cache."""
+    return " (cache hit)" if cached else ""
+
+
 class WorkflowNodes:
     """Collection of workflow nodes for the security news pipeline."""
 
     @staticmethod
-    @traceable(name="0_collect_security_news")
+    @lazy_traceable(name="0_collect_security_news")
     def collect_info(
-        state: State, tavily_client: TavilyClient, config: Any
+        state: State,
+        tavily_client: TavilyClient,
+        config: Any,
+        source_store: SourceStore,
     ) -> Dict[str, Any]:
         """Collect security news from various sources.
 
@@ -39,64 +65,286 @@ class WorkflowNodes:
             state: Current workflow state
             tavily_client: Tavily API client
             config: Agent configuration
+            source_store: Store the collected news is kept in
 
         Returns:
             Updated state dictionary
         """
         # topic = state.get("topic") or "Daily Security News Summary"
 
+        if WorkflowNodes._source_set(state, source_store) is not None:
+            # Batch runs collect the news once and share it between topics
+            logger.info("Using news collected earlier in this batch")
+            return {"log": ["[collect] reused shared results"]}
+
         try:
             # Get search queries from configuration
             queries = config.get_search_queries()
 
+            cache = getattr(tavily_client, "cache", None)
+            if not isinstance(cache, SearchCache):
+                cache = None
+            hits_before = cache.hits if cache else 0
+            misses_before = cache.misses if cache else 0
+
             # Search for news in the last 24 hours
-            sources = tavily_client.collect_context(
-                queries, max_per_query=5, default_time_range="day"
+            sources, context_md = WorkflowNodes._collect_sources(
+                tavily_client, queries
             )
-
-            context_md = tavily_client.format_context_as_markdown(sources)
+            sources_id = source_store.put(sources, context_md=context_md)
             total_results = tavily_client.get_total_results_count(sources)
 
             logger.info(
                 f"Collected {total_results} news articles from {len(sources)} queries"
             )
 
-            return {
-                "sources": sources,
-                "context_md": context_md,
-                "log": log_message(
-                    state,
-                    f"[collect_info] Found news from {len(sources)} queries, {total_results} total results.",
-                ),
-            }
+            log_line = (
+                f"[collect_info] Found news from {len(sources)} queries, "
+                f"{total_results} total results."
+            )
+            if cache:
+                log_line += (
+                    f" Cache: {cache.hits - hits_before} hits, "
+                    f"{cache.misses - misses_before} misses."
+                )
+
+            return {"sources_id": sources_id, "log": [log_line]}
 
         except TavilyError as e:
             error_msg = f"tavily_error: {e}"
             logger.error(f"Failed to collect news: {error_msg}")
             return {
                 "error": error_msg,
-                "log": log_message(state, f"[collect_info] EXCEPTION {e}"),
+                "log": [f"[collect_info] EXCEPTION {e}"],
             }
         except Exception as e:
             error_msg = f"unexpected_error: {e}"
             logger.error(f"Unexpected error in collect_info: {error_msg}")
             return {
                 "error": error_msg,
-                "log": log_message(
-                    state, f"[collect_info] UNEXPECTED EXCEPTION {e}"
-                ),
+                "log": [f"[collect_info] UNEXPECTED EXCEPTION {e}"],
             }
 
     @staticmethod
-    @traceable(name="1_make_outline")
+    def _invoke_llm(
+        llm: "ChatGoogleGenerativeAI",
+        prompt: str,
+        llm_cache: Optional[LLMResponseCache],
+        sample: int = 0,
+        metrics: Optional[RunMetrics] = None,
+        node: str = "",
+    ) -> Tuple[str, bool]:
+        """Call the LLM, going through the response cache when one is set.
+
+        Args:
+            llm: Language model client
+            prompt: Fully rendered prompt
+            llm_cache: Optional cache of LLM responses
+            sample: Index of the sample for this prompt (retry attempt)
+            metrics: Optional run metrics the call is recorded in
+            node: Name of the calling node, for the metrics
+
+        Returns:
+            Tuple of the response text and whether it was a cache hit
+        """
+        usage: List[Any] = []
+
+        def keep_usage(msg: Any) -> None:
+            usage.append(getattr(msg, "usage_metadata", None))
+
+        if llm_cache is None:
+            msg = llm.invoke(prompt)
+            keep_usage(msg)
+            content, cached = message_text(msg), False
+        else:
+            content, cached = llm_cache.invoke(
+                llm, prompt, sample=sample, on_message=keep_usage
+            )
+
+        if metrics is not None:
+            metrics.record_llm(
+                node, prompt, content, cached, usage[0] if usage else None
+            )
+        return content, cached
+
+    @staticmethod
+    def _stream_llm(
+        llm: "ChatGoogleGenerativeAI",
+        prompt: str,
+        llm_cache: Optional[LLMResponseCache],
+        sample: int = 0,
+        metrics: Optional[RunMetrics] = None,
+        node: str = "",
+    ) -> Tuple[Iterator[str], bool]:
+        """Stream the LLM's answer, going through the cache when one is set.
+
+        Args:
+            llm: Language model client
+            prompt: Fully rendered prompt
+            llm_cache: Optional cache of LLM responses
+            sample: Index of the sample for this prompt (retry attempt)
+            metrics: Optional run metrics the call is recorded in once the
+                stream has been consumed
+            node: Name of the calling node, for the metrics
+
+        Returns:
+            Tuple of an iterator over text chunks and whether it is a cache hit
+        """
+        if llm_cache is None:
+            chunks: Iterator[str] = (
+                message_text(chunk) for chunk in llm.stream(prompt)
+            )
+            cached = False
+        else:
+            chunks, cached = llm_cache.stream(llm, prompt, sample=sample)
+        if metrics is None:
+            return chunks, cached
+
+        def recorded() -> Iterator[str]:
+            parts: List[str] = []
+            for text in chunks:
+                parts.append(text)
+                yield text
+            metrics.record_llm(node, prompt, "".join(parts), cached)
+
+        return recorded(), cached
+
+    @staticmethod
+    def _stream_slides(
+        chunks: Iterator[str], title: str, partial_path: str = ""
+    ) -> str:
+        """Normalize streamed slide markdown, saving slides as they complete.
+
+        Args:
+            chunks: Raw LLM output chunks
+            title: Deck title for the Marp front matter
+            partial_path: File that receives the deck slide by slide while it
+                is generated ("" = do not write)
+
+        Returns:
+            Normalized Marp Markdown
+        """
+        started = time.monotonic()
+        partial: Optional[TextIO] = None
+
+        def on_slide(text: str) -> None:
+            if normalizer.slide_count == 1:
+                logger.info(
+                    f"First slide ready after {time.monotonic() - started:.1f}s"
+                )
+            if partial is not None:
+                partial.write(text)
+                partial.flush()
+
+        normalizer = MarpStreamNormalizer(title, on_slide=on_slide)
+        try:
+            if partial_path:
+                Path(partial_path).parent.mkdir(parents=True, exist_ok=True)
+                partial = open(partial_path, "w", encoding="utf-8")
+            for chunk in chunks:
+                normalizer.feed(chunk)
+            return normalizer.close()
+        finally:
+            if partial is not None:
+                partial.close()
+
+    @staticmethod
+    def _collect_sources(
+        tavily_client: TavilyClient, queries: List[Any]
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], str]:
+        """Search the queries, building the context markdown as results arrive.
+
+        Args:
+            tavily_client: Tavily API client
+            queries: Search queries from the configuration
+
+        Returns:
+            Results per query and their context markdown
+        """
+        streamed: Dict[str, List[Dict[str, Any]]] = {}
+        sections: Dict[str, str] = {}
+        late_links: Dict[str, List[str]] = {}
+        for query, items in tavily_client.iter_context(
+            queries,
+            max_per_query=5,
+            default_time_range="day",
+            late_links=late_links,
+        ):
+            streamed[query] = items
+            sections[query] = tavily_client.format_query_markdown(query, items)
+
+        # Later queries can find more links to stories already rendered;
+        # only those sections are rendered again
+        sources = apply_late_links(streamed, late_links)
+        for query, items in sources.items():
+            if items is not streamed[query]:
+                sections[query] = tavily_client.format_query_markdown(query, items)
+        return sources, "\n".join(sections.values())
+
+    @staticmethod
+    def _source_set(
+        state: State, source_store: Optional[SourceStore]
+    ) -> Optional[SourceSet]:
+        """Look up the news collected for a run.
+
+        Args:
+            state: Current workflow state
+            source_store: Store the news was collected into
+
+        Returns:
+            The collected sources, or None if there are none
+        """
+        sources_id = state.get("sources_id")
+        if not sources_id or source_store is None:
+            return None
+        return source_store.get(sources_id)
+
+    @staticmethod
+    def _prompt_context(source_set: Optional[SourceSet], max_tokens: int) -> str:
+        """Get the news context for a prompt, packed into a token budget.
+
+        Args:
+            source_set: Collected sources
+            max_tokens: Token budget (0 = unlimited)
+
+        Returns:
+            Context markdown; the full rendered context if there are no
+            structured sources or the budget is unlimited
+        """
+        if source_set is None:
+            return ""
+        context_md = source_set.context_md
+        sources = source_set.sources
+        if not max_tokens or not sources:
+            return context_md
+
+        packed = pack_context(sources, max_tokens)
+        if packed != context_md:
+            logger.info(
+                f"Packed news context to ~{estimate_tokens(packed)} tokens "
+                f"(from ~{estimate_tokens(context_md)})"
+            )
+        return packed
+
+    @staticmethod
+    @lazy_traceable(name="1_make_outline")
     def make_outline(
-        state: State, llm: ChatGoogleGenerativeAI
+        state: State,
+        llm: "ChatGoogleGenerativeAI",
+        context_tokens: int = 0,
+        llm_cache: Optional[LLMResponseCache] = None,
+        metrics: Optional[RunMetrics] = None,
+        source_store: Optional[SourceStore] = None,
     ) -> Dict[str, Any]:
         """Generate outline from collected news.
 
         Args:
             state: Current workflow state
             llm: Language model client
+            context_tokens: Token budget for the news context (0 = unlimited)
+            llm_cache: Optional cache of LLM responses
+            metrics: Optional run metrics receiving the LLM calls
+            source_store: Store holding the collected news
 
         Returns:
             Updated state dictionary
@@ -105,14 +353,15 @@ class WorkflowNodes:
             return {}
 
         topic = state.get("topic") or "Daily Security News Summary"
-        context_md = state.get("context_md") or ""
+        source_set = WorkflowNodes._source_set(state, source_store)
 
-        if not context_md.strip():
+        if source_set is None or not source_set.context_md.strip():
             logger.warning("No context available for outline generation")
             return {
                 "error": "No news context available for outline generation",
-                "log": log_message(state, "[outline] No context available"),
+                "log": ["[outline] No context available"],
             }
+        context_md = WorkflowNodes._prompt_context(source_set, context_tokens)
 
         prompt = f"""
 System: You are a senior cybersecurity analyst. Your task is to create a \
@@ -131,11 +380,8 @@ concise bulleted list. Include URLs in your points.
 
         try:
             logger.info("Generating outline from collected news")
-            msg = llm.invoke(prompt)
-            content = (
-                msg.content
-                if isinstance(msg.content, str)
-                else str(msg.content)
+            content, cached = WorkflowNodes._invoke_llm(
+                llm, prompt, llm_cache, metrics=metrics, node="make_outline"
             )
             bullets = strip_bullets(content.splitlines())[:5] or [
                 content.strip()
@@ -144,9 +390,10 @@ concise bulleted list. Include URLs in your points.
             logger.info(f"Generated outline with {len(bullets)} items")
             return {
                 "outline": bullets,
-                "log": log_message(
-                    state, f"[outline] Generated {len(bullets)} outline items"
-                ),
+                "log": [
+                    f"[outline] Generated {len(bullets)} outline items"
+                    f"{_cache_note(cached)}",
+                ],
             }
 
         except Exception as e:
@@ -154,17 +401,24 @@ concise bulleted list. Include URLs in your points.
             logger.error(f"Failed to generate outline: {error_msg}")
             return {
                 "error": error_msg,
-                "log": log_message(state, f"[outline] EXCEPTION {e}"),
+                "log": [f"[outline] EXCEPTION {e}"],
             }
 
     @staticmethod
-    @traceable(name="2_make_toc")
-    def make_toc(state: State, llm: ChatGoogleGenerativeAI) -> Dict[str, Any]:
+    @lazy_traceable(name="2_make_toc")
+    def make_toc(
+        state: State,
+        llm: "ChatGoogleGenerativeAI",
+        llm_cache: Optional[LLMResponseCache] = None,
+        metrics: Optional[RunMetrics] = None,
+    ) -> Dict[str, Any]:
         """Generate table of contents from outline.
 
         Args:
             state: Current workflow state
             llm: Language model client
+            llm_cache: Optional cache of LLM responses
+            metrics: Optional run metrics receiving the LLM calls
 
         Returns:
             Updated state dictionary
@@ -178,7 +432,7 @@ concise bulleted list. Include URLs in your points.
             logger.warning("No outline available for TOC generation")
             return {
                 "error": "No outline available for TOC generation",
-                "log": log_message(state, "[toc] No outline available"),
+                "log": ["[toc] No outline available"],
             }
 
         prompt = f"""
@@ -192,11 +446,13 @@ Outline:
 
         try:
             logger.info("Generating table of contents")
-            msg = llm.invoke(prompt)
-            content = (
-                msg.content
-                if isinstance(msg.content, str)
-                else str(msg.content)
+            content, cached = WorkflowNodes._invoke_llm(
+                llm,
+                prompt,
+                llm_cache,
+                sample=state.get("attempts") or 0,
+                metrics=metrics,
+                node="make_toc",
             )
 
             try:
@@ -227,9 +483,7 @@ Outline:
             return {
                 "toc": toc,
                 "error": "",
-                "log": log_message(
-                    state, f"[toc] Generated {len(toc)} chapters"
-                ),
+                "log": [f"[toc] Generated {len(toc)} chapters{_cache_note(cached)}"],
             }
 
         except Exception as e:
@@ -237,19 +491,36 @@ Outline:
             logger.error(f"Failed to generate TOC: {error_msg}")
             return {
                 "error": error_msg,
-                "log": log_message(state, f"[toc] EXCEPTION {e}"),
+                "log": [f"[toc] EXCEPTION {e}"],
             }
 
     @staticmethod
-    @traceable(name="3_write_slides")
+    @lazy_traceable(name="3_write_slides")
     def write_slides(
-        state: State, llm: ChatGoogleGenerativeAI
+        state: State,
+        llm: "ChatGoogleGenerativeAI",
+        context_tokens: int = 0,
+        llm_cache: Optional[LLMResponseCache] = None,
+        stream: bool = False,
+        partial_path: str = "",
+        metrics: Optional[RunMetrics] = None,
+        source_store: Optional[SourceStore] = None,
     ) -> Dict[str, Any]:
         """Write slide content in Marp format.
 
+        In streaming mode the deck is normalized line by line as the model
+        writes it, and each finished slide can be appended to a partial file.
+
         Args:
             state: Current workflow state
             llm: Language model client
+            context_tokens: Token budget for the news context (0 = unlimited)
+            llm_cache: Optional cache of LLM responses
+            stream: Whether to stream the LLM output
+            partial_path: File the streamed deck is written to slide by slide
+                ("" = do not write)
+            metrics: Optional run metrics receiving the LLM calls
+            source_store: Store holding the collected news
 
         Returns:
             Updated state dictionary
@@ -257,14 +528,15 @@ Outline:
         if state.get("error"):
             return {}
 
-        context_md = state.get("context_md") or ""
+        source_set = WorkflowNodes._source_set(state, source_store)
 
-        if not context_md.strip():
+        if source_set is None or not source_set.context_md.strip():
             logger.warning("No context available for slide generation")
             return {
                 "error": "No news context available for slide generation",
-                "log": log_message(state, "[slides] No context available"),
+                "log": ["[slides] No context available"],
             }
+        context_md = WorkflowNodes._prompt_context(source_set, context_tokens)
 
         title = f"{today_iso()}_Daily_Security_Briefing"
 
@@ -291,20 +563,19 @@ Requirements:
 
         try:
             logger.info("Generating slide content")
-            msg = llm.invoke(prompt)
-            content = (
-                msg.content
-                if isinstance(msg.content, str)
-                else str(msg.content)
-            )
-            slide_md = content.strip()
-
-            # Process the markdown
-            slide_md = strip_whole_code_fence(slide_md)
-            slide_md = insert_separators(slide_md)
-            slide_md = dedupe_separators(slide_md)
-            slide_md = ensure_marp_header(slide_md, clean_title(title))
-            slide_md = remove_presenter_lines(slide_md)
+            sample = state.get("attempts") or 0
+            if stream:
+                chunks, cached = WorkflowNodes._stream_llm(
+                    llm, prompt, llm_cache, sample, metrics, "write_slides"
+                )
+                slide_md = WorkflowNodes._stream_slides(
+                    chunks, clean_title(title), partial_path
+                )
+            else:
+                content, cached = WorkflowNodes._invoke_llm(
+                    llm, prompt, llm_cache, sample, metrics, "write_slides"
+                )
+                slide_md = normalize_marp_markdown(content, clean_title(title))
 
             logger.info(
                 f"Generated slide content ({len(slide_md)} characters)"
@@ -313,9 +584,10 @@ Requirements:
                 "slide_md": slide_md,
                 "title": title,
                 "error": "",
-                "log": log_message(
-                    state, f"[slides] generated ({len(slide_md)} chars)"
-                ),
+                "log": [
+                    f"[slides] generated ({len(slide_md)} chars)"
+                    f"{_cache_note(cached)}",
+                ],
             }
 
         except Exception as e:
@@ -323,13 +595,17 @@ Requirements:
             logger.error(f"Failed to generate slides: {error_msg}")
             return {
                 "error": error_msg,
-                "log": log_message(state, f"[slides] EXCEPTION {e}"),
+                "log": [f"[slides] EXCEPTION {e}"],
             }
 
     @staticmethod
-    @traceable(name="4_evaluate_slides")
+    @lazy_traceable(name="4_evaluate_slides")
     def evaluate_slides(
-        state: State, llm: ChatGoogleGenerativeAI, max_attempts: int = 3
+        state: State,
+        llm: "ChatGoogleGenerativeAI",
+        max_attempts: int = 3,
+        llm_cache: Optional[LLMResponseCache] = None,
+        metrics: Optional[RunMetrics] = None,
     ) -> Dict[str, Any]:
         """Evaluate the generated slides for quality.
 
@@ -337,6 +613,8 @@ Requirements:
             state: Current workflow state
             llm: Language model client
             max_attempts: Maximum number of attempts allowed
+            llm_cache: Optional cache of LLM responses
+            metrics: Optional run metrics receiving the LLM calls
 
         Returns:
             Updated state dictionary
@@ -355,9 +633,7 @@ Requirements:
             logger.warning("No slide content to evaluate")
             return {
                 "error": "No slide content available for evaluation",
-                "log": log_message(
-                    state, "[evaluate] No slide content available"
-                ),
+                "log": ["[evaluate] No slide content available"],
             }
 
         eval_guide = (
@@ -374,9 +650,9 @@ System: You are a principal security architect. You will rigorously score the fo
 
 User:
 Topic: {topic}
-Slides (Marp Markdown):
+Slides (Marp Markdown, each slide labeled with its number):
 <<<SLIDES
-{slide_md}
+{WorkflowNodes._number_slides(slide_md)}
 SLIDES
 
 Evaluation Guide:
@@ -391,17 +667,23 @@ Return strictly this JSON schema:
   "reasons": {{"structure": string, "accuracy": string, "clarity": string, "conciseness": string}},
   "suggestions": [string],
   "pass": boolean,
-  "feedback": string
+  "feedback": string,
+  "flagged_slides": [{{"slide": number, "issue": string}}]
 }}
+List in "flagged_slides" only the slides that must be rewritten for the deck \
+to pass, by slide number. Leave it empty if the deck passes or if the problems \
+concern the deck as a whole.
 """
 
         try:
             logger.info("Evaluating slide quality")
-            msg = llm.invoke(prompt)
-            raw = (
-                msg.content
-                if isinstance(msg.content, str)
-                else str(msg.content)
+            raw, cached = WorkflowNodes._invoke_llm(
+                llm,
+                prompt,
+                llm_cache,
+                sample=state.get("attempts") or 0,
+                metrics=metrics,
+                node="evaluate_slides",
             )
             json_content = find_json(raw) or raw
             data = json.loads(json_content)
@@ -421,11 +703,14 @@ Return strictly this JSON schema:
                 "suggestions": data.get("suggestions") or [],
                 "passed": passed,
                 "feedback": str(data.get("feedback", "")).strip(),
-                "attempts": attempts,
-                "log": log_message(
-                    state,
-                    f"[evaluate] score={score:.2f} pass={passed} attempts={attempts}",
+                "flagged_slides": WorkflowNodes._parse_flagged_slides(
+                    data.get("flagged_slides"), len(split_slides(slide_md)[1])
                 ),
+                "attempts": attempts,
+                "log": [
+                    f"[evaluate] score={score:.2f} pass={passed} attempts={attempts}"
+                    f"{_cache_note(cached)}",
+                ],
             }
 
         except (json.JSONDecodeError, KeyError, ValueError) as e:
@@ -449,33 +734,223 @@ Return strictly this JSON schema:
                 "suggestions": ["Review slide content manually"],
                 "passed": attempts >= max_attempts,  # Pass if max attempts reached
                 "feedback": "Evaluation parsing failed, using default scores",
+                "flagged_slides": [],
                 "attempts": attempts,
-                "log": log_message(
-                    state, f"[evaluate] parsing failed, attempts={attempts}"
-                ),
+                "log": [f"[evaluate] parsing failed, attempts={attempts}"],
             }
         except Exception as e:
             error_msg = f"eval_error: {e}"
             logger.error(f"Failed to evaluate slides: {error_msg}")
             return {
                 "error": error_msg,
-                "log": log_message(state, f"[evaluate] EXCEPTION {e}"),
+                "log": [f"[evaluate] EXCEPTION {e}"],
             }
 
     @staticmethod
-    def route_after_eval(state: State, max_attempts: int = 3) -> str:
+    @lazy_traceable(name="5_repair_slides")
+    def repair_slides(
+        state: State,
+        llm: "ChatGoogleGenerativeAI",
+        context_tokens: int = 0,
+        llm_cache: Optional[LLMResponseCache] = None,
+        metrics: Optional[RunMetrics] = None,
+        source_store: Optional[SourceStore] = None,
+    ) -> Dict[str, Any]:
+        """Rewrite only the slides flagged by the evaluator.
+
+        The deck is split on its ``---`` separators, each flagged slide is
+        rewritten in its own LLM call (concurrently), and the results are
+        spliced back in place. Slides whose rewrite fails are kept as is.
+
+        Args:
+            state: Current workflow state
+            llm: Language model client
+            context_tokens: Token budget for the news context (0 = unlimited)
+            llm_cache: Optional cache of LLM responses
+            metrics: Optional run metrics receiving the LLM calls
+            source_store: Store holding the collected news
+
+        Returns:
+            Updated state dictionary
+        """
+        if state.get("error"):
+            return {}
+
+        front_matter, slides = split_slides(state.get("slide_md") or "")
+        flagged = state.get("flagged_slides") or []
+        context_md = WorkflowNodes._prompt_context(
+            WorkflowNodes._source_set(state, source_store), context_tokens
+        )
+        sample = state.get("attempts") or 0
+
+        def rewrite(entry: Dict[str, Any]) -> Tuple[int, Optional[str], bool]:
+            index = entry["slide"] - 1
+            prompt = WorkflowNodes._repair_prompt(
+                state, slides[index], entry.get("issue", ""), context_md
+            )
+            try:
+                content, cached = WorkflowNodes._invoke_llm(
+                    llm, prompt, llm_cache, sample, metrics, "repair_slides"
+                )
+            except Exception as e:
+                logger.warning(f"Failed to rewrite slide {index + 1}: {e}")
+                return index, None, False
+            return index, WorkflowNodes._clean_repaired_slide(content), cached
+
+        logger.info(f"Repairing {len(flagged)} flagged slides")
+        with ThreadPoolExecutor(max_workers=min(len(flagged), 4) or 1) as executor:
+            results = list(executor.map(rewrite, flagged))
+
+        repaired = 0
+        hits = 0
+        for index, new_slide, cached in results:
+            if not new_slide:
+                continue
+            # Keep the blank lines around the slide so the deck layout holds
+            old = slides[index]
+            lead = old[: len(old) - len(old.lstrip())]
+            trail = old[len(old.rstrip()):]
+            slides[index] = lead + new_slide + trail
+            repaired += 1
+            hits += cached
+
+        slide_md = join_slides(front_matter, slides)
+        logger.info(f"Repaired {repaired}/{len(flagged)} slides")
+        return {
+            "slide_md": slide_md,
+            "flagged_slides": [],
+            "log": [
+                f"[repair] rewrote {repaired}/{len(flagged)} slides "
+                f"({len(slide_md)} chars){_cache_note(repaired > 0 and hits == repaired)}",
+            ],
+        }
+
+    @staticmethod
+    def _repair_prompt(
+        state: State, slide: str, issue: str, context_md: str
+    ) -> str:
+        """Build the prompt asking for a single slide to be rewritten.
+
+        Args:
+            state: Current workflow state
+            slide: Markdown of the slide to rewrite
+            issue: Problem reported by the evaluator for this slide
+            context_md: News context the slide must be based on
+
+        Returns:
+            Rendered prompt
+        """
+        suggestions = "\n".join(
+            f"- {item}" for item in state.get("suggestions") or []
+        )
+        return f"""
+System: You are a senior cybersecurity analyst revising one slide of a Marp \
+Markdown presentation. Rewrite only the slide given below.
+Do not wrap the output in a code block. Do not include slide separators (---).
+Keep the slide's heading level (## for content slides). Base your writing \
+ONLY on the facts in the "Latest News Summary" below and keep the URLs.
+
+User:
+Latest News Summary (with sources):
+{context_md}
+
+Reviewer feedback on the whole deck:
+{state.get("feedback") or "(none)"}
+{suggestions}
+
+Problem with this slide:
+{issue or "(not specified)"}
+
+Slide to rewrite:
+<<<SLIDE
+{slide.strip()}
+SLIDE
+"""
+
+    @staticmethod
+    def _clean_repaired_slide(content: str) -> str:
+        """Normalize a rewritten slide returned by the LLM.
+
+        Args:
+            content: Raw LLM output
+
+        Returns:
+            Slide markdown without wrapping fences or separator lines
+        """
+        text = strip_whole_code_fence(content.strip())
+        lines = [line for line in text.splitlines() if line.strip() != "---"]
+        return "\n".join(lines).strip()
+
+    @staticmethod
+    def _number_slides(slide_md: str) -> str:
+        """Label each slide with its number for the evaluator.
+
+        Args:
+            slide_md: Marp Markdown deck
+
+        Returns:
+            Deck with a ``<!-- slide N -->`` comment opening every slide
+        """
+        front_matter, slides = split_slides(slide_md)
+        numbered = [
+            f"<!-- slide {number} -->\n{body.strip()}"
+            for number, body in enumerate(slides, start=1)
+        ]
+        return join_slides(front_matter, numbered)
+
+    @staticmethod
+    def _parse_flagged_slides(raw: Any, slide_count: int) -> List[Dict[str, Any]]:
+        """Validate the evaluator's list of slides that need a rewrite.
+
+        Args:
+            raw: ``flagged_slides`` value from the evaluation JSON
+            slide_count: Number of slides in the deck
+
+        Returns:
+            Entries with a valid 1-based ``slide`` number and an ``issue``,
+            one per slide, in deck order
+        """
+        if not isinstance(raw, list):
+            return []
+
+        flagged: Dict[int, Dict[str, Any]] = {}
+        for entry in raw:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                number = int(entry["slide"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if 1 <= number <= slide_count and number not in flagged:
+                flagged[number] = {
+                    "slide": number,
+                    "issue": str(entry.get("issue") or "").strip(),
+                }
+        return [flagged[number] for number in sorted(flagged)]
+
+    @staticmethod
+    def route_after_eval(
+        state: State, max_attempts: int = 3, repair: bool = False
+    ) -> str:
         """Determine next step after evaluation.
 
         Args:
             state: Current workflow state
             max_attempts: Maximum number of attempts allowed
+            repair: Whether a failed deck with flagged slides is repaired
+                slide by slide instead of regenerated
 
         Returns:
-            Next node name ("ok" or "retry")
+            Next node name ("ok", "repair" or "retry")
         """
         attempts = state.get("attempts", 0)
         passed = state.get("passed", False)
 
+        if state.get("error"):
+            # Retrying cannot clear an error; end the run so it can be resumed
+            logger.info("Workflow error recorded, ending the run")
+            return "ok"
+
         if attempts >= max_attempts:
             logger.info(
                 f"Max attempts ({max_attempts}) reached, proceeding to save"
@@ -485,8 +960,15 @@ Return strictly this JSON schema:
         if passed:
             logger.info("Evaluation passed, proceeding to save")
             return "ok"
-        else:
+
+        if repair and state.get("flagged_slides") and state.get("slide_md"):
             logger.info(
-                f"Evaluation failed (attempt {attempts}/{max_attempts}), retrying"
+                f"Evaluation failed (attempt {attempts}/{max_attempts}), "
+                f"repairing {len(state['flagged_slides'])} slides"
             )
-            return "retry"
+            return "repair"
+
+        logger.info(
+            f"Evaluation failed (attempt {attempts}/{max_attempts}), retrying"
+        )
+        return "retry"
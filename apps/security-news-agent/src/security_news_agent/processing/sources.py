@@ -0,0 +1,244 @@
+"""Shared, content-addressed store of the news collected for briefings."""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.fileio import atomic_write_bytes
+from ..utils.helpers import deep_sizeof
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Search results per query, as returned by TavilyClient.collect_context()
+Sources = Dict[str, List[Dict[str, Any]]]
+
+
+class SourceSet:
+    """One collection of search results and its rendered news context.
+
+    The context markdown is rendered on first use, unless it was given
+    already, and then kept, so briefings sharing the collection share one
+    copy of it too.
+    """
+
+    __slots__ = ("id", "sources", "_render", "_context_md", "_lock")
+
+    def __init__(
+        self,
+        source_id: str,
+        sources: Sources,
+        render: Callable[[Sources], str],
+        context_md: Optional[str] = None,
+    ) -> None:
+        """Initialize the set.
+
+        Args:
+            source_id: Content hash of the sources
+            sources: Search results per query
+            render: Function rendering the sources as context markdown
+            context_md: The sources already rendered, if available
+        """
+        self.id = source_id
+        self.sources = sources
+        self._render = render
+        self._context_md = context_md
+        self._lock = threading.Lock()
+
+    @property
+    def context_md(self) -> str:
+        """The sources rendered as markdown, rendered on first access."""
+        if self._context_md is None:
+            with self._lock:
+                if self._context_md is None:
+                    self._context_md = self._render(self.sources)
+        return self._context_md
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the sources and rendered context."""
+        return deep_sizeof(self.sources) + deep_sizeof(self._context_md)
+
+
+class SourceStore:
+    """Keep each distinct collection of search results once per process.
+
+    Workflow state refers to a collection by its content hash instead of
+    carrying the results and their markdown through every step, retry and
+    checkpoint. Briefings of a batch share one entry, and collecting the
+    same results again reuses the existing one.
+
+    Up to ``max_entries`` collections are kept in memory. With a
+    ``directory``, each collection is also saved there so that runs
+    resumed from a checkpoint in a new process find their sources; files
+    older than ``max_age_days`` are deleted when the store is created.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[Sources], str],
+        directory: Optional[str] = None,
+        max_entries: int = 32,
+        max_age_days: float = 7,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            render: Function rendering sources as context markdown
+            directory: Optional directory the collections are saved in
+            max_entries: Collections kept in memory
+            max_age_days: Delete saved collections older than this
+                (0 keeps all)
+        """
+        self.render = render
+        self.directory = Path(directory) if directory else None
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, SourceSet]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if max_age_days:
+                self.prune(time.time() - max_age_days * 86400)
+
+    @staticmethod
+    def make_id(sources: Sources) -> str:
+        """Hash a collection; equal results in the same order share an id.
+
+        Args:
+            sources: Search results per query
+
+        Returns:
+            Hex digest identifying the collection
+        """
+        payload = json.dumps(sources, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+    @staticmethod
+    def _path(directory: Path, source_id: str) -> Path:
+        """File a collection is saved in."""
+        return directory / f"{source_id}.json.gz"
+
+    def _remember(self, entry: SourceSet) -> SourceSet:
+        """Add an entry, or return the one already held (lock held)."""
+        existing = self._entries.get(entry.id)
+        if existing is not None:
+            self._entries.move_to_end(entry.id)
+            return existing
+        self._entries[entry.id] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def put(self, sources: Sources, context_md: Optional[str] = None) -> str:
+        """Store a collection.
+
+        Args:
+            sources: Search results per query
+            context_md: The sources already rendered, if available
+
+        Returns:
+            Id under which the collection can be fetched
+        """
+        source_id = self.make_id(sources)
+        with self._lock:
+            self._remember(SourceSet(source_id, sources, self.render, context_md))
+
+        if self.directory is not None:
+            self._save(self.directory, source_id, sources)
+        return source_id
+
+    def _save(self, directory: Path, source_id: str, sources: Sources) -> None:
+        """Write a collection to the directory unless it is there already."""
+        path = self._path(directory, source_id)
+        if path.exists():
+            # Keep a collection that new runs still use from being pruned
+            try:
+                path.touch()
+            except OSError:
+                pass
+            return
+        data = gzip.compress(
+            json.dumps(sources, ensure_ascii=False, default=str).encode("utf-8")
+        )
+        try:
+            atomic_write_bytes(path, data, overwrite=False)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to save sources {source_id}: {e}")
+
+    def get(self, source_id: str) -> Optional[SourceSet]:
+        """Fetch a collection.
+
+        Args:
+            source_id: Id returned by put()
+
+        Returns:
+            The collection, or None if it is unknown
+        """
+        with self._lock:
+            entry = self._entries.get(source_id)
+            if entry is not None:
+                self._entries.move_to_end(source_id)
+                return entry
+
+        sources = self._load(source_id)
+        if sources is None:
+            return None
+        with self._lock:
+            return self._remember(SourceSet(source_id, sources, self.render))
+
+    def _load(self, source_id: str) -> Optional[Sources]:
+        """Read a saved collection, if there is one."""
+        if self.directory is None:
+            return None
+        try:
+            path = self._path(self.directory, source_id)
+            data = gzip.decompress(path.read_bytes())
+        except (OSError, EOFError):
+            return None
+        try:
+            sources: Sources = json.loads(data)
+        except ValueError:
+            logger.warning(f"Ignoring unreadable sources file for {source_id}")
+            return None
+        return sources
+
+    def prune(self, before: float) -> int:
+        """Delete saved collections last written before a timestamp.
+
+        Args:
+            before: Cut-off timestamp
+
+        Returns:
+            Number of files deleted
+        """
+        if self.directory is None:
+            return 0
+        deleted = 0
+        for path in self.directory.glob("*.json.gz"):
+            try:
+                if path.stat().st_mtime < before:
+                    path.unlink()
+                    deleted += 1
+            except OSError:
+                continue
+        if deleted:
+            logger.debug(f"Pruned {deleted} saved source collections")
+        return deleted
+
+    def __len__(self) -> int:
+        """Number of collections held in memory."""
+        with self._lock:
+            return len(self._entries)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the collections in memory."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return sum(entry.nbytes() for entry in entries)
@@ -1,6 +1,56 @@
 """State management for the LangGraph workflow."""
 
-from typing import Dict, List, TypedDict
+from typing import Annotated, Any, Dict, List, Mapping, TypedDict, TypeVar
+
+from ..utils.helpers import deep_sizeof
+
+T = TypeVar("T")
+
+
+def append_log(left: List[T], right: List[T]) -> List[T]:
+    """Append the log entries written by a node.
+
+    Nodes return only their new messages, so the log is never copied into
+    a node's output, and updates from nodes that ran in parallel are all
+    kept. The current list is not extended in place because earlier
+    checkpoints may still refer to it.
+
+    Args:
+        left: Current log
+        right: New entries returned by a node
+
+    Returns:
+        Combined log
+    """
+    return left + right if right else left
+
+
+def keep_error(left: str, right: str) -> str:
+    """Keep an error reported by any parallel branch.
+
+    Successful nodes write an empty error; that must not hide a failure
+    reported by a sibling branch in the same step.
+
+    Args:
+        left: Current error
+        right: Error returned by a node
+
+    Returns:
+        The new error if non-empty, otherwise the current one
+    """
+    return right or left
+
+
+def state_nbytes(state: Mapping[str, Any]) -> int:
+    """Approximate the memory held by a state, without its memory report.
+
+    Args:
+        state: Workflow state
+
+    Returns:
+        Size in bytes
+    """
+    return deep_sizeof({k: v for k, v in state.items() if k != "memory"})
 
 
 class State(TypedDict):
@@ -17,10 +67,13 @@ class State(TypedDict):
     risk_flags: List[str]
     passed: bool
     feedback: str
+    flagged_slides: List[Dict[str, Any]]
     title: str
     slide_path: str
     attempts: int
-    error: str
-    log: List[str]
-    context_md: str
-    sources: Dict[str, List[Dict[str, str]]]
+    error: Annotated[str, keep_error]
+    log: Annotated[List[str], append_log]
+    # Id of the collected news in the workflow's SourceStore
+    sources_id: str
+    # One entry per node execution: node name and state size afterwards
+    memory: Annotated[List[Dict[str, Any]], append_log]
@@ -1,17 +1,49 @@
 """LangGraph workflow management for security news processing."""
 
 import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
-
-from langchain_core.runnables import RunnableConfig
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.graph import END, START, StateGraph
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Union,
+    cast,
+)
 
 from ..config.settings import AgentConfig
-from ..search.tavily_client import TavilyClient
+from ..utils.error_handling import ProcessingError
+from ..utils.helpers import slugify_en
+from ..utils.lazy import lazy_exports
+from ..utils.metrics import RunMetrics
+from .llm_cache import LLMResponseCache
 from .nodes import WorkflowNodes
-from .state import State
+from .sources import SourceStore
+from .state import State, append_log, state_nbytes
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+
+    from ..search.tavily_client import TavilyClient
+
+# LangGraph and the Gemini client take over a second to import; they are
+# loaded when a workflow is built, and test-mode runs with the mock LLM
+# never load the Gemini client at all
+__getattr__ = lazy_exports(
+    globals(),
+    {
+        "ChatGoogleGenerativeAI": "langchain_google_genai",
+        "END": "langgraph.graph",
+        "START": "langgraph.graph",
+        "StateGraph": "langgraph.graph",
+    },
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +54,12 @@ class SecurityNewsWorkflow:
     def __init__(
         self,
         config: AgentConfig,
-        tavily_client: TavilyClient,
+        tavily_client: "TavilyClient",
         llm_client: Any = None,
+        llm_cache: Optional[LLMResponseCache] = None,
+        checkpointer: Optional["BaseCheckpointSaver"] = None,
+        metrics: Optional[RunMetrics] = None,
+        source_store: Optional[SourceStore] = None,
     ):
         """Initialize the workflow.
 
@@ -31,16 +67,29 @@ class SecurityNewsWorkflow:
             config: Agent configuration
             tavily_client: Tavily API client
             llm_client: Optional pre-initialized LLM client for mocking/testing
+            llm_cache: Optional persistent cache of LLM responses
+            checkpointer: Optional checkpoint store that makes runs resumable
+            metrics: Optional collector of per-node timings and LLM usage
+            source_store: Optional store for the collected news; runs
+                resumed in a new process need one saving to disk
         """
         self.config = config
         self.tavily_client = tavily_client
+        self.llm_cache = llm_cache
+        self.checkpointer = checkpointer
+        self.metrics = metrics
+        if source_store is None:
+            source_store = SourceStore(
+                render=tavily_client.format_context_as_markdown
+            )
+        self.source_store = source_store
         self.max_attempts = 3
 
         # Initialize LLM
         if llm_client:
             self.llm = llm_client
         else:
-            self.llm = ChatGoogleGenerativeAI(
+            self.llm = __getattr__("ChatGoogleGenerativeAI")(
                 model=config.gemini_model_name,
                 google_api_key=config.google_api_key,
                 temperature=0.2,
@@ -60,60 +109,157 @@ class SecurityNewsWorkflow:
         Returns:
             Compiled StateGraph
         """
-        graph_builder = StateGraph(State)
+        END, START = __getattr__("END"), __getattr__("START")
+        graph_builder = __getattr__("StateGraph")(State)
 
         # Add nodes
-        graph_builder.add_node("collect_info", self._collect_info_wrapper)
-        graph_builder.add_node("make_outline", self._make_outline_wrapper)
-        graph_builder.add_node("make_toc", self._make_toc_wrapper)
-        graph_builder.add_node("write_slides", self._write_slides_wrapper)
-        graph_builder.add_node(
-            "evaluate_slides", self._evaluate_slides_wrapper
-        )
+        nodes = {
+            "collect_info": self._collect_info_wrapper,
+            "make_outline": self._make_outline_wrapper,
+            "make_toc": self._make_toc_wrapper,
+            "write_slides": self._write_slides_wrapper,
+            "evaluate_slides": self._evaluate_slides_wrapper,
+            "repair_slides": self._repair_slides_wrapper,
+        }
+        for name, wrapper in nodes.items():
+            graph_builder.add_node(name, self._measured(name, wrapper))
 
-        # Add edges
+        # Add edges. write_slides only needs the collected news, so it runs
+        # in parallel with the outline -> TOC branch; evaluation waits for
+        # both branches to finish.
         graph_builder.add_edge(START, "collect_info")
         graph_builder.add_edge("collect_info", "make_outline")
+        graph_builder.add_edge("collect_info", "write_slides")
         graph_builder.add_edge("make_outline", "make_toc")
-        graph_builder.add_edge("make_toc", "write_slides")
-        graph_builder.add_edge("write_slides", "evaluate_slides")
+        graph_builder.add_edge(["make_toc", "write_slides"], "evaluate_slides")
 
-        # Add conditional edge for evaluation
+        # Add conditional edge for evaluation; a retry either rewrites the
+        # flagged slides or regenerates the TOC and the slides side by side
         graph_builder.add_conditional_edges(
             "evaluate_slides",
             self._route_after_eval,
-            {"retry": "make_toc", "ok": END},
+            ["make_toc", "write_slides", "repair_slides", END],
         )
+        graph_builder.add_edge("repair_slides", "evaluate_slides")
+
+        return graph_builder.compile(checkpointer=self.checkpointer)
 
-        return graph_builder.compile()
+    def _measured(
+        self, name: str, wrapper: Callable[[State], Dict[str, Any]]
+    ) -> Callable[[State], Dict[str, Any]]:
+        """Report the state size after a node, and time it if metrics are on.
+
+        Args:
+            name: Node name
+            wrapper: Node wrapper
+
+        Returns:
+            Measuring function calling the wrapper
+        """
+        metrics = self.metrics
+
+        def measured(state: State) -> Dict[str, Any]:
+            if metrics is None:
+                result = wrapper(state)
+            else:
+                with metrics.time_node(name):
+                    result = wrapper(state)
+                if result.get("error"):
+                    metrics.record_node_error(name)
+            return {**result, "memory": [self._memory_entry(name, state, result)]}
+
+        return measured
+
+    def _memory_entry(
+        self, name: str, state: State, result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Describe the memory a run holds after a node.
+
+        Args:
+            name: Node name
+            state: State the node received
+            result: Update the node returned
+
+        Returns:
+            Memory report entry for the state's ``memory`` channel
+        """
+        merged = {**state, **result}
+        merged["log"] = append_log(state.get("log", []), result.get("log", []))
+        return {
+            "node": name,
+            "state_bytes": state_nbytes(merged),
+            "sources_bytes": self.source_store.nbytes(),
+        }
 
     def _collect_info_wrapper(self, state: State) -> Dict[str, Any]:
         """Wrapper for collect_info node."""
         return WorkflowNodes.collect_info(
-            state, self.tavily_client, self.config
+            state, self.tavily_client, self.config, self.source_store
         )
 
     def _make_outline_wrapper(self, state: State) -> Dict[str, Any]:
         """Wrapper for make_outline node."""
-        return WorkflowNodes.make_outline(state, self.llm)
+        return WorkflowNodes.make_outline(
+            state,
+            self.llm,
+            self.config.outline_context_tokens,
+            llm_cache=self.llm_cache,
+            metrics=self.metrics,
+            source_store=self.source_store,
+        )
 
     def _make_toc_wrapper(self, state: State) -> Dict[str, Any]:
         """Wrapper for make_toc node."""
-        return WorkflowNodes.make_toc(state, self.llm)
+        return WorkflowNodes.make_toc(
+            state, self.llm, llm_cache=self.llm_cache, metrics=self.metrics
+        )
 
     def _write_slides_wrapper(self, state: State) -> Dict[str, Any]:
         """Wrapper for write_slides node."""
-        return WorkflowNodes.write_slides(state, self.llm)
+        return WorkflowNodes.write_slides(
+            state,
+            self.llm,
+            self.config.slides_context_tokens,
+            llm_cache=self.llm_cache,
+            stream=self.config.slides_streaming,
+            partial_path=self.config.slides_partial_path.replace(
+                "{topic}", slugify_en(state.get("topic") or "")
+            ),
+            metrics=self.metrics,
+            source_store=self.source_store,
+        )
 
     def _evaluate_slides_wrapper(self, state: State) -> Dict[str, Any]:
         """Wrapper for evaluate_slides node."""
         return WorkflowNodes.evaluate_slides(
-            state, self.llm, self.max_attempts
+            state,
+            self.llm,
+            self.max_attempts,
+            llm_cache=self.llm_cache,
+            metrics=self.metrics,
         )
 
-    def _route_after_eval(self, state: State) -> str:
-        """Wrapper for route_after_eval."""
-        return WorkflowNodes.route_after_eval(state, self.max_attempts)
+    def _repair_slides_wrapper(self, state: State) -> Dict[str, Any]:
+        """Wrapper for repair_slides node."""
+        return WorkflowNodes.repair_slides(
+            state,
+            self.llm,
+            self.config.slides_context_tokens,
+            llm_cache=self.llm_cache,
+            metrics=self.metrics,
+            source_store=self.source_store,
+        )
+
+    def _route_after_eval(self, state: State) -> Union[str, List[Hashable]]:
+        """Wrapper for route_after_eval, mapping a retry to both branches."""
+        route = WorkflowNodes.route_after_eval(
+            state, self.max_attempts, repair=self.config.slide_repair
+        )
+        if route == "retry":
+            return ["make_toc", "write_slides"]
+        if route == "repair":
+            return "repair_slides"
+        return str(__getattr__("END"))
 
     def create_initial_state(self, topic: Optional[str] = None) -> State:
         """Create initial state for the workflow.
@@ -136,26 +282,43 @@ class SecurityNewsWorkflow:
             risk_flags=[],
             passed=False,
             feedback="",
+            flagged_slides=[],
             title="",
             slide_path="",
             attempts=0,
             error="",
             log=[],
-            context_md="",
-            sources={},
+            sources_id="",
+            memory=[],
         )
 
+    @staticmethod
+    def new_run_id() -> str:
+        """Create an identifier for a checkpointed run.
+
+        Returns:
+            Run id such as ``20250914-063000-1a2b3c4d``
+        """
+        return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+
     def create_run_config(
-        self, run_name: Optional[str] = None
-    ) -> RunnableConfig:
+        self, run_name: Optional[str] = None, run_id: Optional[str] = None
+    ) -> "RunnableConfig":
         """Create configuration for workflow execution.
 
         Args:
             run_name: Optional custom run name
+            run_id: Run id the checkpoints are saved under; a new one is
+                created if the workflow has a checkpointer
 
         Returns:
             RunnableConfig for the workflow
         """
+        from langchain_core.runnables import RunnableConfig
+
+        if run_id is None and self.checkpointer is not None:
+            run_id = self.new_run_id()
+
         return RunnableConfig(
             run_name=run_name or "daily-security-news-agent",
             tags=["security", "langgraph", "gemini", "tavily"],
@@ -165,18 +328,21 @@ class SecurityNewsWorkflow:
                 "model": self.config.gemini_model_name,
             },
             recursion_limit=60,
+            configurable={"thread_id": run_id} if run_id else {},
         )
 
     def run(
         self,
         initial_state: Optional[State] = None,
-        config: Optional[RunnableConfig] = None,
+        config: Optional["RunnableConfig"] = None,
+        run_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Execute the complete workflow.
 
         Args:
             initial_state: Optional initial state (will create default if None)
             config: Optional run configuration (will create default if None)
+            run_id: Optional id to checkpoint the run under, for resume()
 
         Returns:
             Final workflow state
@@ -185,15 +351,92 @@ class SecurityNewsWorkflow:
             initial_state = self.create_initial_state()
 
         if config is None:
-            config = self.create_run_config()
+            config = self.create_run_config(run_id=run_id)
 
         logger.info("Starting security news workflow execution")
+        thread_id = config.get("configurable", {}).get("thread_id")
+        if thread_id:
+            logger.info(f"Checkpointing run as {thread_id}")
+        return self._invoke(initial_state, config, initial_state)
 
-        try:
-            result: Dict[str, Any] = self.graph.invoke(
-                initial_state, config=config
+    def resume(
+        self, run_id: str, config: Optional["RunnableConfig"] = None
+    ) -> Dict[str, Any]:
+        """Continue a checkpointed run after its last successful step.
+
+        A run that crashed continues where it stopped. A run that finished
+        with an error is restarted from the last step before the error, so
+        the nodes that succeeded (news collection, finished LLM calls) are
+        not run again.
+
+        Args:
+            run_id: Id the run was checkpointed under
+            config: Optional run configuration (will create default if None)
+
+        Returns:
+            Final workflow state
+
+        Raises:
+            ProcessingError: If there is no checkpointer or no such run
+        """
+        if self.checkpointer is None:
+            raise ProcessingError(
+                "Resuming requires a checkpointer", stage="resume"
             )
 
+        if config is None:
+            config = self.create_run_config()
+        config["configurable"] = {"thread_id": run_id}
+
+        latest = self.graph.get_state(config)
+        if not latest.values:
+            raise ProcessingError(
+                f"No checkpoints found for run '{run_id}'", stage="resume"
+            )
+
+        if not latest.next and not latest.values.get("error"):
+            logger.info(f"Run {run_id} already completed, nothing to resume")
+            return dict(latest.values)
+
+        # Newest checkpoint with work left to do and no error recorded
+        snapshot = next(
+            (
+                snapshot
+                for snapshot in self.graph.get_state_history(config)
+                if snapshot.next and not snapshot.values.get("error")
+            ),
+            None,
+        )
+        if snapshot is None:
+            raise ProcessingError(
+                f"Run '{run_id}' has no step to resume from", stage="resume"
+            )
+
+        step = snapshot.metadata.get("step") if snapshot.metadata else None
+        logger.info(
+            f"Resuming run {run_id} at step {step} with {list(snapshot.next)}"
+        )
+        resume_config = cast("RunnableConfig", {**config, **snapshot.config})
+        return self._invoke(
+            None, resume_config, cast(State, dict(snapshot.values))
+        )
+
+    def _invoke(
+        self, graph_input: Optional[State], config: "RunnableConfig", state: State
+    ) -> Dict[str, Any]:
+        """Invoke the graph, turning exceptions into an error state.
+
+        Args:
+            graph_input: Initial state, or None to continue from a checkpoint
+            config: Run configuration
+            state: State to report if the graph raises
+
+        Returns:
+            Final workflow state
+        """
+        try:
+            result: Dict[str, Any] = self.graph.invoke(graph_input, config=config)
+
             if result.get("error"):
                 logger.error(
                     f"Workflow completed with error: {result['error']}"
@@ -208,16 +451,56 @@ class SecurityNewsWorkflow:
         except Exception as e:
             logger.error(f"Workflow execution failed: {e}")
             # Return the current state with error information
-            error_log = initial_state.get("log", []) + [
+            error_log = state.get("log", []) + [
                 f"[workflow] EXECUTION FAILED: {e}"
             ]
             error_state = {
-                **initial_state,
+                **state,
                 "error": f"workflow_execution_error: {e}",
                 "log": error_log,
             }
             return error_state
 
+    def run_batch(
+        self, topics: List[str], max_workers: int = 4
+    ) -> List[Dict[str, Any]]:
+        """Execute one briefing per topic in this process.
+
+        Every topic searches the configured queries, so the news is
+        collected once into the source store and each briefing refers to
+        that one copy.
+        The briefings then run concurrently on this workflow's compiled
+        graph, LLM client and HTTP pool.
+
+        Args:
+            topics: Briefing topics
+            max_workers: Maximum number of briefings running at once
+
+        Returns:
+            Final workflow state for each topic, in the order given
+        """
+        if not topics:
+            return []
+
+        logger.info(f"Collecting news once for {len(topics)} briefings")
+        shared = WorkflowNodes.collect_info(
+            self.create_initial_state(),
+            self.tavily_client,
+            self.config,
+            self.source_store,
+        )
+        states = [
+            cast(State, {**self.create_initial_state(topic), **shared})
+            for topic in topics
+        ]
+        if shared.get("error"):
+            return [dict(state) for state in states]
+
+        workers = max(1, min(max_workers, len(topics)))
+        logger.info(f"Running {len(topics)} briefings with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.run, states))
+
     def validate_prerequisites(self) -> bool:
         """Validate that all prerequisites are met for workflow execution.
 
@@ -260,5 +543,6 @@ class SecurityNewsWorkflow:
                 "make_toc",
                 "write_slides",
                 "evaluate_slides",
+                "repair_slides",
             ],
         }
@@ -1,5 +1,23 @@
 """Search functionality for collecting security news."""
 
-from .tavily_client import TavilyClient
+from typing import TYPE_CHECKING
 
-__all__ = ["TavilyClient"]
+from ..utils.lazy import lazy_exports
+from .cache import SearchCache
+from .dedup import NearDuplicateIndex, apply_late_links, canonicalize_url
+from .rate_limit import RequestBudget, TokenBucket
+
+if TYPE_CHECKING:
+    from .tavily_client import TavilyClient
+
+__getattr__ = lazy_exports(globals(), {"TavilyClient": ".tavily_client"})
+
+__all__ = [
+    "TavilyClient",
+    "SearchCache",
+    "TokenBucket",
+    "RequestBudget",
+    "NearDuplicateIndex",
+    "canonicalize_url",
+    "apply_late_links",
+]
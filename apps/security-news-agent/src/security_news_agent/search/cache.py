@@ -0,0 +1,112 @@
+"""Persistent on-disk cache for Tavily search responses."""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+from ..utils.sqlite_cache import SQLiteCache
+
+# Seconds a cached response stays fresh, keyed by the Tavily time_range.
+# Narrow windows change quickly, so they expire sooner.
+DEFAULT_TTL_BY_TIME_RANGE: Dict[str, int] = {
+    "day": 3 * 60 * 60,
+    "week": 12 * 60 * 60,
+    "month": 2 * 24 * 60 * 60,
+    "year": 7 * 24 * 60 * 60,
+}
+
+
+class SearchCache(SQLiteCache):
+    """SQLite-backed cache of search responses with TTL and LRU eviction.
+
+    Entries expire after a TTL derived from the query's time range. When the
+    stored payloads exceed ``max_bytes``, the least recently used entries are
+    evicted first. Cache failures are logged and treated as misses so that a
+    broken cache never blocks a search.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_by_time_range: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """Initialize the cache, creating the database if needed.
+
+        Args:
+            path: Path to the SQLite database file
+            max_bytes: Maximum total size of cached payloads in bytes
+            ttl_by_time_range: Optional TTL overrides in seconds per time range
+        """
+        super().__init__(path, max_bytes=max_bytes, table="search_cache")
+        self.ttl_by_time_range = {
+            **DEFAULT_TTL_BY_TIME_RANGE,
+            **(ttl_by_time_range or {}),
+        }
+
+    @staticmethod
+    def make_key(
+        query: str,
+        include_domains: Optional[List[str]],
+        time_range: str,
+        search_depth: str,
+        max_results: int,
+    ) -> str:
+        """Build a stable cache key from the search parameters.
+
+        Args:
+            query: Search query string
+            include_domains: Domains the search is restricted to
+            time_range: Time range for search
+            search_depth: Search depth
+            max_results: Maximum number of results
+
+        Returns:
+            Hex digest identifying the search
+        """
+        raw = json.dumps(
+            [
+                query,
+                sorted(include_domains or []),
+                time_range,
+                search_depth,
+                max_results,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_ttl(self, time_range: str) -> int:
+        """Get the TTL in seconds for a time range.
+
+        Args:
+            time_range: Time range for search
+
+        Returns:
+            TTL in seconds (falls back to the "day" TTL for unknown ranges)
+        """
+        return self.ttl_by_time_range.get(
+            time_range, self.ttl_by_time_range["day"]
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached response, or None on a miss or expired entry
+        """
+        data: Optional[Dict[str, Any]] = super().get(key)
+        return data
+
+    def set(self, key: str, value: Dict[str, Any], time_range: str) -> None:
+        """Store a response and evict entries if over the size limit.
+
+        Args:
+            key: Cache key from make_key()
+            value: Search response to cache
+            time_range: Time range used to pick the TTL
+        """
+        self.put(key, value, self.get_ttl(time_range))
@@ -0,0 +1,269 @@
+"""URL canonicalisation and near-duplicate detection for search results."""
+
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only carry tracking or referral information
+TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_hsenc",
+        "_hsmi",
+        "mkt_tok",
+        "ref",
+        "ref_src",
+        "referrer",
+        "cmpid",
+        "spm",
+        "amp",
+    }
+)
+TRACKING_PREFIXES = ("utm_", "pk_", "at_")
+
+_HOST_PREFIXES = ("www.", "amp.", "m.")
+_AMP_PATH = re.compile(r"(?:/amp|\.amp)(?=/?$|\.html?$)", re.IGNORECASE)
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+SIMHASH_BITS = 64
+# Rewordings of one syndicated snippet land well under 10 bits apart, while
+# unrelated texts average 32 (half the bits).
+DEFAULT_MAX_DISTANCE = 10
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so that variants of the same article compare equal.
+
+    Lowercases scheme and host, drops ``www.``/``amp.``/``m.`` host prefixes,
+    default ports, fragments, tracking parameters, AMP path suffixes and
+    trailing slashes, and sorts the remaining query parameters.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Canonical form of the URL (the stripped input if it cannot be parsed)
+    """
+    url = (url or "").strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+
+    if not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+
+    host = (parts.hostname or "").lower()
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    path = _AMP_PATH.sub("", parts.path).rstrip("/")
+
+    params = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ]
+    query = urlencode(sorted(params))
+
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def _is_tracking_param(key: str) -> bool:
+    """Check whether a query parameter only carries tracking information."""
+    key = key.lower()
+    return key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES)
+
+
+def _shingles(text: str, size: int = 3) -> List[str]:
+    """Split text into overlapping word n-grams.
+
+    Args:
+        text: Text to split
+        size: Number of words per shingle
+
+    Returns:
+        List of shingles (the single joined text if it has fewer words)
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def simhash(text: str) -> int:
+    """Compute a 64-bit SimHash fingerprint over word shingles.
+
+    Texts that share most of their shingles get fingerprints that differ
+    in only a few bits.
+
+    Args:
+        text: Text to fingerprint
+
+    Returns:
+        Fingerprint as an unsigned integer
+    """
+    weights = [0] * SIMHASH_BITS
+    for shingle in _shingles(text):
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count the bits that differ between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateIndex:
+    """Collapses search results that describe the same story.
+
+    A result is a duplicate if its canonical URL was already seen, or if the
+    SimHash of its title and content is within ``max_distance`` bits of an
+    earlier result. Duplicates are folded into the first result of their
+    cluster, whose ``sources`` list keeps every distinct link.
+
+    Results passed to seal() have been handed to a consumer and are not
+    modified any more; links found for them later are kept in
+    ``late_links`` (original URL -> extra links) instead.
+    """
+
+    def __init__(self, max_distance: Optional[int] = DEFAULT_MAX_DISTANCE) -> None:
+        """Initialize an empty index.
+
+        Args:
+            max_distance: Maximum SimHash Hamming distance for two results to
+                count as the same story; None only merges identical URLs
+        """
+        self.max_distance = max_distance
+        self.collapsed = 0
+        self.late_links: Dict[str, List[str]] = {}
+        self._by_url: Dict[str, Dict[str, Any]] = {}
+        self._fingerprints: List[Tuple[int, Dict[str, Any]]] = []
+        # Ids of sealed results; the index holds them, so ids stay unique
+        self._sealed: Set[int] = set()
+
+    def add(self, item: Dict[str, Any]) -> bool:
+        """Add a result, merging it into an earlier one if it is a duplicate.
+
+        Args:
+            item: Result with at least ``title``, ``url`` and ``content``;
+                a ``sources`` list is added to it if missing
+
+        Returns:
+            True if the item is new, False if it was merged
+        """
+        canonical = canonicalize_url(item["url"])
+        original = self._by_url.get(canonical)
+
+        fingerprint: Optional[int] = None
+        if original is None and self.max_distance is not None:
+            text = f"{item['title']} {item['content']}"
+            # Empty texts would all share the same fingerprint
+            if _WORD.search(text):
+                fingerprint = simhash(text)
+                original = self._find_similar(fingerprint)
+
+        if original is not None:
+            self._by_url.setdefault(canonical, original)
+            self._add_link(original, item["url"])
+            self.collapsed += 1
+            return False
+
+        item.setdefault("sources", [item["url"]])
+        self._by_url[canonical] = item
+        if fingerprint is not None:
+            self._fingerprints.append((fingerprint, item))
+        return True
+
+    def seal(self, items: List[Dict[str, Any]]) -> None:
+        """Stop modifying results that have been handed to a consumer.
+
+        Args:
+            items: Results returned by add() as new
+        """
+        self._sealed.update(id(item) for item in items)
+
+    def _add_link(self, original: Dict[str, Any], url: str) -> None:
+        """Record another link for a result, in place unless it is sealed."""
+        if url in original["sources"]:
+            return
+        if id(original) not in self._sealed:
+            original["sources"].append(url)
+            return
+        links = self.late_links.setdefault(original["url"], [])
+        if url not in links:
+            links.append(url)
+
+    def _find_similar(self, fingerprint: int) -> Optional[Dict[str, Any]]:
+        """Find the first indexed result within the distance threshold.
+
+        Args:
+            fingerprint: SimHash of the candidate result
+
+        Returns:
+            Matching result, or None
+        """
+        for other, item in self._fingerprints:
+            if hamming_distance(fingerprint, other) <= (self.max_distance or 0):
+                return item
+        return None
+
+
+def apply_late_links(
+    sources: Dict[str, List[Dict[str, Any]]], late_links: Dict[str, List[str]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Add links found after results were handed out, without modifying them.
+
+    Args:
+        sources: Results per query
+        late_links: Extra links per original result URL, from
+            NearDuplicateIndex.late_links
+
+    Returns:
+        Results per query; lists containing a result with late links are
+        copies, all others are the given lists
+    """
+    if not late_links:
+        return sources
+
+    merged = {}
+    for query, items in sources.items():
+        if any(item["url"] in late_links for item in items):
+            items = [_with_late_links(item, late_links) for item in items]
+        merged[query] = items
+    return merged
+
+
+def _with_late_links(
+    item: Dict[str, Any], late_links: Dict[str, List[str]]
+) -> Dict[str, Any]:
+    """Copy a result with its late links added, if it has any."""
+    links = late_links.get(item["url"])
+    if not links:
+        return item
+    sources = item.get("sources") or [item["url"]]
+    return {**item, "sources": sources + links}
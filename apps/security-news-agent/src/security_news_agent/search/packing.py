@@ -0,0 +1,224 @@
+"""Token-budgeted packing of search results into prompt context."""
+
+import math
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Weights of the ranking signals. Tavily relevance scores are in [0, 1].
+RELEVANCE_WEIGHT = 1.0
+RECENCY_WEIGHT = 0.5
+COVERAGE_WEIGHT = 0.1
+RECENCY_HALF_LIFE_HOURS = 24.0
+
+# Snippets are never cut below this many characters; shorter ones are dropped
+MIN_SNIPPET_CHARS = 80
+
+_NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in a text without a tokenizer.
+
+    English prose averages about four characters per token, while CJK and
+    other non-ASCII characters take roughly one token each.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    non_ascii = len(_NON_ASCII.findall(text))
+    return math.ceil((len(text) - non_ascii) / 4) + non_ascii
+
+
+def format_result_line(item: Dict[str, Any], content: Optional[str] = None) -> str:
+    """Format one search result as a markdown bullet.
+
+    Args:
+        item: Search result with ``title``, ``url`` and ``content``, and an
+            optional ``sources`` list of every link to the story
+        content: Snippet to use instead of the item's own content
+
+    Returns:
+        Markdown bullet line
+    """
+    if content is None:
+        content = item["content"]
+    snippet = content.replace("\n", " ")
+    links = " ".join(
+        f"[source]({url})" for url in item.get("sources") or [item["url"]]
+    )
+    return f"- {item['title']} — {snippet} {links}"
+
+
+def format_query_section(query: str, items: List[Dict[str, Any]]) -> str:
+    """Format one query's results as a markdown section.
+
+    Args:
+        query: Query the results belong to
+        items: Results for the query
+
+    Returns:
+        Markdown section, ending with a newline
+    """
+    lines = [f"### Query: {query}"]
+    if not items:
+        lines.append("- No results found")
+    else:
+        lines.extend(format_result_line(item) for item in items)
+    lines.append("")  # Empty line between queries
+    return "\n".join(lines)
+
+
+def _parse_published(value: Any) -> Optional[datetime]:
+    """Parse a result's published date (RFC 2822 or ISO 8601).
+
+    Args:
+        value: Raw ``published_date`` value
+
+    Returns:
+        Timezone-aware datetime, or None if missing or unparseable
+    """
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        published = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            published = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published
+
+
+def rank_result(item: Dict[str, Any], now: datetime) -> float:
+    """Score a search result for inclusion in the prompt.
+
+    Combines Tavily's relevance score, an exponential recency decay and the
+    number of outlets that carried the story.
+
+    Args:
+        item: Search result
+        now: Reference time for recency
+
+    Returns:
+        Ranking score; higher is better
+    """
+    try:
+        relevance = float(item.get("score", 0.5))
+    except (TypeError, ValueError):
+        relevance = 0.5
+
+    published = _parse_published(item.get("published_date"))
+    if published is None:
+        recency = 0.5
+    else:
+        age_hours = max(0.0, (now - published).total_seconds() / 3600)
+        recency = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+
+    coverage = len(item.get("sources") or []) - 1
+
+    score = RELEVANCE_WEIGHT * relevance + RECENCY_WEIGHT * recency
+    return score + COVERAGE_WEIGHT * max(0, coverage)
+
+
+def pack_context(
+    context: Dict[str, List[Dict[str, Any]]],
+    max_tokens: int,
+    now: Optional[datetime] = None,
+) -> str:
+    """Render search results as markdown that fits a token budget.
+
+    If everything fits, the output is exactly the unpacked markdown.
+    Otherwise results are taken best-ranked first; one that does not fit in
+    full has its snippet shortened, or is left out if even a short snippet
+    would not fit. Selected results keep their query sections and original
+    order, and sections left empty are omitted.
+
+    Args:
+        context: Search results keyed by query, as from collect_context()
+        max_tokens: Token budget for the rendered markdown (0 = unlimited)
+        now: Reference time for recency ranking (defaults to the current time)
+
+    Returns:
+        Markdown in the format of TavilyClient.format_context_as_markdown()
+    """
+    full = "\n".join(
+        format_query_section(query, items) for query, items in context.items()
+    )
+    if max_tokens <= 0 or estimate_tokens(full) <= max_tokens:
+        return full
+
+    now = now or datetime.now(timezone.utc)
+
+    ranked: List[Tuple[float, int, str, int, Dict[str, Any]]] = []
+    for query_index, (query, items) in enumerate(context.items()):
+        for item_index, item in enumerate(items):
+            ranked.append(
+                (rank_result(item, now), query_index, query, item_index, item)
+            )
+    ranked.sort(key=lambda entry: (-entry[0], entry[1], entry[3]))
+
+    used = 0
+    opened: Set[str] = set()
+    selected: Dict[str, List[Tuple[int, str]]] = {}
+    for _, _, query, item_index, item in ranked:
+        # A new section costs its header plus the blank separator lines
+        header_cost = 0
+        if query not in opened:
+            header_cost = estimate_tokens(f"### Query: {query}") + 2
+        line = format_result_line(item)
+        cost = header_cost + estimate_tokens(line) + 1
+
+        if used + cost > max_tokens:
+            shortened = _shorten(item, max_tokens - used - header_cost - 1)
+            if shortened is None:
+                continue
+            line = shortened
+            cost = header_cost + estimate_tokens(line) + 1
+
+        opened.add(query)
+        selected.setdefault(query, []).append((item_index, line))
+        used += cost
+
+    sections = []
+    for query in context:
+        if query not in selected:
+            continue
+        lines = [line for _, line in sorted(selected[query])]
+        sections.append("\n".join([f"### Query: {query}", *lines, ""]))
+    return "\n".join(sections)
+
+
+def _shorten(item: Dict[str, Any], available: int) -> Optional[str]:
+    """Format a result with its snippet cut to fit the available tokens.
+
+    Args:
+        item: Search result
+        available: Tokens left for this line
+
+    Returns:
+        Shortened bullet line, or None if no useful snippet fits
+    """
+    overhead = estimate_tokens(format_result_line(item, content="…"))
+    if (available - overhead) * 4 < MIN_SNIPPET_CHARS:
+        return None
+
+    snippet = item["content"][: (available - overhead) * 4]
+    if len(snippet) < len(item["content"]):
+        snippet = snippet.rsplit(" ", 1)[0].rstrip()
+
+    line = format_result_line(item, content=snippet + "…")
+    # Non-ASCII text makes the four-characters-per-token guess too generous
+    while len(snippet) >= MIN_SNIPPET_CHARS and estimate_tokens(line) > available:
+        snippet = snippet[: len(snippet) * 3 // 4]
+        line = format_result_line(item, content=snippet + "…")
+
+    if len(snippet) < MIN_SNIPPET_CHARS:
+        return None
+    return line
@@ -0,0 +1,199 @@
+"""Client-side rate limiting and request budgets for search APIs."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..utils.helpers import today_iso
+from ..utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces outgoing requests.
+
+    Callers reserve a token and are told how long to wait before sending,
+    which lets the same bucket serve threads (acquire) and asyncio tasks
+    (reserve + asyncio.sleep). A server-side rate limit response can pause
+    the whole bucket with defer().
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1) -> None:
+        """Initialize the bucket, starting full.
+
+        Args:
+            rate_per_minute: Sustained number of requests allowed per minute
+            burst: Maximum number of requests that may be sent back to back
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, possibly on credit.
+
+        Returns:
+            Seconds the caller must wait before sending its request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(delay, self._blocked_until - now)
+
+    def acquire(self) -> float:
+        """Block until a request may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self.reserve()
+        if delay > 0:
+            logger.debug(f"Rate limiter sleeping {delay:.2f}s")
+            time.sleep(delay)
+        return delay
+
+    def defer(self, seconds: float) -> None:
+        """Hold back all requests for the given number of seconds.
+
+        Args:
+            seconds: Pause length, typically a server's Retry-After value
+        """
+        with self._lock:
+            self._blocked_until = max(
+                self._blocked_until, time.monotonic() + seconds
+            )
+        logger.warning(f"Rate limiter paused for {seconds:.1f}s")
+
+
+class RequestBudget:
+    """Per-run and per-day caps on the number of API requests.
+
+    Daily counts are kept in a SQLite file when ``path`` is given, so that
+    separate processes (cron runs, batch workers) share one daily quota.
+    A limit of 0 means unlimited.
+    """
+
+    def __init__(
+        self,
+        per_run: int = 0,
+        per_day: int = 0,
+        path: Optional[str] = None,
+    ) -> None:
+        """Initialize the budget.
+
+        Args:
+            per_run: Maximum requests between start_run() calls
+            per_day: Maximum requests per calendar day (JST)
+            path: Optional SQLite file for persisting daily counts
+        """
+        self.per_run = per_run
+        self.per_day = per_day
+        self.run_count = 0
+        self._day_counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                path, timeout=30, check_same_thread=False, isolation_level=None
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS request_budget ("
+                "day TEXT PRIMARY KEY, count INTEGER NOT NULL)"
+            )
+
+    def start_run(self) -> None:
+        """Reset the per-run counter."""
+        with self._lock:
+            self.run_count = 0
+
+    def consume(self) -> bool:
+        """Account for one request if the budget allows it.
+
+        Returns:
+            True if the request may be sent, False if a limit is exhausted
+        """
+        with self._lock:
+            if self.per_run and self.run_count >= self.per_run:
+                logger.warning(f"Per-run request budget exhausted ({self.per_run})")
+                return False
+
+            if not self._consume_day():
+                logger.warning(f"Daily request budget exhausted ({self.per_day})")
+                return False
+
+            self.run_count += 1
+            return True
+
+    def used_today(self) -> int:
+        """Get the number of requests counted today.
+
+        Returns:
+            Requests recorded for the current day
+        """
+        day = today_iso()
+        with self._lock:
+            if self._conn is None:
+                return self._day_counts.get(day, 0)
+            row = self._conn.execute(
+                "SELECT count FROM request_budget WHERE day = ?", (day,)
+            ).fetchone()
+            return int(row[0]) if row else 0
+
+    def _consume_day(self) -> bool:
+        """Increment today's counter unless the daily limit is reached.
+
+        Returns:
+            True if the request was counted
+        """
+        day = today_iso()
+
+        if self._conn is None:
+            used = self._day_counts.get(day, 0)
+            if self.per_day and used >= self.per_day:
+                return False
+            self._day_counts[day] = used + 1
+            return True
+
+        try:
+            # IMMEDIATE takes the write lock up front so concurrent
+            # processes cannot both spend the last request.
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT count FROM request_budget WHERE day = ?", (day,)
+            ).fetchone()
+            used = int(row[0]) if row else 0
+            if self.per_day and used >= self.per_day:
+                self._conn.execute("ROLLBACK")
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO request_budget (day, count) VALUES (?, ?)",
+                (day, used + 1),
+            )
+            self._conn.execute("COMMIT")
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Request budget store failed, not enforcing: {e}")
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            return True
+
+    def close(self) -> None:
+        """Close the persistence store, if any."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
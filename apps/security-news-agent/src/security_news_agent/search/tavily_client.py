@@ -1,20 +1,61 @@
 """Tavily API client for security news search."""
 
-from typing import Any, Dict, List, Optional, Union
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import (
+    RetryCallState,
     retry,
-    retry_if_exception_type,
+    retry_if_exception,
     stop_after_attempt,
     wait_exponential,
 )
+from typing_extensions import Self
 
-from ..utils.error_handling import APIError
+from ..utils.error_handling import APIError, RateLimitError
 from ..utils.logging_config import get_logger
+from ..utils.metrics import RunMetrics
+from .cache import SearchCache
+from .dedup import DEFAULT_MAX_DISTANCE, NearDuplicateIndex, apply_late_links
+from .packing import format_query_section
+from .rate_limit import RequestBudget, TokenBucket
 
 logger = get_logger(__name__)
 
+# (query, include_domains, time_range) for a single Tavily search
+QueryJob = Tuple[str, Optional[List[str]], str]
+
+# Retry policy shared by the sync and async search paths
+_RETRY_STOP = stop_after_attempt(3)
+_RETRY_WAIT = wait_exponential(multiplier=1, min=4, max=10)
+
+# Longest server-requested Retry-After we are willing to wait for in-run
+MAX_RETRY_AFTER = 60
+
+
+def _record_retry(retry_state: RetryCallState) -> None:
+    """Count a retried search request in the client's run metrics."""
+    client, query = retry_state.args[0], retry_state.args[1]
+    if client.metrics is not None:
+        client.metrics.record_search_retry(query)
+
 
 class TavilyError(APIError):
     """Base exception for Tavily API errors."""
@@ -35,27 +76,209 @@ class TavilyNetworkError(TavilyError):
     pass
 
 
+class TavilyRateLimitError(TavilyError, RateLimitError):
+    """Raised when Tavily responds with HTTP 429."""
+
+    def __init__(self, retry_after: Optional[int] = None, **kwargs: Any) -> None:
+        RateLimitError.__init__(self, "Tavily", retry_after=retry_after, **kwargs)
+
+
+class TavilyQuotaError(TavilyError):
+    """Raised when the client-side request budget is exhausted."""
+
+    pass
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[int]:
+    """Parse a Retry-After header given in seconds.
+
+    Args:
+        value: Raw header value
+
+    Returns:
+        Whole seconds to wait, or None if absent or not numeric
+    """
+    try:
+        return max(0, int(float(value))) if value else None
+    except ValueError:
+        return None
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """Get the HTTP status code of a failed request, if it got a response."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Decide whether a failed search attempt should be retried.
+
+    Rate limit errors are retried only when the server's Retry-After fits
+    within MAX_RETRY_AFTER; otherwise waiting would stall the whole run.
+    Network errors are retried unless the server answered with a 4xx, which
+    a second attempt would only repeat.
+    """
+    if isinstance(exc, RateLimitError):
+        return exc.retry_after is None or exc.retry_after <= MAX_RETRY_AFTER
+    if isinstance(exc, TavilyNetworkError):
+        return exc.status_code is None or exc.status_code >= 500
+    return isinstance(exc, (requests.RequestException, httpx.HTTPError))
+
+
+def _wait_before_retry(retry_state: RetryCallState) -> float:
+    """Wait for the server's Retry-After if given, else back off exponentially."""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(exc, RateLimitError) and exc.retry_after is not None:
+        return float(exc.retry_after)
+    return float(_RETRY_WAIT(retry_state))
+
+
 class TavilyClient:
-    """Client for interacting with the Tavily search API."""
+    """Client for interacting with the Tavily search API.
+
+    The client owns a pooled HTTP session that is reused across searches,
+    retries and workflow runs. Call close() (or use the client as a context
+    manager) to release its connections.
 
-    def __init__(self, api_key: str, timeout: int = 60):
+    asearch() and acollect_context() are asyncio-native counterparts built on
+    an httpx.AsyncClient; release it with aclose() or ``async with``.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        timeout: int = 60,
+        max_workers: int = 1,
+        pool_size: int = 10,
+        cache: Optional[SearchCache] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        budget: Optional[RequestBudget] = None,
+        near_duplicate_distance: Optional[int] = DEFAULT_MAX_DISTANCE,
+        metrics: Optional[RunMetrics] = None,
+    ):
         """Initialize the Tavily client.
 
         Args:
             api_key: Tavily API key
             timeout: Request timeout in seconds
+            max_workers: Maximum number of queries sent concurrently by
+                collect_context (1 runs them sequentially)
+            pool_size: Maximum number of keep-alive connections kept open;
+                never smaller than max_workers
+            cache: Optional on-disk cache consulted before each search
+            rate_limiter: Optional token bucket pacing outgoing requests
+            budget: Optional per-run/per-day request budget charged once
+                per search; retries and cache hits do not count against it
+            near_duplicate_distance: Maximum SimHash distance at which two
+                results are collapsed as the same story (None only merges
+                matching canonical URLs)
+            metrics: Optional run metrics receiving each search's time,
+                result count, cache hit and retries
         """
         self.api_key = api_key
         self.timeout = timeout
+        self.max_workers = max(1, max_workers)
+        self.pool_size = max(pool_size, self.max_workers)
         self.endpoint = "https://api.tavily.com/search"
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.budget = budget
+        self.near_duplicate_distance = near_duplicate_distance
+        self.metrics = metrics
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._async_client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def session(self) -> requests.Session:
+        """Pooled HTTP session, created on first use."""
+        with self._session_lock:
+            if self._session is None:
+                self._session = self._create_session()
+            return self._session
+
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive session with a connection pool.
+
+        Returns:
+            Configured requests session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            pool_block=False,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        logger.debug(
+            f"Created Tavily HTTP session (pool_size={self.pool_size})"
+        )
+        return session
+
+    def close(self) -> None:
+        """Close the HTTP session and release pooled connections.
+
+        The client stays usable; a new session is created on the next search.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+                logger.debug("Closed Tavily HTTP session")
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Pooled async HTTP client, created on first use."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+            )
+            logger.debug(
+                f"Created Tavily async HTTP client (pool_size={self.pool_size})"
+            )
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client and release pooled connections."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            logger.debug("Closed Tavily async HTTP client")
+
+    async def __aenter__(self) -> Self:
+        """Enter the async context."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> Literal[False]:
+        """Exit the async context, closing the async HTTP client."""
+        await self.aclose()
+        return False
+
+    def __enter__(self) -> Self:
+        """Enter the context."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> Literal[False]:
+        """Exit the context, closing the HTTP session."""
+        self.close()
+        return False
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(
-            (requests.RequestException, requests.Timeout)
-        ),
-    )
     def search(
         self,
         query: str,
@@ -66,6 +289,9 @@ class TavilyClient:
     ) -> Dict[str, Any]:
         """Perform a single search query using Tavily API.
 
+        Responses are served from the cache when one is configured and holds
+        a fresh entry for the same parameters.
+
         Args:
             query: Search query string
             max_results: Maximum number of results to return
@@ -80,49 +306,283 @@ class TavilyClient:
             TavilyAPIError: If API returns an error
             TavilyNetworkError: If network issues occur
         """
-        payload: Dict[str, Any] = {
-            "api_key": self.api_key,
-            "query": query,
-            "search_depth": search_depth,
-            "include_answer": True,
-            "max_results": max_results,
-            "time_range": time_range,
-        }
+        started = time.perf_counter()
+        try:
+            data, cached = self._search_with_cache(
+                query, max_results, include_domains, time_range, search_depth
+            )
+        except TavilyError as e:
+            self._record_search(query, started, error=e)
+            raise
+        self._record_search(query, started, data, cached)
+        return data
 
-        if include_domains:
-            payload["include_domains"] = include_domains
+    def _search_with_cache(
+        self,
+        query: str,
+        max_results: int,
+        include_domains: Optional[List[str]],
+        time_range: str,
+        search_depth: str,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Serve a search from the cache or the API.
+
+        Args:
+            query: Search query string
+            max_results: Maximum number of results to return
+            include_domains: List of domains to include in search
+            time_range: Time range for search ("day", "week", "month", "year")
+            search_depth: Search depth ("basic" or "advanced")
+
+        Returns:
+            Tuple of the search response and whether it was a cache hit
+
+        Raises:
+            TavilyQuotaError: If the request budget is exhausted
+        """
+        if self.cache is None:
+            self._consume_budget(query)
+            data = self._search_remote(
+                query, max_results, include_domains, time_range, search_depth
+            )
+            return data, False
+
+        cache_key = SearchCache.make_key(
+            query, include_domains, time_range, search_depth, max_results
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Cache hit for Tavily query: '{query}'")
+            return cached, True
+
+        self._consume_budget(query)
+        data = self._search_remote(
+            query, max_results, include_domains, time_range, search_depth
+        )
+        self.cache.set(cache_key, data, time_range)
+        return data, False
+
+    def _record_search(
+        self,
+        query: str,
+        started: float,
+        data: Optional[Dict[str, Any]] = None,
+        cached: bool = False,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Report a finished search to the run metrics, if any."""
+        if self.metrics is None:
+            return
+        self.metrics.record_search(
+            query,
+            time.perf_counter() - started,
+            results=len((data or {}).get("results") or []),
+            cached=cached,
+            error=str(error or ""),
+        )
+
+    @retry(
+        stop=_RETRY_STOP,
+        wait=_wait_before_retry,
+        retry=retry_if_exception(_is_retryable),
+        before_sleep=_record_retry,
+        reraise=True,
+    )
+    def _search_remote(
+        self,
+        query: str,
+        max_results: int,
+        include_domains: Optional[List[str]],
+        time_range: str,
+        search_depth: str,
+    ) -> Dict[str, Any]:
+        """Send a search request to the Tavily API.
+
+        Args:
+            query: Search query string
+            max_results: Maximum number of results to return
+            include_domains: List of domains to include in search
+            time_range: Time range for search ("day", "week", "month", "year")
+            search_depth: Search depth ("basic" or "advanced")
+
+        Returns:
+            Dictionary containing search results
+
+        Raises:
+            TavilyAPIError: If API returns an error
+            TavilyNetworkError: If network issues occur
+            TavilyRateLimitError: If Tavily keeps rejecting with HTTP 429
+        """
+        payload = self._build_payload(
+            query, max_results, include_domains, time_range, search_depth
+        )
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
 
         logger.info(
             f"Searching Tavily for: '{query}' (max_results={max_results})"
         )
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.endpoint, json=payload, timeout=self.timeout
             )
+            self._check_rate_limited(
+                response.status_code, response.headers, query
+            )
             response.raise_for_status()
+            return self._check_response_data(response.json(), query)
 
-            data: Dict[str, Any] = response.json()
+        except requests.Timeout as e:
+            logger.error(f"Timeout during Tavily search for query: '{query}'")
+            raise TavilyNetworkError(f"Request timeout: {e}")
+        except requests.RequestException as e:
+            logger.error(
+                f"Network error during Tavily search for query: '{query}': {e}"
+            )
+            raise TavilyNetworkError(
+                f"Network error: {e}", status_code=_status_code(e)
+            )
+        except TavilyError as e:
+            # Re-raise specific API errors to be caught by the caller
+            raise e
+        except Exception as e:
+            logger.error(
+                f"Unexpected error during Tavily search for query: '{query}': {e}"
+            )
+            raise TavilyError(f"Unexpected error: {e}")
 
-            # Check for API-level errors
-            if "error" in data:
-                raise TavilyAPIError(f"Tavily API error: {data['error']}")
+    async def asearch(
+        self,
+        query: str,
+        max_results: int = 8,
+        include_domains: Optional[List[str]] = None,
+        time_range: str = "day",
+        search_depth: str = "advanced",
+    ) -> Dict[str, Any]:
+        """Async counterpart of search().
 
-            logger.info(
-                f"Found {len(data.get('results', []))} results for query: '{query}'"
+        Args:
+            query: Search query string
+            max_results: Maximum number of results to return
+            include_domains: List of domains to include in search
+            time_range: Time range for search ("day", "week", "month", "year")
+            search_depth: Search depth ("basic" or "advanced")
+
+        Returns:
+            Dictionary containing search results
+
+        Raises:
+            TavilyAPIError: If API returns an error
+            TavilyNetworkError: If network issues occur
+        """
+        started = time.perf_counter()
+        try:
+            data, cached = await self._asearch_with_cache(
+                query, max_results, include_domains, time_range, search_depth
             )
-            return data
+        except TavilyError as e:
+            self._record_search(query, started, error=e)
+            raise
+        self._record_search(query, started, data, cached)
+        return data
 
-        except requests.Timeout as e:
+    async def _asearch_with_cache(
+        self,
+        query: str,
+        max_results: int,
+        include_domains: Optional[List[str]],
+        time_range: str,
+        search_depth: str,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Async counterpart of _search_with_cache()."""
+        if self.cache is None:
+            self._consume_budget(query)
+            data = await self._asearch_remote(
+                query, max_results, include_domains, time_range, search_depth
+            )
+            return data, False
+
+        cache_key = SearchCache.make_key(
+            query, include_domains, time_range, search_depth, max_results
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Cache hit for Tavily query: '{query}'")
+            return cached, True
+
+        self._consume_budget(query)
+        data = await self._asearch_remote(
+            query, max_results, include_domains, time_range, search_depth
+        )
+        self.cache.set(cache_key, data, time_range)
+        return data, False
+
+    @retry(
+        stop=_RETRY_STOP,
+        wait=_wait_before_retry,
+        retry=retry_if_exception(_is_retryable),
+        before_sleep=_record_retry,
+        reraise=True,
+    )
+    async def _asearch_remote(
+        self,
+        query: str,
+        max_results: int,
+        include_domains: Optional[List[str]],
+        time_range: str,
+        search_depth: str,
+    ) -> Dict[str, Any]:
+        """Send a search request to the Tavily API without blocking the loop.
+
+        Args:
+            query: Search query string
+            max_results: Maximum number of results to return
+            include_domains: List of domains to include in search
+            time_range: Time range for search ("day", "week", "month", "year")
+            search_depth: Search depth ("basic" or "advanced")
+
+        Returns:
+            Dictionary containing search results
+
+        Raises:
+            TavilyAPIError: If API returns an error
+            TavilyNetworkError: If network issues occur
+            TavilyRateLimitError: If Tavily keeps rejecting with HTTP 429
+        """
+        payload = self._build_payload(
+            query, max_results, include_domains, time_range, search_depth
+        )
+
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        logger.info(
+            f"Searching Tavily for: '{query}' (max_results={max_results})"
+        )
+
+        try:
+            response = await self.async_client.post(self.endpoint, json=payload)
+            self._check_rate_limited(
+                response.status_code, response.headers, query
+            )
+            response.raise_for_status()
+            return self._check_response_data(response.json(), query)
+
+        except httpx.TimeoutException as e:
             logger.error(f"Timeout during Tavily search for query: '{query}'")
             raise TavilyNetworkError(f"Request timeout: {e}")
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(
                 f"Network error during Tavily search for query: '{query}': {e}"
             )
-            raise TavilyNetworkError(f"Network error: {e}")
-        except TavilyAPIError as e:
-            # Re-raise specific API errors to be caught by the caller
+            raise TavilyNetworkError(
+                f"Network error: {e}", status_code=_status_code(e)
+            )
+        except TavilyError as e:
             raise e
         except Exception as e:
             logger.error(
@@ -130,14 +590,113 @@ class TavilyClient:
             )
             raise TavilyError(f"Unexpected error: {e}")
 
+    def _consume_budget(self, query: str) -> None:
+        """Charge one request against the budget.
+
+        Args:
+            query: Query about to be sent, for error reporting
+
+        Raises:
+            TavilyQuotaError: If the budget is exhausted
+        """
+        if self.budget is not None and not self.budget.consume():
+            raise TavilyQuotaError(
+                f"Tavily request budget exhausted, skipping query: '{query}'"
+            )
+
+    def _check_rate_limited(
+        self, status_code: int, headers: Any, query: str
+    ) -> None:
+        """Raise TavilyRateLimitError for HTTP 429 and pause the limiter.
+
+        Args:
+            status_code: HTTP status code of the response
+            headers: Response headers
+            query: Query the response belongs to
+
+        Raises:
+            TavilyRateLimitError: If the response is a rate limit rejection
+        """
+        if status_code != 429:
+            return
+
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        logger.warning(
+            f"Tavily rate limit hit for query: '{query}' "
+            f"(retry_after={retry_after})"
+        )
+        if self.rate_limiter is not None and retry_after:
+            self.rate_limiter.defer(retry_after)
+        raise TavilyRateLimitError(retry_after=retry_after)
+
+    def _build_payload(
+        self,
+        query: str,
+        max_results: int,
+        include_domains: Optional[List[str]],
+        time_range: str,
+        search_depth: str,
+    ) -> Dict[str, Any]:
+        """Build the JSON body of a Tavily search request.
+
+        Args:
+            query: Search query string
+            max_results: Maximum number of results to return
+            include_domains: List of domains to include in search
+            time_range: Time range for search
+            search_depth: Search depth
+
+        Returns:
+            Request payload
+        """
+        payload: Dict[str, Any] = {
+            "api_key": self.api_key,
+            "query": query,
+            "search_depth": search_depth,
+            "include_answer": True,
+            "max_results": max_results,
+            "time_range": time_range,
+        }
+
+        if include_domains:
+            payload["include_domains"] = include_domains
+
+        return payload
+
+    @staticmethod
+    def _check_response_data(data: Dict[str, Any], query: str) -> Dict[str, Any]:
+        """Validate a decoded Tavily response.
+
+        Args:
+            data: Decoded JSON response
+            query: Query the response belongs to
+
+        Returns:
+            The response data
+
+        Raises:
+            TavilyAPIError: If the response reports an API-level error
+        """
+        if "error" in data:
+            raise TavilyAPIError(f"Tavily API error: {data['error']}")
+
+        logger.info(
+            f"Found {len(data.get('results', []))} results for query: '{query}'"
+        )
+        return data
+
     def collect_context(
         self,
         queries: List[Union[str, Dict[str, Any]]],
         max_per_query: int = 6,
         default_time_range: str = "day",
-    ) -> Dict[str, List[Dict[str, str]]]:
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """Collect search results from multiple queries with deduplication.
 
+        Queries are sent concurrently when the client was created with
+        ``max_workers > 1``. Results are always deduplicated in query order,
+        so the output is identical to a sequential run.
+
         Args:
             queries: List of query strings or query configuration dictionaries
             max_per_query: Maximum results per query
@@ -149,9 +708,172 @@ class TavilyClient:
         Raises:
             TavilyError: If any search fails
         """
-        seen_urls = set()
-        results: Dict[str, List[Dict[str, str]]] = {}
+        late_links: Dict[str, List[str]] = {}
+        results = dict(
+            self.iter_context(
+                queries, max_per_query, default_time_range, late_links=late_links
+            )
+        )
+        results = apply_late_links(results, late_links)
+        self._log_total(results)
+        return results
+
+    def iter_context(
+        self,
+        queries: List[Union[str, Dict[str, Any]]],
+        max_per_query: int = 6,
+        default_time_range: str = "day",
+        late_links: Optional[Dict[str, List[str]]] = None,
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Yield deduplicated results per query as soon as they are ready.
+
+        A query is yielded once its own search and the searches of every
+        query before it have finished, so consumers can start on early
+        sections while slower queries are still in flight.
+
+        Yielded results are never modified afterwards. When a later query
+        finds another link to a story that was already yielded, the link is
+        recorded in ``late_links`` instead; apply_late_links() then gives
+        the output of collect_context().
+
+        Args:
+            queries: List of query strings or query configuration dictionaries
+            max_per_query: Maximum results per query
+            default_time_range: Default time range if not specified in query config
+            late_links: Optional dictionary receiving the links found for
+                already yielded results, keyed by their URL, once
+                iteration ends
+
+        Yields:
+            (query, results) tuples in query order
+        """
+        jobs = self._build_query_jobs(queries, default_time_range)
+        if self.budget is not None:
+            self.budget.start_run()
+
+        def run(job: QueryJob) -> Optional[Dict[str, Any]]:
+            return self._run_query_job(job, max_per_query)
+
+        workers = min(self.max_workers, len(jobs))
+        executor: Optional[ThreadPoolExecutor] = None
+        responses: Iterator[Optional[Dict[str, Any]]]
+        if workers > 1:
+            logger.info(
+                f"Running {len(jobs)} Tavily queries with {workers} workers"
+            )
+            executor = ThreadPoolExecutor(max_workers=workers)
+            # map() yields in submission order, so deduplication sees the
+            # same sequence as a sequential run.
+            responses = executor.map(run, jobs)
+        else:
+            responses = map(run, jobs)
+
+        try:
+            yield from self._iter_deduped(jobs, responses, late_links)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def acollect_context(
+        self,
+        queries: List[Union[str, Dict[str, Any]]],
+        max_per_query: int = 6,
+        default_time_range: str = "day",
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Async counterpart of collect_context().
+
+        At most ``max_workers`` searches are in flight at once. Results are
+        deduplicated in query order, exactly as in collect_context().
+
+        Args:
+            queries: List of query strings or query configuration dictionaries
+            max_per_query: Maximum results per query
+            default_time_range: Default time range if not specified in query config
+
+        Returns:
+            Dictionary mapping query strings to lists of search results
+        """
+        jobs = self._build_query_jobs(queries, default_time_range)
+        if self.budget is not None:
+            self.budget.start_run()
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run_bounded(job: QueryJob) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self._arun_query_job(job, max_per_query)
+
+        # gather() returns results in submission order
+        responses = await asyncio.gather(*(run_bounded(job) for job in jobs))
+        late_links: Dict[str, List[str]] = {}
+        results = dict(self._iter_deduped(jobs, iter(responses), late_links))
+        results = apply_late_links(results, late_links)
+        self._log_total(results)
+        return results
+
+    def _iter_deduped(
+        self,
+        jobs: List[QueryJob],
+        responses: Iterator[Optional[Dict[str, Any]]],
+        late_links: Optional[Dict[str, List[str]]] = None,
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Deduplicate raw responses in query order.
+
+        Results whose canonical URL or text matches an earlier result are
+        merged into it: the earlier item's ``sources`` list gains their link
+        while the item is unyielded, ``late_links`` does afterwards.
+
+        Args:
+            jobs: Search jobs, in query order
+            responses: Raw response per job, or None if its search failed
+            late_links: Optional dictionary receiving the late links
+
+        Yields:
+            (query, results) tuples in query order
+        """
+        index = NearDuplicateIndex(self.near_duplicate_distance)
+
+        for job, data in zip(jobs, responses):
+            query_text = job[0]
+            if data is None:
+                # Continue with other queries instead of failing completely
+                yield query_text, []
+                continue
+
+            query_results = self._dedupe_results(data, index)
+            logger.info(
+                f"Collected {len(query_results)} unique results for: '{query_text}'"
+            )
+            index.seal(query_results)
+            yield query_text, query_results
+
+        if index.collapsed:
+            logger.info(f"Collapsed {index.collapsed} duplicate results")
+        if late_links is not None:
+            late_links.update(index.late_links)
 
+    @staticmethod
+    def _log_total(results: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Log the total number of collected results."""
+        total_results = sum(
+            len(results_list) for results_list in results.values()
+        )
+        logger.info(f"Total unique results collected: {total_results}")
+
+    def _build_query_jobs(
+        self,
+        queries: List[Union[str, Dict[str, Any]]],
+        default_time_range: str,
+    ) -> List[QueryJob]:
+        """Normalize query strings and configurations into search jobs.
+
+        Args:
+            queries: List of query strings or query configuration dictionaries
+            default_time_range: Default time range if not specified in query config
+
+        Returns:
+            List of (query, include_domains, time_range) tuples, in input order
+        """
+        jobs: List[QueryJob] = []
         for query_config in queries:
             if isinstance(query_config, dict):
                 query_text = query_config.get("q", "")
@@ -166,53 +888,93 @@ class TavilyClient:
                 logger.warning("Skipping empty query")
                 continue
 
-            try:
-                data = self.search(
-                    query=query_text,
-                    max_results=max_per_query,
-                    include_domains=include_domains,
-                    time_range=time_range,
-                )
-
-                # Process and deduplicate results
-                query_results = []
-                for result in data.get("results", []):
-                    url = result.get("url")
-                    if not url or url in seen_urls:
-                        continue
-
-                    seen_urls.add(url)
-                    query_results.append(
-                        {
-                            "title": (result.get("title") or "")[:160],
-                            "url": url,
-                            "content": (
-                                (result.get("content") or "").replace(
-                                    "\n", " "
-                                )
-                            )[:600],
-                        }
-                    )
-
-                results[query_text] = query_results
-                logger.info(
-                    f"Collected {len(query_results)} unique results for: '{query_text}'"
-                )
-
-            except TavilyError as e:
-                logger.error(f"Failed to search for query '{query_text}': {e}")
-                # Continue with other queries instead of failing completely
-                results[query_text] = []
+            jobs.append((query_text, include_domains, time_range))
+        return jobs
 
-        total_results = sum(
-            len(results_list) for results_list in results.values()
-        )
-        logger.info(f"Total unique results collected: {total_results}")
+    def _run_query_job(
+        self, job: QueryJob, max_results: int
+    ) -> Optional[Dict[str, Any]]:
+        """Run a single search job, isolating Tavily failures.
 
-        return results
+        Args:
+            job: (query, include_domains, time_range) tuple
+            max_results: Maximum number of results to request
+
+        Returns:
+            Raw search response, or None if the search failed
+        """
+        query_text, include_domains, time_range = job
+        try:
+            return self.search(
+                query=query_text,
+                max_results=max_results,
+                include_domains=include_domains,
+                time_range=time_range,
+            )
+        except TavilyError as e:
+            logger.error(f"Failed to search for query '{query_text}': {e}")
+            return None
+
+    async def _arun_query_job(
+        self, job: QueryJob, max_results: int
+    ) -> Optional[Dict[str, Any]]:
+        """Async counterpart of _run_query_job().
+
+        Args:
+            job: (query, include_domains, time_range) tuple
+            max_results: Maximum number of results to request
+
+        Returns:
+            Raw search response, or None if the search failed
+        """
+        query_text, include_domains, time_range = job
+        try:
+            return await self.asearch(
+                query=query_text,
+                max_results=max_results,
+                include_domains=include_domains,
+                time_range=time_range,
+            )
+        except TavilyError as e:
+            logger.error(f"Failed to search for query '{query_text}': {e}")
+            return None
+
+    @staticmethod
+    def _dedupe_results(
+        data: Dict[str, Any], index: NearDuplicateIndex
+    ) -> List[Dict[str, Any]]:
+        """Trim raw search results and fold duplicates into earlier ones.
+
+        Args:
+            data: Raw search response
+            index: Results collected so far; updated in place
+
+        Returns:
+            List of new results for this query
+        """
+        query_results = []
+        for result in data.get("results", []):
+            url = result.get("url")
+            if not url:
+                continue
+
+            item: Dict[str, Any] = {
+                "title": (result.get("title") or "")[:160],
+                "url": url,
+                "content": ((result.get("content") or "").replace("\n", " "))[
+                    :600
+                ],
+            }
+            # Ranking signals for token-budgeted packing
+            for key in ("score", "published_date"):
+                if result.get(key) is not None:
+                    item[key] = result[key]
+            if index.add(item):
+                query_results.append(item)
+        return query_results
 
     def format_context_as_markdown(
-        self, context: Dict[str, List[Dict[str, str]]]
+        self, context: Dict[str, List[Dict[str, Any]]]
     ) -> str:
         """Format search context as markdown bullets.
 
@@ -222,26 +984,42 @@ class TavilyClient:
         Returns:
             Formatted markdown string
         """
-        bullets = []
+        return "\n".join(
+            self.format_query_markdown(query, items)
+            for query, items in context.items()
+        )
 
-        for query, items in context.items():
-            bullets.append(f"### Query: {query}")
+    def format_query_markdown(
+        self, query: str, items: List[Dict[str, Any]]
+    ) -> str:
+        """Format one query's results as a markdown section.
 
-            if not items:
-                bullets.append("- No results found")
-            else:
-                for item in items:
-                    title = item["title"]
-                    url = item["url"]
-                    content = item["content"].replace("\n", " ")
-                    bullets.append(f"- {title} — {content} [source]({url})")
+        Sections joined with newlines give the same text as
+        format_context_as_markdown(), so context can be built incrementally
+        from iter_context(); sections of results that later gained links
+        (see apply_late_links()) have to be formatted again.
+
+        Args:
+            query: Query the results belong to
+            items: Results for the query
 
-            bullets.append("")  # Empty line between queries
+        Returns:
+            Markdown section, ending with a newline
+        """
+        return format_query_section(query, items)
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss statistics of the search cache.
 
-        return "\n".join(bullets)
+        Returns:
+            Cache statistics, or an empty dictionary if caching is disabled
+        """
+        if self.cache is None:
+            return {}
+        return self.cache.stats()
 
     def get_total_results_count(
-        self, context: Dict[str, List[Dict[str, str]]]
+        self, context: Dict[str, List[Dict[str, Any]]]
     ) -> int:
         """Get total number of results across all queries.
 
@@ -255,10 +1033,10 @@ class TavilyClient:
 
     def filter_results_by_keywords(
         self,
-        context: Dict[str, List[Dict[str, str]]],
+        context: Dict[str, List[Dict[str, Any]]],
         keywords: List[str],
         case_sensitive: bool = False,
-    ) -> Dict[str, List[Dict[str, str]]]:
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """Filter search results by keywords in title or content.
 
         Args:
@@ -6,10 +6,15 @@ from .helpers import (
     ensure_marp_header,
     find_json,
     insert_separators,
+    join_slides,
     log_message,
+    marp_header,
+    normalize_marp_markdown,
     now_jst,
+    read_topics_file,
     remove_presenter_lines,
     slugify_en,
+    split_slides,
     strip_bullets,
     strip_whole_code_fence,
     today_iso,
@@ -20,12 +25,17 @@ __all__ = [
     "strip_bullets",
     "slugify_en",
     "find_json",
+    "marp_header",
     "ensure_marp_header",
     "insert_separators",
     "dedupe_separators",
+    "split_slides",
+    "join_slides",
     "strip_whole_code_fence",
     "clean_title",
     "remove_presenter_lines",
+    "normalize_marp_markdown",
+    "read_topics_file",
     "today_iso",
     "now_jst",
 ]
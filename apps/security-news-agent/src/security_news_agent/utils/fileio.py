@@ -0,0 +1,112 @@
+"""Crash-safe file writes and collision-free file names."""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Sequence
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Flush a directory entry change (e.g. a rename) to disk, if supported."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: Path, data: bytes, overwrite: bool = True) -> None:
+    """Write a file so that readers see either nothing or all of it.
+
+    The data is written to a temporary file in the same directory, flushed
+    to disk and then renamed over ``path``, so a crash never leaves a
+    truncated file behind.
+
+    Args:
+        path: Destination file
+        data: File contents
+        overwrite: Replace an existing file; if False, raise instead
+
+    Raises:
+        FileExistsError: If ``path`` exists and ``overwrite`` is False
+        OSError: If the file cannot be written
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if overwrite:
+            os.replace(tmp, path)
+        else:
+            # link() fails instead of clobbering a file that appeared since
+            os.link(tmp, path)
+            os.unlink(tmp)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+    _fsync_directory(path.parent)
+
+
+def atomic_write_text(path: Path, text: str, overwrite: bool = True) -> None:
+    """Write UTF-8 text with atomic_write_bytes().
+
+    Args:
+        path: Destination file
+        text: File contents
+        overwrite: Replace an existing file; if False, raise instead
+    """
+    atomic_write_bytes(path, text.encode("utf-8"), overwrite=overwrite)
+
+
+def reserve_path(
+    path: Path, taken_suffixes: Sequence[str] = (), attempts: int = 1000
+) -> Path:
+    """Claim a file name no other writer is using.
+
+    The name is claimed by creating an empty file exclusively, so two
+    processes asking for the same name at once get different ones. If
+    ``path`` is taken, ``-2``, ``-3``, ... are appended to its stem.
+
+    Args:
+        path: Preferred file name
+        taken_suffixes: Suffixes that also mark a name as taken, e.g. the
+            ".gz" of a compressed copy that replaced the file
+        attempts: Number of names to try
+
+    Returns:
+        The claimed path, which now exists as an empty file
+
+    Raises:
+        FileExistsError: If no free name was found
+    """
+    path = Path(path)
+    for index in range(1, attempts + 1):
+        name = path.name if index == 1 else f"{path.stem}-{index}{path.suffix}"
+        candidate = path.with_name(name)
+        if any(
+            candidate.with_name(name + suffix).exists()
+            for suffix in taken_suffixes
+        ):
+            continue
+        try:
+            fd = os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return candidate
+
+    raise FileExistsError(f"No free file name for {path}")
@@ -2,8 +2,9 @@
 
 import json
 import re
+import sys
 from datetime import datetime
-from typing import Any, Dict, List, Mapping, Optional
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 # Timezone configuration
@@ -11,16 +12,19 @@ JST = ZoneInfo("Asia/Tokyo")
 
 
 def log_message(state: Mapping[str, Any], msg: str) -> List[str]:
-    """Append a message to the state's log list.
+    """Build the log update for a single message.
+
+    The state's log channel appends what a node returns, so the update holds
+    only the new entry rather than a copy of the whole log.
 
     Args:
         state: The current state, which must be a mapping.
         msg: The message to append.
 
     Returns:
-        The updated list of log messages.
+        A list holding only the new log message.
     """
-    return (state.get("log") or []) + [msg]
+    return [msg]
 
 
 def strip_bullets(lines: List[str]) -> List[str]:
@@ -82,18 +86,16 @@ def find_json(text: str) -> Optional[str]:
     return None
 
 
-def ensure_marp_header(md: str, title: str) -> str:
-    """Ensure markdown has proper Marp header.
+def marp_header(title: str) -> str:
+    """Build the default Marp front matter.
 
     Args:
-        md: Markdown content
         title: Document title
 
     Returns:
-        Markdown with Marp header
+        Front matter block followed by a blank line
     """
-    # Default Marp configuration
-    header = (
+    return (
         "---\n"
         "marp: true\n"
         "paginate: true\n"
@@ -102,6 +104,19 @@ def ensure_marp_header(md: str, title: str) -> str:
         "---\n\n"
     )
 
+
+def ensure_marp_header(md: str, title: str) -> str:
+    """Ensure markdown has proper Marp header.
+
+    Args:
+        md: Markdown content
+        title: Document title
+
+    Returns:
+        Markdown with Marp header
+    """
+    header = marp_header(title)
+
     # Remove existing header if present
     body = re.sub(
         r"^---[\s\S]*?---\s*", "", md.strip(), count=1, flags=re.DOTALL
@@ -170,6 +185,61 @@ def dedupe_separators(md: str) -> str:
     return md
 
 
+def split_slides(md: str, has_front_matter: bool = True) -> Tuple[str, List[str]]:
+    """Split a Marp deck into its front matter and individual slides.
+
+    Slides are separated by lines containing only ``---``; separators inside
+    fenced code blocks are ignored. join_slides() reverses the split.
+
+    Args:
+        md: Markdown content
+        has_front_matter: Whether a leading ``---`` block is front matter
+
+    Returns:
+        Tuple of the front matter (empty if none) and the slide bodies
+    """
+    lines = md.split("\n")
+
+    start = 0
+    if has_front_matter and lines and lines[0].strip() == "---":
+        for i in range(1, len(lines)):
+            if lines[i].strip() == "---":
+                start = i + 1
+                break
+
+    slides: List[str] = []
+    current: List[str] = []
+    fence: Optional[str] = None
+    for line in lines[start:]:
+        if line.startswith("```") or line.startswith("~~~"):
+            if fence is None:
+                fence = line[:3]
+            elif line.startswith(fence):
+                fence = None
+        elif fence is None and line.strip() == "---":
+            slides.append("\n".join(current))
+            current = []
+            continue
+        current.append(line)
+    slides.append("\n".join(current))
+
+    return "\n".join(lines[:start]), slides
+
+
+def join_slides(front_matter: str, slides: List[str]) -> str:
+    """Reassemble a deck split by split_slides().
+
+    Args:
+        front_matter: Front matter block, or an empty string
+        slides: Slide bodies
+
+    Returns:
+        Markdown content
+    """
+    body = "\n---\n".join(slides)
+    return f"{front_matter}\n{body}" if front_matter else body
+
+
 def strip_whole_code_fence(md: str) -> str:
     """Remove code fence that wraps entire content.
 
@@ -239,6 +309,48 @@ def remove_presenter_lines(md: str) -> str:
     return head + ("\n---\n" + parts[1] if len(parts) == 2 else "")
 
 
+def normalize_marp_markdown(md: str, title: str) -> str:
+    """Turn raw LLM slide output into a Marp deck.
+
+    Feeds the whole text through MarpStreamNormalizer, so a deck written in
+    one go and a streamed deck share the same single-pass normalisation.
+    The result is exactly what strip_whole_code_fence(), insert_separators(),
+    dedupe_separators(), ensure_marp_header() and remove_presenter_lines()
+    give when chained.
+
+    Args:
+        md: Markdown content
+        title: Single-line document title
+
+    Returns:
+        Markdown with Marp header
+    """
+    # Imported here because marp_stream builds on this module
+    from .marp_stream import MarpStreamNormalizer
+
+    normalizer = MarpStreamNormalizer(title)
+    normalizer.feed(md)
+    return normalizer.close()
+
+
+def read_topics_file(path: str) -> List[str]:
+    """Read briefing topics from a text file, one per line.
+
+    Blank lines and lines starting with ``#`` are skipped, and a repeated
+    topic is only kept once.
+
+    Args:
+        path: Path to the topics file
+
+    Returns:
+        Topics in file order
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+    topics = [line for line in lines if line and not line.startswith("#")]
+    return list(dict.fromkeys(topics))
+
+
 def now_jst() -> datetime:
     """Get current time in JST timezone.
 
@@ -356,6 +468,35 @@ def format_file_size(size_bytes: int) -> str:
     return f"{size:.1f} {size_names[i]}"
 
 
+def deep_sizeof(obj: Any) -> int:
+    """Approximate the memory held by a value and everything it contains.
+
+    Objects reachable more than once (e.g. a string shared by two lists)
+    are counted once.
+
+    Args:
+        obj: Value made of built-in containers and scalars
+
+    Returns:
+        Size in bytes, as reported by sys.getsizeof()
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename by removing invalid characters.
 
@@ -0,0 +1,70 @@
+"""Deferred imports that keep CLI start-up cheap."""
+
+import functools
+import importlib
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def lazy_exports(
+    namespace: Dict[str, Any], exports: Dict[str, str]
+) -> Callable[[str], Any]:
+    """Build a module ``__getattr__`` that imports its exports on first use.
+
+    Assign the result to ``__getattr__`` in a module (PEP 562). The first
+    access to an exported name imports the module that defines it and
+    caches the value in the module namespace, so later lookups, ``from``
+    imports and ``unittest.mock.patch`` see an ordinary attribute. Code in
+    the module itself can call the function to get the current value.
+
+    Args:
+        namespace: The module's ``globals()``
+        exports: Exported name -> module defining it, absolute or relative
+            to the module's package
+
+    Returns:
+        Function suitable as the module's ``__getattr__``
+    """
+    module_name = namespace["__name__"]
+    package = namespace.get("__package__") or module_name
+
+    def __getattr__(name: str) -> Any:
+        if name in namespace:
+            return namespace[name]
+        if name not in exports:
+            raise AttributeError(
+                f"module {module_name!r} has no attribute {name!r}"
+            )
+        value = getattr(importlib.import_module(exports[name], package), name)
+        namespace[name] = value
+        return value
+
+    return __getattr__
+
+
+def lazy_traceable(**kwargs: Any) -> Callable[[F], F]:
+    """Like ``langsmith.traceable``, but import langsmith on the first call.
+
+    Args:
+        **kwargs: Arguments for ``langsmith.traceable`` (e.g. ``name``)
+
+    Returns:
+        Decorator tracing the wrapped function once it is first called
+    """
+
+    def decorator(func: F) -> F:
+        traced: Optional[Callable[..., Any]] = None
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **call_kwargs: Any) -> Any:
+            nonlocal traced
+            if traced is None:
+                from langsmith import traceable
+
+                traced = traceable(**kwargs)(func)
+            return traced(*args, **call_kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,310 @@
+"""Incremental normalisation of Marp slide markdown streamed from an LLM."""
+
+import re
+from typing import Callable, List, Optional
+
+from .helpers import marp_header, remove_presenter_lines
+
+_FENCE_INFO = re.compile(r"^[a-zA-Z0-9_-]*")
+
+
+def _is_fence(line: str) -> bool:
+    """Check whether a line opens or closes a fenced code block."""
+    return line.startswith("```") or line.startswith("~~~")
+
+
+def _is_separator(line: str) -> bool:
+    """Check whether a line is a bare ``---`` slide separator."""
+    return line.strip() == "---"
+
+
+class MarpStreamNormalizer:
+    """Line-oriented state machine that normalizes a streamed Marp deck.
+
+    Feeding the raw LLM output chunk by chunk produces the same deck as
+    running strip_whole_code_fence(), insert_separators(),
+    dedupe_separators(), ensure_marp_header() and remove_presenter_lines()
+    over the complete text. Each stage only holds back the few lines it
+    still needs to decide on, so finished slides are available while the
+    model is still writing the rest of the deck.
+
+    remove_presenter_lines() only ever sees the generated front matter,
+    which it leaves unchanged, so it is applied to the header once.
+    """
+
+    def __init__(
+        self, title: str, on_slide: Optional[Callable[[str], None]] = None
+    ) -> None:
+        """Initialize the normalizer.
+
+        Args:
+            title: Single-line deck title for the Marp front matter
+            on_slide: Called with the next piece of the normalized deck each
+                time a slide is complete; the pieces concatenate to the
+                final deck
+        """
+        self.on_slide = on_slide
+        self.slide_count = 0
+
+        # Chunk splitting and strip_whole_code_fence()
+        self._buffer = ""
+        self._leading = True
+        self._wrapped: Optional[bool] = None
+        self._held: List[str] = []
+
+        # insert_separators()
+        self._in_code = False
+        self._fence: Optional[str] = None
+        self._prev = ""
+
+        # dedupe_separators()
+        self._pending: List[str] = []
+        self._in_run = False
+        self._lead_lines: Optional[List[str]] = []
+        self._lead_separator = False
+
+        # ensure_marp_header()
+        self._body_started = False
+        self._front_matter: Optional[List[str]] = None
+        self._skip_space = False
+
+        # Output
+        self._out: List[str] = [remove_presenter_lines(marp_header(title))]
+        self._flushed = 0
+        self._last: Optional[str] = None
+        self._blank_tail: List[str] = []
+        self._out_fence: Optional[str] = None
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next chunk of raw LLM output.
+
+        Args:
+            chunk: Text of any length; lines may span several chunks
+        """
+        self._buffer += chunk
+        lines = self._buffer.splitlines(keepends=True)
+        self._buffer = ""
+        if lines:
+            last = lines[-1]
+            # Keep an unfinished line, or a "\r" that may be half of "\r\n"
+            if last.splitlines()[0] == last or last.endswith("\r"):
+                self._buffer = lines.pop()
+        for line in lines:
+            self._source_line(line.splitlines()[0])
+
+    def close(self) -> str:
+        """Finish the stream.
+
+        Returns:
+            The complete normalized deck
+        """
+        if self._buffer:
+            self._source_line(self._buffer.splitlines()[0])
+            self._buffer = ""
+
+        if self._held:
+            last = self._held[0].rstrip()
+            if self._wrapped and last.endswith("```"):
+                last = last[:-3]
+            self._insert_separators(last)
+            self._held = []
+
+        if not self._in_run:
+            for line in self._pending:
+                self._leading_separators(line)
+        self._pending = []
+
+        if self._lead_lines is not None:
+            self._flush_lead()
+
+        if self._front_matter is not None:
+            # No closing --- was found, so nothing is removed
+            lines = self._front_matter
+            self._front_matter = None
+            for line in lines:
+                self._emit(line)
+
+        if self._last is not None:
+            self._commit(self._last.rstrip())
+        self._out.append("\n" if self._last is None else "")
+        self._flush()
+        return "".join(self._out)
+
+    def _source_line(self, line: str) -> None:
+        """Strip the surrounding whitespace and any wrapping code fence."""
+        if self._leading:
+            if not line.strip():
+                return
+            line = line.lstrip()
+            self._leading = False
+            if self._wrapped is None and line.startswith("```"):
+                self._wrapped = True
+                line = _FENCE_INFO.sub("", line[3:]).lstrip()
+                if not line:
+                    self._leading = True
+                    return
+            self._wrapped = bool(self._wrapped)
+
+        # Hold the last non-blank line until we know it does not end the
+        # text, which is stripped (and loses a wrapping fence's closing ```)
+        if line.strip() and self._held:
+            for held in self._held:
+                self._insert_separators(held)
+            self._held = []
+        if line.strip() or self._held:
+            self._held.append(line)
+        else:
+            self._insert_separators(line)
+
+    def _insert_separators(self, line: str) -> None:
+        """Add a separator before each H2 heading outside code blocks."""
+        if _is_fence(line):
+            if not self._in_code:
+                self._in_code, self._fence = True, line[:3]
+            elif self._fence and line.startswith(self._fence):
+                self._in_code, self._fence = False, None
+        elif not self._in_code and line.startswith("## "):
+            if self._prev.strip() != "---":
+                self._dedupe_separators("---")
+        self._prev = line
+        self._dedupe_separators(line)
+
+    def _dedupe_separators(self, line: str) -> None:
+        """Collapse runs of separators, like dedupe_separators() does.
+
+        A run starts at a line ending in ``---`` and continues over bare
+        separator lines and the blank lines between them. The run, the
+        whitespace before it and the blank lines after it become a single
+        separator. Lines are held in ``_pending`` until it is known whether
+        a run starts.
+        """
+        stripped = line.strip()
+        if self._in_run:
+            if not stripped or stripped == "---":
+                return
+            self._in_run = False
+        elif not stripped or (stripped == "---" and not self._start_run()):
+            self._pending.append(line)
+            return
+        elif stripped == "---":
+            return
+        else:
+            for pending in self._pending:
+                self._leading_separators(pending)
+        self._pending = [line]
+
+    def _start_run(self) -> bool:
+        """Start a run of separators at the last held non-blank line.
+
+        Returns:
+            True if a run started and its prefix has been passed on
+        """
+        index = len(self._pending) - 1
+        while index >= 0 and not self._pending[index].strip():
+            index -= 1
+        if index < 0:
+            return False
+
+        first = self._pending[index].rstrip()
+        if not first.endswith("---"):
+            return False
+
+        prefix = first[:-3].rstrip()
+        before = self._pending[:index]
+        if not prefix:
+            # A bare separator also swallows the whitespace before it
+            while before and not before[-1].strip():
+                before.pop()
+            if before:
+                before[-1] = before[-1].rstrip()
+            else:
+                before = [""]
+        else:
+            before.append(prefix)
+
+        for pending in before:
+            self._leading_separators(pending)
+        self._leading_separators("---")
+        self._pending = []
+        self._in_run = True
+        return True
+
+    def _leading_separators(self, line: str) -> None:
+        """Collapse separators and blank lines opening the deck into one."""
+        if self._lead_lines is None:
+            self._strip_front_matter(line)
+            return
+
+        if not line.strip() or _is_separator(line):
+            self._lead_lines.append(line)
+            self._lead_separator = self._lead_separator or _is_separator(line)
+            return
+
+        self._flush_lead()
+        self._strip_front_matter(line)
+
+    def _flush_lead(self) -> None:
+        """Pass on the lines held at the start of the deck."""
+        lines = ["---"] if self._lead_separator else self._lead_lines or []
+        self._lead_lines = None
+        for line in lines:
+            self._strip_front_matter(line)
+
+    def _strip_front_matter(self, line: str) -> None:
+        """Drop a leading ``---`` block, like ensure_marp_header() does."""
+        if self._skip_space:
+            if not line.strip():
+                return
+            line = line.lstrip()
+            self._skip_space = False
+        elif self._front_matter is not None:
+            end = line.find("---", 3 if not self._front_matter else 0)
+            self._front_matter.append(line)
+            if end < 0:
+                return
+            self._front_matter = None
+            line = line[end + 3:].lstrip()
+            if not line:
+                self._skip_space = True
+                return
+        elif not self._body_started:
+            if not line.strip():
+                return
+            line = line.lstrip()
+            self._body_started = True
+            if line.startswith("---"):
+                self._front_matter = []
+                self._strip_front_matter(line)
+                return
+
+        self._emit(line)
+
+    def _emit(self, line: str) -> None:
+        """Add a body line, holding trailing whitespace until more arrives."""
+        if not line.strip():
+            self._blank_tail.append(line)
+            return
+        if self._last is not None:
+            self._commit(self._last)
+        for blank in self._blank_tail:
+            self._commit(blank)
+        self._blank_tail = []
+        self._last = line
+
+    def _commit(self, line: str) -> None:
+        """Append a final body line and report slides as they complete."""
+        self._out.append(line + "\n")
+        if _is_fence(line):
+            if self._out_fence is None:
+                self._out_fence = line[:3]
+            elif line.startswith(self._out_fence):
+                self._out_fence = None
+        elif self._out_fence is None and _is_separator(line):
+            self.slide_count += 1
+            self._flush()
+
+    def _flush(self) -> None:
+        """Hand the text committed since the last flush to on_slide."""
+        if self.on_slide is not None and self._flushed < len(self._out):
+            self.on_slide("".join(self._out[self._flushed:]))
+        self._flushed = len(self._out)
@@ -0,0 +1,339 @@
+"""Per-run metrics for workflow nodes, LLM calls and searches."""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .fileio import atomic_write_text
+
+# Prefix of every exported Prometheus metric
+PROMETHEUS_PREFIX = "security_news"
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def _usage_tokens(usage: Optional[Mapping[str, Any]]) -> Optional[Tuple[int, int]]:
+    """Read (input, output) token counts from LangChain usage metadata."""
+    if not usage:
+        return None
+    try:
+        return int(usage["input_tokens"]), int(usage["output_tokens"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class NodeStats:
+    """Totals for one workflow node across its executions in a run."""
+
+    runs: int = 0
+    seconds: float = 0.0
+    errors: int = 0
+    llm_calls: int = 0
+    cache_hits: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    estimated_tokens: bool = False
+    chars_in: int = 0
+    chars_out: int = 0
+
+    @property
+    def retries(self) -> int:
+        """Executions beyond the first (evaluation retries, repairs)."""
+        return max(0, self.runs - 1)
+
+
+@dataclass
+class SearchStats:
+    """One search request, served from the cache or sent to the API."""
+
+    query: str
+    seconds: float = 0.0
+    results: int = 0
+    cached: bool = False
+    retries: int = 0
+    error: str = ""
+
+
+class RunMetrics:
+    """Thread-safe collector of one run's node, LLM and search metrics.
+
+    Workflow wrappers time each node with time_node(); nodes report their
+    LLM calls with record_llm() and the Tavily client reports each search
+    with record_search(). Token counts come from the provider's usage
+    metadata when it is available and are estimated from the text
+    otherwise (cached and streamed responses). Cache hits cost no tokens.
+    """
+
+    def __init__(
+        self,
+        input_cost_per_mtok: float = 0.0,
+        output_cost_per_mtok: float = 0.0,
+    ) -> None:
+        """Initialize an empty collector.
+
+        Args:
+            input_cost_per_mtok: Price of a million prompt tokens
+            output_cost_per_mtok: Price of a million completion tokens
+        """
+        self.input_cost_per_mtok = input_cost_per_mtok
+        self.output_cost_per_mtok = output_cost_per_mtok
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, NodeStats] = {}
+        self._searches: List[SearchStats] = []
+        # Retries counted for searches that have not finished yet
+        self._pending_retries: Dict[str, int] = {}
+
+    def _node(self, name: str) -> NodeStats:
+        """Get a node's stats (lock held by the caller)."""
+        stats = self._nodes.get(name)
+        if stats is None:
+            stats = self._nodes[name] = NodeStats()
+        return stats
+
+    @contextmanager
+    def time_node(self, name: str) -> Iterator[None]:
+        """Time one execution of a node.
+
+        Args:
+            name: Node name
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                stats = self._node(name)
+                stats.runs += 1
+                stats.seconds += elapsed
+
+    def record_node_error(self, name: str) -> None:
+        """Count a node execution that reported an error.
+
+        Args:
+            name: Node name
+        """
+        with self._lock:
+            self._node(name).errors += 1
+
+    def record_llm(
+        self,
+        node: str,
+        prompt: str,
+        completion: str,
+        cached: bool = False,
+        usage: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        """Record one LLM call made by a node.
+
+        Args:
+            node: Node name
+            prompt: Prompt sent to the model
+            completion: Response text
+            cached: Whether the response came from the cache
+            usage: LangChain ``usage_metadata`` of the response, if any
+        """
+        tokens = _usage_tokens(usage)
+        with self._lock:
+            stats = self._node(node)
+            stats.llm_calls += 1
+            stats.chars_in += len(prompt)
+            stats.chars_out += len(completion)
+            if cached:
+                stats.cache_hits += 1
+                return
+            if tokens is None:
+                stats.estimated_tokens = True
+                tokens = _estimate_tokens(prompt), _estimate_tokens(completion)
+            stats.prompt_tokens += tokens[0]
+            stats.completion_tokens += tokens[1]
+
+    def record_search_retry(self, query: str) -> None:
+        """Count a retried request for a search that is still running.
+
+        Args:
+            query: Search query
+        """
+        with self._lock:
+            pending = self._pending_retries
+            pending[query] = pending.get(query, 0) + 1
+
+    def record_search(
+        self,
+        query: str,
+        seconds: float,
+        results: int = 0,
+        cached: bool = False,
+        error: str = "",
+    ) -> None:
+        """Record a finished search.
+
+        Args:
+            query: Search query
+            seconds: Wall time of the search including retries
+            results: Number of results returned
+            cached: Whether the response came from the cache
+            error: Error message if the search failed
+        """
+        with self._lock:
+            self._searches.append(
+                SearchStats(
+                    query=query,
+                    seconds=seconds,
+                    results=results,
+                    cached=cached,
+                    retries=self._pending_retries.pop(query, 0),
+                    error=error,
+                )
+            )
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """Estimate the price of a token count.
+
+        Args:
+            prompt_tokens: Prompt tokens
+            completion_tokens: Completion tokens
+
+        Returns:
+            Cost in the currency the prices are given in
+        """
+        prompt_cost = prompt_tokens * self.input_cost_per_mtok
+        completion_cost = completion_tokens * self.output_cost_per_mtok
+        return (prompt_cost + completion_cost) / 1_000_000
+
+    def report(self) -> Dict[str, Any]:
+        """Build the run report.
+
+        Returns:
+            JSON-serializable dictionary with per-node stats, every search
+            and run totals
+        """
+        with self._lock:
+            nodes = {
+                name: {
+                    **asdict(stats),
+                    "retries": stats.retries,
+                    "cost": self.cost(stats.prompt_tokens, stats.completion_tokens),
+                }
+                for name, stats in self._nodes.items()
+            }
+            searches = [asdict(search) for search in self._searches]
+
+        def total(key: str) -> Any:
+            return sum(node[key] for node in nodes.values())
+
+        return {
+            "started_at": self.started_at.isoformat(),
+            "seconds": time.perf_counter() - self._started,
+            "nodes": nodes,
+            "searches": searches,
+            "totals": {
+                "llm_calls": total("llm_calls"),
+                "llm_cache_hits": total("cache_hits"),
+                "prompt_tokens": total("prompt_tokens"),
+                "completion_tokens": total("completion_tokens"),
+                "cost": total("cost"),
+                "searches": len(searches),
+                "search_cache_hits": sum(s["cached"] for s in searches),
+                "search_retries": sum(s["retries"] for s in searches),
+                "search_errors": sum(bool(s["error"]) for s in searches),
+                "search_seconds": sum(s["seconds"] for s in searches),
+            },
+        }
+
+    def write_json(self, path: str) -> None:
+        """Write the run report as JSON.
+
+        Args:
+            path: Destination file
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(
+            target, json.dumps(self.report(), indent=2, ensure_ascii=False)
+        )
+
+    def prometheus_text(self) -> str:
+        """Render the run report in the Prometheus text exposition format.
+
+        Every value describes the last run, so all metrics are gauges; the
+        file is meant for node_exporter's textfile collector.
+
+        Returns:
+            Exposition text
+        """
+        report = self.report()
+        lines: List[str] = []
+
+        def gauge(name: str, help_text: str, samples: List[Tuple[str, Any]]) -> None:
+            metric = f"{PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for labels, value in samples:
+                lines.append(f"{metric}{labels} {float(value):g}")
+
+        def per_node(key: str) -> List[Tuple[str, Any]]:
+            return [
+                (f'{{node="{name}"}}', stats[key])
+                for name, stats in sorted(report["nodes"].items())
+            ]
+
+        node_metrics = [
+            ("node_runs", "runs", "Executions of each workflow node"),
+            ("node_seconds", "seconds", "Wall time spent in each workflow node"),
+            ("node_errors", "errors", "Node executions that reported an error"),
+            ("node_retries", "retries", "Node executions beyond the first"),
+            ("llm_calls", "llm_calls", "LLM calls made by each node"),
+            ("llm_cache_hits", "cache_hits", "LLM responses served from the cache"),
+            ("llm_prompt_tokens", "prompt_tokens", "Prompt tokens sent per node"),
+            (
+                "llm_completion_tokens",
+                "completion_tokens",
+                "Completion tokens received per node",
+            ),
+            ("llm_chars_in", "chars_in", "Prompt characters sent per node"),
+            ("llm_chars_out", "chars_out", "Response characters received per node"),
+            ("llm_cost", "cost", "Estimated LLM cost per node"),
+        ]
+        for name, key, help_text in node_metrics:
+            gauge(name, help_text, per_node(key))
+
+        totals = report["totals"]
+        search_metrics = [
+            ("search_requests", "searches", "Searches performed"),
+            ("search_cache_hits", "search_cache_hits", "Searches served from cache"),
+            ("search_retries", "search_retries", "Retried search requests"),
+            ("search_errors", "search_errors", "Searches that failed"),
+            ("search_seconds", "search_seconds", "Wall time spent searching"),
+        ]
+        for name, key, help_text in search_metrics:
+            gauge(name, help_text, [("", totals[key])])
+
+        gauge("run_seconds", "Wall time of the run", [("", report["seconds"])])
+        gauge(
+            "run_timestamp_seconds",
+            "Start time of the run",
+            [("", self.started_at.timestamp())],
+        )
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the run report as a Prometheus textfile.
+
+        Args:
+            path: Destination file (conventionally ending in ``.prom``)
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(target, self.prometheus_text())
@@ -0,0 +1,232 @@
+"""SQLite-backed key/value cache with TTL and LRU eviction."""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SQLiteCache:
+    """Persistent cache of JSON values with per-entry TTL and LRU eviction.
+
+    Entries expire after the TTL given when they are stored. When the stored
+    payloads exceed ``max_bytes``, the least recently used entries are
+    evicted first. Cache failures are logged and treated as misses so that a
+    broken cache never blocks the caller.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        table: str = "cache",
+    ) -> None:
+        """Initialize the cache, creating the database if needed.
+
+        Args:
+            path: Path to the SQLite database file
+            max_bytes: Maximum total size of cached payloads in bytes
+            table: Name of the table holding the entries
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.table = table
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn: Optional[sqlite3.Connection] = None
+
+        try:
+            self._conn = self._connect()
+        except (sqlite3.Error, OSError) as e:
+            # Run without a cache rather than fail the caller
+            logger.warning(f"{table} disabled, cannot open {self.path}: {e}")
+            return
+
+        logger.info(f"Initialized {table} at: {self.path}")
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the database could be opened."""
+        return self._conn is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the table if needed.
+
+        Returns:
+            Open connection to the cache database
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened or set up
+            OSError: If the parent directory cannot be created
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        try:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, "
+                "last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table}_last_access "
+                f"ON {self.table} (last_access)"
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss or expired entry
+        """
+        if self._conn is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    f"SELECT value, expires_at FROM {self.table} WHERE key = ?",
+                    (key,),
+                ).fetchone()
+
+                if row is None or row[1] <= now:
+                    if row is not None:
+                        self._conn.execute(
+                            f"DELETE FROM {self.table} WHERE key = ?", (key,)
+                        )
+                        self._conn.commit()
+                    self.misses += 1
+                    return None
+
+                self._conn.execute(
+                    f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+                    (now, key),
+                )
+                self._conn.commit()
+                value = json.loads(row[0])
+                self.hits += 1
+                return value
+
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"{self.table} lookup failed: {e}")
+                self.misses += 1
+                return None
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value and evict entries if over the size limit.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value to cache
+            ttl: Seconds the entry stays fresh
+        """
+        if self._conn is None:
+            return
+
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+
+        if size > self.max_bytes:
+            logger.debug(f"Value larger than {self.table}, not caching")
+            return
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} "
+                    "(key, value, size, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, size, now + ttl, now),
+                )
+                self._evict(self._conn, now)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"{self.table} write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones over the limit.
+
+        Args:
+            conn: Open connection to the cache database
+            now: Current timestamp
+        """
+        conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+
+        total = conn.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = conn.execute(
+            f"SELECT key, size FROM {self.table} ORDER BY last_access ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+
+        logger.debug(f"Evicted {evicted} {self.table} entries")
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss counts, entry count and stored bytes
+        """
+        with self._lock:
+            entries, total = 0, 0
+            try:
+                if self._conn is not None:
+                    entries, total = self._conn.execute(
+                        f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+                    ).fetchone()
+            except sqlite3.Error:
+                entries, total = 0, 0
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": total,
+        }
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.close()
@@ -99,8 +99,8 @@ def mock_initial_state():
         attempts=0,
         error="",
         log=[],
-        context_md="",
-        sources={},
+        sources_id="",
+        memory=[],
     )
 
 
@@ -126,7 +126,6 @@ def mock_processed_state(mock_initial_state, mock_gemini_response):
             "title": "Daily Security Briefing - 2025-09-14",
             "score": 8.5,
             "passed": True,
-            "context_md": "### Query: latest cybersecurity news\n- Critical Security Vulnerability Discovered in Popular Framework — A critical vulnerability has been discovered... [source](https://example.com/security-news-1)",
         }
     )
     return state
@@ -159,7 +158,7 @@ def mock_tavily_client(mock_tavily_response):
 def mock_llm(mock_gemini_response):
     """Mock LLM client for testing."""
     with patch(
-        "security_news_agent.processing.nodes.ChatGoogleGenerativeAI"
+        "security_news_agent.processing.workflow.ChatGoogleGenerativeAI"
     ) as mock_class:
         mock_instance = Mock()
         mock_response = Mock()
@@ -8,6 +8,7 @@ import pytest
 
 from security_news_agent.config.settings import AgentConfig
 from security_news_agent.output.renderer import ReportRenderer
+from security_news_agent.processing.checkpoint import SQLiteCheckpointer
 from security_news_agent.processing.workflow import SecurityNewsWorkflow
 from security_news_agent.search.tavily_client import TavilyClient
 from tests.fixtures.mock_data import (
@@ -17,6 +18,37 @@ from tests.fixtures.mock_data import (
 )
 
 
+# Phrases that identify each node's prompt
+PROMPT_MARKERS = [
+    ("rigorously score", "evaluate"),
+    ("revising one slide", "repair"),
+    ("table of contents", "toc"),
+    ("presentation outline", "outline"),
+    ("Marp Markdown format", "slides"),
+]
+
+
+def respond_by_prompt(**responses):
+    """Build an LLM invoke side effect that answers each node by its prompt.
+
+    make_outline and write_slides run concurrently, so replies cannot be
+    handed out in call order. Each keyword takes a list of replies for that
+    node, used in turn; the last one repeats. Exceptions are raised.
+    """
+
+    def invoke(prompt):
+        for marker, node in PROMPT_MARKERS:
+            if marker in prompt:
+                queue = responses[node]
+                reply = queue.pop(0) if len(queue) > 1 else queue[0]
+                if isinstance(reply, Exception):
+                    raise reply
+                return reply
+        raise AssertionError(f"Unexpected prompt: {prompt[:80]}")
+
+    return invoke
+
+
 @pytest.mark.integration
 class TestEndToEndWorkflow:
     """Integration tests for the complete security news workflow."""
@@ -45,52 +77,43 @@ class TestEndToEndWorkflow:
         """Create mock Tavily client with realistic responses."""
         client = Mock(spec=TavilyClient)
         client.api_key = "test-key"
-        client.collect_context.return_value = MOCK_CONTEXT_DATA
-        client.format_context_as_markdown.return_value = (
-            self._create_mock_context_markdown()
+        client.iter_context.side_effect = lambda *args, **kwargs: iter(
+            MOCK_CONTEXT_DATA.items()
         )
+        formatter = TavilyClient("test-key")
+        client.format_context_as_markdown.side_effect = (
+            formatter.format_context_as_markdown
+        )
+        client.format_query_markdown.side_effect = formatter.format_query_markdown
         client.get_total_results_count.return_value = 5
         return client
 
-    def _create_mock_context_markdown(self):
-        """Create realistic context markdown."""
-        return """### Query: latest cybersecurity news
-- Critical Security Vulnerability Discovered in Popular Framework — A critical vulnerability (CVE-2025-1234) has been discovered... [source](https://thehackernews.com/2025/09/critical-vulnerability-framework.html)
-- Major Data Breach Affects 50 Million Users at Tech Giant — A major technology company has disclosed a data breach... [source](https://bleepingcomputer.com/2025/09/major-data-breach-tech-company.html)
-
-### Query: latest vulnerability reports
-- Zero-Day Exploit in Popular VPN Software Under Active Attack — Security researchers have discovered a zero-day vulnerability... [source](https://darkreading.com/2025/09/zero-day-vpn-software-attack.html)
-
-### Query: malware trends
-- New Malware Campaign Targets Financial Institutions Worldwide — Cybersecurity firms have identified a sophisticated malware campaign... [source](https://krebsonsecurity.com/2025/09/malware-campaign-financial-institutions.html)
-"""
-
     def test_complete_workflow_success(
         self, integration_config, mock_tavily_client, temp_output_dir
     ):
         """Test complete workflow execution with mocked dependencies."""
 
         # Mock LLM responses
-        mock_llm_responses = [
-            # Outline response
-            Mock(
-                content="""
+        mock_llm_responses = respond_by_prompt(
+            outline=[
+                Mock(
+                    content="""
 - Critical Framework Vulnerability (CVE-2025-1234) - Remote code execution risk
 - Major Data Breach at Tech Giant - 50 million users affected
 - Zero-Day VPN Exploit - Active attacks on popular VPN software
 - Financial Malware Campaign - Sophisticated APT targeting banks
 - Healthcare Ransomware Attack - 2 million patient records at risk
 """
-            ),
-            # TOC response
-            Mock(
-                content='{"toc": ["Executive Summary", "Critical Vulnerabilities", "Data Breaches", "Malware Threats", "Recommendations"]}'
-            ),
-            # Slides response
-            Mock(content=MOCK_SLIDE_CONTENT),
-            # Evaluation response
-            Mock(content=MOCK_EVALUATION_RESPONSE),
-        ]
+                )
+            ],
+            toc=[
+                Mock(
+                    content='{"toc": ["Executive Summary", "Critical Vulnerabilities", "Data Breaches", "Malware Threats", "Recommendations"]}'
+                )
+            ],
+            slides=[Mock(content=MOCK_SLIDE_CONTENT)],
+            evaluate=[Mock(content=MOCK_EVALUATION_RESPONSE)],
+        )
 
         with patch(
             "security_news_agent.processing.workflow.ChatGoogleGenerativeAI"
@@ -116,11 +139,18 @@ class TestEndToEndWorkflow:
             assert "passed" in result
 
             # Verify all workflow steps were executed
-            assert mock_tavily_client.collect_context.called
+            assert mock_tavily_client.iter_context.called
             assert (
                 mock_llm.invoke.call_count >= 3
             )  # At least outline, TOC, slides
 
+            # Every step reported the state size after it ran
+            steps = [entry["node"] for entry in result["memory"]]
+            assert steps[0] == "collect_info"
+            assert "evaluate_slides" in steps
+            assert all(entry["state_bytes"] > 0 for entry in result["memory"])
+            assert result["memory"][-1]["sources_bytes"] > 0
+
     def test_workflow_with_tavily_error(
         self, integration_config, temp_output_dir
     ):
@@ -129,7 +159,7 @@ class TestEndToEndWorkflow:
         # Mock Tavily client that fails
         mock_tavily_client = Mock(spec=TavilyClient)
         mock_tavily_client.api_key = "test-key"
-        mock_tavily_client.collect_context.side_effect = Exception(
+        mock_tavily_client.iter_context.side_effect = Exception(
             "Tavily API Error"
         )
 
@@ -176,24 +206,23 @@ class TestEndToEndWorkflow:
         """Test workflow retry logic when evaluation fails initially."""
 
         # Mock LLM responses with initial failure, then success
-        mock_llm_responses = [
-            # First attempt - outline
-            Mock(content="- Item 1\n- Item 2\n- Item 3"),
-            # First attempt - TOC
-            Mock(content='{"toc": ["Section 1", "Section 2"]}'),
-            # First attempt - slides
-            Mock(content="# Basic slides\n\n## Section 1\n\nContent"),
-            # First attempt - evaluation (fail)
-            Mock(
-                content='{"score": 6.0, "pass": false, "feedback": "Needs improvement"}'
-            ),
-            # Second attempt - TOC
-            Mock(content='{"toc": ["Better Section 1", "Better Section 2"]}'),
-            # Second attempt - slides
-            Mock(content=MOCK_SLIDE_CONTENT),
-            # Second attempt - evaluation (pass)
-            Mock(content=MOCK_EVALUATION_RESPONSE),
-        ]
+        mock_llm_responses = respond_by_prompt(
+            outline=[Mock(content="- Item 1\n- Item 2\n- Item 3")],
+            toc=[
+                Mock(content='{"toc": ["Section 1", "Section 2"]}'),
+                Mock(content='{"toc": ["Better Section 1", "Better Section 2"]}'),
+            ],
+            slides=[
+                Mock(content="# Basic slides\n\n## Section 1\n\nContent"),
+                Mock(content=MOCK_SLIDE_CONTENT),
+            ],
+            evaluate=[
+                Mock(
+                    content='{"score": 6.0, "pass": false, "feedback": "Needs improvement"}'
+                ),
+                Mock(content=MOCK_EVALUATION_RESPONSE),
+            ],
+        )
 
         with patch(
             "security_news_agent.processing.workflow.ChatGoogleGenerativeAI"
@@ -214,27 +243,111 @@ class TestEndToEndWorkflow:
             assert result.get("passed", False) is True
             assert mock_llm.invoke.call_count >= 6  # Multiple attempts
 
+    def test_workflow_repairs_flagged_slides(
+        self, integration_config, mock_tavily_client, temp_output_dir
+    ):
+        """Test that flagged slides are repaired instead of regenerating."""
+        evaluate_fail = (
+            '{"score": 6.0, "pass": false, "feedback": "Weak slide", '
+            '"flagged_slides": [{"slide": 2, "issue": "No sources"}]}'
+        )
+        responses = respond_by_prompt(
+            outline=[Mock(content="- Item 1\n- Item 2")],
+            toc=[Mock(content='{"toc": ["Section 1", "Section 2"]}')],
+            slides=[Mock(content=MOCK_SLIDE_CONTENT)],
+            evaluate=[Mock(content=evaluate_fail), Mock(content=MOCK_EVALUATION_RESPONSE)],
+            repair=[Mock(content="## Repaired slide\n\n- [source](https://example.com)")],
+        )
+        prompts = []
+
+        def invoke(prompt):
+            prompts.append(prompt)
+            return responses(prompt)
+
+        with patch(
+            "security_news_agent.processing.workflow.ChatGoogleGenerativeAI"
+        ) as mock_llm_class:
+            mock_llm = Mock()
+            mock_llm.invoke.side_effect = invoke
+            mock_llm_class.return_value = mock_llm
+
+            workflow = SecurityNewsWorkflow(
+                integration_config, mock_tavily_client
+            )
+
+            result = workflow.run()
+
+        assert result.get("passed") is True
+        assert "## Repaired slide" in result["slide_md"]
+        assert sum("Marp Markdown format" in p for p in prompts) == 1
+        assert sum("table of contents" in p for p in prompts) == 1
+        assert sum("revising one slide" in p for p in prompts) == 1
+
+    def test_workflow_resume_after_failure(
+        self, integration_config, mock_tavily_client, temp_output_dir
+    ):
+        """Test that a resumed run skips the nodes that already succeeded."""
+        responses = respond_by_prompt(
+            outline=[Mock(content="- Item 1\n- Item 2")],
+            toc=[Mock(content='{"toc": ["Section 1", "Section 2"]}')],
+            slides=[Mock(content=MOCK_SLIDE_CONTENT)],
+            evaluate=[
+                ConnectionError("network down"),
+                Mock(content=MOCK_EVALUATION_RESPONSE),
+            ],
+        )
+        prompts = []
+
+        def invoke(prompt):
+            prompts.append(prompt)
+            return responses(prompt)
+
+        checkpointer = SQLiteCheckpointer(str(temp_output_dir / "runs.sqlite3"))
+        with patch(
+            "security_news_agent.processing.workflow.ChatGoogleGenerativeAI"
+        ) as mock_llm_class:
+            mock_llm_class.return_value.invoke.side_effect = invoke
+
+            workflow = SecurityNewsWorkflow(
+                integration_config, mock_tavily_client, checkpointer=checkpointer
+            )
+            failed = workflow.run(run_id="run-1")
+            resumed = workflow.resume("run-1")
+
+        checkpointer.close()
+        assert failed["error"] == "eval_error: network down"
+        assert failed["log"][-1] == "[evaluate] EXCEPTION network down"
+        assert resumed["error"] == ""
+        assert resumed["passed"] is True
+        assert resumed["slide_md"]
+        # News collection and slide writing ran only once
+        assert mock_tavily_client.iter_context.call_count == 1
+        assert sum("Marp Markdown format" in p for p in prompts) == 1
+        assert sum("rigorously score" in p for p in prompts) == 2
+
     def test_workflow_max_attempts_reached(
         self, integration_config, mock_tavily_client, temp_output_dir
     ):
         """Test workflow when max attempts are reached."""
 
         # Mock LLM responses that always fail evaluation
-        failing_responses = [
-            Mock(content="- Item 1\n- Item 2"),  # outline
-            Mock(content='{"toc": ["Section 1"]}'),  # TOC
-            Mock(content="# Basic slides"),  # slides
-            Mock(
-                content='{"score": 5.0, "pass": false, "feedback": "Poor quality"}'
-            ),  # evaluation
-        ]
+        failing_responses = respond_by_prompt(
+            outline=[Mock(content="- Item 1\n- Item 2")],
+            toc=[Mock(content='{"toc": ["Section 1"]}')],
+            slides=[Mock(content="# Basic slides")],
+            evaluate=[
+                Mock(
+                    content='{"score": 5.0, "pass": false, "feedback": "Poor quality"}'
+                )
+            ],
+        )
 
         with patch(
             "security_news_agent.processing.workflow.ChatGoogleGenerativeAI"
         ) as mock_llm_class:
             mock_llm = Mock()
             # Repeat failing responses for multiple attempts
-            mock_llm.invoke.side_effect = failing_responses * 5
+            mock_llm.invoke.side_effect = failing_responses
             mock_llm_class.return_value = mock_llm
 
             workflow = SecurityNewsWorkflow(
@@ -258,12 +371,12 @@ class TestEndToEndWorkflow:
         # Configure for markdown output only
         integration_config.slide_format = ""
 
-        mock_llm_responses = [
-            Mock(content="- Item 1\n- Item 2\n- Item 3"),
-            Mock(content='{"toc": ["Section 1", "Section 2"]}'),
-            Mock(content=MOCK_SLIDE_CONTENT),
-            Mock(content=MOCK_EVALUATION_RESPONSE),
-        ]
+        mock_llm_responses = respond_by_prompt(
+            outline=[Mock(content="- Item 1\n- Item 2\n- Item 3")],
+            toc=[Mock(content='{"toc": ["Section 1", "Section 2"]}')],
+            slides=[Mock(content=MOCK_SLIDE_CONTENT)],
+            evaluate=[Mock(content=MOCK_EVALUATION_RESPONSE)],
+        )
 
         with patch(
             "security_news_agent.processing.workflow.ChatGoogleGenerativeAI"
@@ -340,7 +453,7 @@ class TestEndToEndWorkflow:
             assert "model" in summary
             assert "max_attempts" in summary
             assert "nodes" in summary
-            assert len(summary["nodes"]) == 5
+            assert len(summary["nodes"]) == 6
             assert summary["model"] == integration_config.gemini_model_name
 
     def test_workflow_state_management(
@@ -380,25 +493,26 @@ class TestEndToEndWorkflow:
         # Mock Tavily client that succeeds
         mock_tavily_client = Mock(spec=TavilyClient)
         mock_tavily_client.api_key = "test-key"
-        mock_tavily_client.collect_context.return_value = MOCK_CONTEXT_DATA
-        mock_tavily_client.format_context_as_markdown.return_value = (
-            "### Query: test\n- Article 1"
+        mock_tavily_client.iter_context.return_value = iter(
+            [("test", MOCK_CONTEXT_DATA["latest cybersecurity news"])]
+        )
+        mock_tavily_client.format_query_markdown.return_value = (
+            "### Query: test\n- Article 1\n"
         )
         mock_tavily_client.get_total_results_count.return_value = 1
 
         # Mock LLM that fails on slides generation
-        mock_llm_responses = [
-            Mock(content="- Item 1\n- Item 2"),  # outline succeeds
-            Mock(content='{"toc": ["Section 1"]}'),  # TOC succeeds
-        ]
+        mock_llm_responses = respond_by_prompt(
+            outline=[Mock(content="- Item 1\n- Item 2")],  # outline succeeds
+            toc=[Mock(content='{"toc": ["Section 1"]}')],  # TOC succeeds
+            slides=[Exception("Slides generation failed")],
+        )
 
         with patch(
             "security_news_agent.processing.workflow.ChatGoogleGenerativeAI"
         ) as mock_llm_class:
             mock_llm = Mock()
-            mock_llm.invoke.side_effect = mock_llm_responses + [
-                Exception("Slides generation failed")
-            ]
+            mock_llm.invoke.side_effect = mock_llm_responses
             mock_llm_class.return_value = mock_llm
 
             workflow = SecurityNewsWorkflow(
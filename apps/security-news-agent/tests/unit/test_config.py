@@ -56,6 +56,10 @@ class TestAgentConfig:
         assert config.langchain_tracing_v2 is True
         assert config.langchain_endpoint == "https://api.smith.langchain.com"
         assert config.langchain_project == "security-news-agent"
+        assert config.checkpoint_path == ""
+        assert config.llm_cache_path == ""
+        assert config.search_cache_path == ""
+        assert config.render_cache_path == ""
 
     def test_from_env_missing_google_key(self):
         """Test error when GOOGLE_API_KEY is missing."""
@@ -121,6 +125,39 @@ class TestAgentConfig:
 
         assert "Invalid SLIDE_FORMAT" in str(exc_info.value)
 
+    def test_validate_invalid_format_in_list(self, mock_config):
+        """Test validation error for an unknown format in a list."""
+        mock_config.slide_format = "pdf,docx"
+
+        with pytest.raises(ConfigurationError) as exc_info:
+            mock_config.validate()
+
+        assert "Invalid SLIDE_FORMAT 'pdf,docx'" in str(exc_info.value)
+
+    def test_validate_report_compression(self, mock_config):
+        """Test validation of the report compression method."""
+        mock_config.report_compression = "gzip"
+        mock_config.validate()
+
+        mock_config.report_compression = "bzip2"
+        with pytest.raises(ConfigurationError, match="REPORT_COMPRESSION"):
+            mock_config.validate()
+
+        mock_config.report_compression = "zstd"
+        with patch("importlib.util.find_spec", return_value=None):
+            with pytest.raises(ConfigurationError, match="zstandard"):
+                mock_config.validate()
+
+    def test_get_slide_formats(self, mock_config):
+        """Test parsing of comma-separated slide formats."""
+        mock_config.slide_format = " pdf, HTML ,,png,pdf"
+
+        assert mock_config.get_slide_formats() == ["pdf", "html", "png"]
+        mock_config.validate()
+
+        mock_config.slide_format = ""
+        assert mock_config.get_slide_formats() == []
+
     def test_validate_empty_model_name(self, mock_config):
         """Test validation error for empty model name."""
         mock_config.gemini_model_name = ""
@@ -148,6 +185,102 @@ class TestAgentConfig:
 
         assert "Invalid LANGCHAIN_ENDPOINT" in str(exc_info.value)
 
+    def test_validate_invalid_search_max_workers(self, mock_config):
+        """Test validation error for non-positive search concurrency."""
+        mock_config.search_max_workers = 0
+
+        with pytest.raises(ConfigurationError) as exc_info:
+            mock_config.validate()
+
+        assert "Invalid SEARCH_MAX_WORKERS" in str(exc_info.value)
+
+    def test_validate_invalid_search_pool_size(self, mock_config):
+        """Test validation error for non-positive connection pool size."""
+        mock_config.search_pool_size = 0
+
+        with pytest.raises(ConfigurationError) as exc_info:
+            mock_config.validate()
+
+        assert "Invalid SEARCH_POOL_SIZE" in str(exc_info.value)
+
+    def test_validate_invalid_near_duplicate_distance(self, mock_config):
+        """Test validation error for a negative near-duplicate distance."""
+        mock_config.search_near_duplicate_distance = -1
+
+        with pytest.raises(ConfigurationError) as exc_info:
+            mock_config.validate()
+
+        assert "Invalid SEARCH_NEAR_DUPLICATE_DISTANCE" in str(exc_info.value)
+
+    def test_validate_invalid_context_tokens(self, mock_config):
+        """Test validation error for a negative context token budget."""
+        mock_config.slides_context_tokens = -1
+
+        with pytest.raises(ConfigurationError) as exc_info:
+            mock_config.validate()
+
+        assert "Invalid SLIDES_CONTEXT_TOKENS" in str(exc_info.value)
+
+    def test_validate_invalid_batch_max_workers(self, mock_config):
+        """Test validation error for a batch without workers."""
+        mock_config.batch_max_workers = 0
+
+        with pytest.raises(ConfigurationError) as exc_info:
+            mock_config.validate()
+
+        assert "Invalid BATCH_MAX_WORKERS" in str(exc_info.value)
+
+    def test_search_max_workers_from_env(self):
+        """Test search concurrency parsing from environment."""
+        env_vars = {
+            "GOOGLE_API_KEY": "test-google-key",
+            "LANGCHAIN_API_KEY": "test-langchain-key",
+            "TAVILY_API_KEY": "test-tavily-key",
+        }
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            assert AgentConfig.from_env().search_max_workers == 4
+
+        with patch.dict(
+            os.environ, {**env_vars, "SEARCH_MAX_WORKERS": "8"}, clear=True
+        ):
+            assert AgentConfig.from_env().search_max_workers == 8
+
+        with patch.dict(
+            os.environ, {**env_vars, "SEARCH_MAX_WORKERS": "many"}, clear=True
+        ):
+            with pytest.raises(ConfigurationError) as exc_info:
+                AgentConfig.from_env()
+
+        assert "Invalid SEARCH_MAX_WORKERS" in str(exc_info.value)
+
+    def test_llm_costs_from_env(self):
+        """Test token price parsing and validation."""
+        env_vars = {
+            "GOOGLE_API_KEY": "test-google-key",
+            "LANGCHAIN_API_KEY": "test-langchain-key",
+            "TAVILY_API_KEY": "test-tavily-key",
+        }
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            config = AgentConfig.from_env()
+            assert config.llm_input_cost_per_mtok == 0.0
+            assert config.metrics_path == ""
+
+        with patch.dict(
+            os.environ, {**env_vars, "LLM_INPUT_COST_PER_MTOK": "0.35"}, clear=True
+        ):
+            assert AgentConfig.from_env().llm_input_cost_per_mtok == 0.35
+
+        for value in ("cheap", "-1"):
+            with patch.dict(
+                os.environ,
+                {**env_vars, "LLM_OUTPUT_COST_PER_MTOK": value},
+                clear=True,
+            ):
+                with pytest.raises(ConfigurationError, match="LLM_OUTPUT_COST"):
+                    AgentConfig.from_env()
+
     def test_setup_environment(self, mock_config):
         """Test environment variable setup."""
         with patch.dict(os.environ, {}, clear=True):
@@ -218,6 +351,46 @@ class TestAgentConfig:
                 config.marp_paginate == expected
             ), f"Failed for input '{env_value}'"
 
+    def test_slides_streaming_from_env(self):
+        """Test reading the slide streaming settings."""
+        env_vars = {
+            "GOOGLE_API_KEY": "test-google-key",
+            "LANGCHAIN_API_KEY": "test-langchain-key",
+            "TAVILY_API_KEY": "test-tavily-key",
+            "SLIDES_STREAMING": "true",
+            "SLIDES_PARTIAL_PATH": " slides/partial.md ",
+        }
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            config = AgentConfig.from_env()
+
+        assert config.slides_streaming is True
+        assert config.slides_partial_path == "slides/partial.md"
+
+    def test_marp_server_from_env(self):
+        """Test reading the Marp render server settings."""
+        env_vars = {
+            "GOOGLE_API_KEY": "test-google-key",
+            "LANGCHAIN_API_KEY": "test-langchain-key",
+            "TAVILY_API_KEY": "test-tavily-key",
+        }
+
+        with patch.dict(os.environ, env_vars, clear=True):
+            config = AgentConfig.from_env()
+
+        assert config.marp_server is False
+        assert config.marp_server_workers == 2
+
+        with patch.dict(
+            os.environ,
+            {**env_vars, "MARP_SERVER": "true", "MARP_SERVER_WORKERS": "3"},
+            clear=True,
+        ):
+            config = AgentConfig.from_env()
+
+        assert config.marp_server is True
+        assert config.marp_server_workers == 3
+
     @patch("security_news_agent.config.settings.load_dotenv")
     def test_from_env_with_file(self, mock_load_dotenv):
         """Test loading from a specified .env file."""
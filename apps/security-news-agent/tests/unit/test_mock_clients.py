@@ -1,10 +1,15 @@
 """Unit tests for mock client implementations."""
 
+from unittest.mock import patch
+
+import pytest
+
 from security_news_agent.processing.mock_clients import (
     MOCK_GEMINI_OUTLINE_RESPONSE,
     MOCK_GEMINI_SLIDES_RESPONSE,
     MOCK_TAVILY_SEARCH_RESULTS,
     MockChatGoogleGenerativeAI,
+    MockLLMError,
     MockTavilyClient,
 )
 
@@ -26,6 +31,12 @@ class TestMockTavilyClient:
         assert "test query" in results
         assert results["test query"] == MOCK_TAVILY_SEARCH_RESULTS
 
+    def test_iter_context(self):
+        """Test that iter_context streams the mock data."""
+        client = MockTavilyClient(api_key="mock-key")
+        items = list(client.iter_context([{"q": "test query"}]))
+        assert items == [("test query", MOCK_TAVILY_SEARCH_RESULTS)]
+
     def test_format_context_as_markdown(self):
         """Test that context is formatted correctly."""
         client = MockTavilyClient(api_key="mock-key")
@@ -43,6 +54,38 @@ class TestMockTavilyClient:
         count = client.get_total_results_count(context)
         assert count == len(MOCK_TAVILY_SEARCH_RESULTS)
 
+    def test_synthetic_results_per_query(self):
+        """Test that every query gets its own deterministic results."""
+        queries = [{"q": "ransomware"}, {"q": "zero-day"}]
+        client = MockTavilyClient(
+            api_key="mock-key", results_per_query=3, content_chars=200
+        )
+
+        results = client.collect_context(queries, max_per_query=5)
+        again = MockTavilyClient(
+            api_key="mock-key", results_per_query=3, content_chars=200
+        ).collect_context(queries, max_per_query=5)
+
+        assert list(results) == ["ransomware", "zero-day"]
+        assert all(len(items) == 3 for items in results.values())
+        assert all(len(item["content"]) >= 200 for item in results["ransomware"])
+        assert results == again
+
+    def test_injected_search_latency_and_failures(self):
+        """Test that searches sleep and failed queries are skipped."""
+        client = MockTavilyClient(
+            api_key="mock-key", latency=0.25, failure_rate=1.0, results_per_query=3
+        )
+
+        with patch(
+            "security_news_agent.processing.mock_clients.time.sleep"
+        ) as mock_sleep:
+            results = client.collect_context([{"q": "a"}, {"q": "b"}])
+
+        assert results == {"a": [], "b": []}
+        assert mock_sleep.call_count == 2
+        mock_sleep.assert_called_with(0.25)
+
 
 class TestMockChatGoogleGenerativeAI:
     """Test cases for the MockChatGoogleGenerativeAI."""
@@ -81,3 +124,35 @@ class TestMockChatGoogleGenerativeAI:
         messages = [FakeMessage("this is an outline prompt")]
         response = client.invoke(messages)
         assert response.content == MOCK_GEMINI_OUTLINE_RESPONSE
+
+    def test_slides_padded_to_size(self):
+        """Test that the deck grows to the requested size."""
+        client = MockChatGoogleGenerativeAI(model="mock-model", slides_chars=8000)
+        content = client.invoke("write the slide content").content
+        assert content.startswith(MOCK_GEMINI_SLIDES_RESPONSE)
+        assert 8000 <= len(content) < 8200
+
+    def test_injected_failures_are_deterministic(self):
+        """Test that the same seed fails the same calls."""
+
+        def outcomes(seed):
+            client = MockChatGoogleGenerativeAI(
+                model="mock-model", failure_rate=0.5, seed=seed, verbose=False
+            )
+            failed = []
+            for _ in range(20):
+                try:
+                    client.invoke("please create an outline")
+                    failed.append(False)
+                except MockLLMError:
+                    failed.append(True)
+            return failed
+
+        assert outcomes(1) == outcomes(1)
+        assert any(outcomes(1)) and not all(outcomes(1))
+
+    def test_failure_rate_one_always_fails(self):
+        """Test that a failure rate of 1 fails every call."""
+        client = MockChatGoogleGenerativeAI(model="mock-model", failure_rate=1.0)
+        with pytest.raises(MockLLMError):
+            client.invoke("some prompt")
@@ -1,19 +1,72 @@
 """Unit tests for output rendering functionality."""
 
+import gzip
+import os
 import subprocess
+import sys
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
 
+from security_news_agent.output.archive import compress_file
+from security_news_agent.output.marp_server import (
+    MarpRenderServer,
+    MarpServerError,
+)
+from security_news_agent.output.render_cache import RenderCache
 from security_news_agent.output.renderer import (
     FileOperationError,
     MarpNotFoundError,
     RenderError,
     ReportRenderer,
 )
+from security_news_agent.output.retention import (
+    RetentionPolicy,
+    apply_retention,
+    scan_reports,
+    select_expired,
+)
 from tests.fixtures.mock_data import MOCK_SLIDE_CONTENT
 
+# Stand-in for ``marp --server DIR``: serves DIR on $PORT and answers a
+# "?pdf" request with the deck's text behind a "PDF:" prefix
+FAKE_MARP_SERVER = """\
+import http.server, os, sys
+root = sys.argv[2]
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        try:
+            with open(os.path.join(root, path.lstrip("/")), "rb") as f:
+                body = f.read()
+        except OSError:
+            self.send_error(404)
+            return
+        body = (query.upper() + ":").encode() + body
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+http.server.ThreadingHTTPServer(
+    ("127.0.0.1", int(os.environ["PORT"])), Handler
+).serve_forever()
+"""
+
+
+@pytest.fixture
+def fake_marp(tmp_path):
+    """Executable that behaves like ``marp --server``."""
+    script = tmp_path / "fake_marp.py"
+    script.write_text(FAKE_MARP_SERVER)
+    marp = tmp_path / "marp"
+    marp.write_text(f"#!/bin/sh\nexec {sys.executable} {script} \"$@\"\n")
+    marp.chmod(0o755)
+    return str(marp)
+
 
 class TestReportRenderer:
     """Test cases for ReportRenderer class."""
@@ -128,12 +181,28 @@ class TestReportRenderer:
         renderer = ReportRenderer(mock_config, str(tmp_path))
 
         with patch(
-            "pathlib.Path.write_text", side_effect=IOError("Write failed")
+            "security_news_agent.output.renderer.atomic_write_text",
+            side_effect=IOError("Write failed"),
         ):
             with pytest.raises(FileOperationError) as exc_info:
                 renderer.save_markdown("content", "title")
 
             assert "Write failed" in str(exc_info.value)
+        # The reserved name is released again
+        assert list(tmp_path.iterdir()) == []
+
+    def test_save_markdown_never_overwrites(self, mock_config, tmp_path):
+        """Test that a taken name gets a numeric suffix."""
+        renderer = ReportRenderer(mock_config, str(tmp_path))
+        (tmp_path / "deck-2.md.gz").write_bytes(b"archived")
+
+        first = renderer.save_markdown("first", "Title", "deck.md")
+        second = renderer.save_markdown("second", "Title", "deck.md")
+
+        assert first.name == "deck.md"
+        assert second.name == "deck-3.md"  # deck-2 is taken by its archive
+        assert first.read_text(encoding="utf-8") == "first"
+        assert second.read_text(encoding="utf-8") == "second"
 
     def test_render_with_marp_success(self, mock_config, tmp_path):
         """Test successful Marp rendering."""
@@ -154,6 +223,107 @@ class TestReportRenderer:
                     assert result == pdf_file
                     mock_run.assert_called_once()
 
+    def test_render_with_marp_server(self, mock_config, tmp_path):
+        """Test that renders go through the Marp server when enabled."""
+        mock_config.marp_server = True
+        md_file = tmp_path / "test.md"
+        md_file.write_text("# Test")
+
+        with patch("shutil.which", return_value="/usr/bin/marp"):
+            renderer = ReportRenderer(mock_config, str(tmp_path))
+
+        with patch.object(
+            renderer.marp_server, "render", return_value=tmp_path / "test.pdf"
+        ) as mock_render, patch("subprocess.run") as mock_run:
+            result = renderer.render_with_marp(md_file, "pdf")
+
+        assert result == tmp_path / "test.pdf"
+        mock_render.assert_called_once_with(md_file, "pdf")
+        mock_run.assert_not_called()
+
+    def test_render_with_marp_server_falls_back(self, mock_config, tmp_path):
+        """Test that a failing Marp server falls back to a one-off run."""
+        mock_config.marp_server = True
+        md_file = tmp_path / "test.md"
+        md_file.write_text("# Test")
+
+        with patch("shutil.which", return_value="/usr/bin/marp"):
+            renderer = ReportRenderer(mock_config, str(tmp_path))
+
+        with patch.object(
+            renderer.marp_server,
+            "render",
+            side_effect=MarpServerError("server down"),
+        ), patch("subprocess.run") as mock_run, patch(
+            "pathlib.Path.exists", return_value=True
+        ):
+            mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
+            result = renderer.render_with_marp(md_file, "pdf")
+
+        assert result == tmp_path / "test.pdf"
+        mock_run.assert_called_once()
+
+    def test_render_with_marp_uses_render_cache(self, mock_config, tmp_path):
+        """Test that an unchanged deck is not rendered twice."""
+        cache = RenderCache(str(tmp_path / "cache"))
+        slides = tmp_path / "slides"
+        slides.mkdir()
+        md_file = slides / "deck.md"
+        md_file.write_text("# Deck v1")
+
+        def fake_marp(cmd, **kwargs):
+            # marp DECK --pdf -o OUT
+            Path(cmd[4]).write_text("PDF " + Path(cmd[1]).read_text())
+            return Mock(returncode=0, stdout="", stderr="")
+
+        with patch("shutil.which", return_value="/usr/bin/marp"):
+            renderer = ReportRenderer(mock_config, str(slides), cache)
+
+        with patch("subprocess.run", side_effect=fake_marp) as mock_run:
+            first = renderer.render_with_marp(md_file, "pdf")
+            first.unlink()
+            second = renderer.render_with_marp(md_file, "pdf")
+
+            assert mock_run.call_count == 1
+            assert second.read_text() == "PDF # Deck v1"
+
+            # A changed deck is rendered again without touching the entry
+            # the old output was copied from
+            md_file.write_text("# Deck v2")
+            third = renderer.render_with_marp(md_file, "pdf")
+            assert mock_run.call_count == 2
+            assert third.read_text() == "PDF # Deck v2"
+
+            md_file.write_text("# Deck v1")
+            renderer.render_with_marp(md_file, "pdf")
+            assert mock_run.call_count == 2
+            assert third.read_text() == "PDF # Deck v1"
+
+            # Theme changes invalidate the cached artifact
+            mock_config.marp_theme = "gaia"
+            renderer.render_with_marp(md_file, "pdf")
+            assert mock_run.call_count == 3
+
+        assert cache.stats()["hits"] == 2
+
+    def test_render_cache_hit_without_marp(self, mock_config, tmp_path):
+        """Test that cached decks are served even when Marp is missing."""
+        cache = RenderCache(str(tmp_path / "cache"))
+        md_file = tmp_path / "deck.md"
+        md_file.write_text("# Deck")
+        key = cache.make_key(b"# Deck", "default", True, "pdf")
+        rendered = tmp_path / "rendered.pdf"
+        rendered.write_text("cached pdf")
+        cache.store(key, "pdf", rendered)
+
+        with patch("shutil.which", return_value=None):
+            renderer = ReportRenderer(mock_config, str(tmp_path), cache)
+
+        result = renderer.render_with_marp(md_file, "pdf")
+
+        assert result == tmp_path / "deck.pdf"
+        assert result.read_text() == "cached pdf"
+
     def test_render_with_marp_not_found(self, mock_config, tmp_path):
         """Test Marp rendering when CLI is not available."""
         md_file = tmp_path / "test.md"
@@ -225,6 +395,17 @@ class TestReportRenderer:
         assert result["format"] == ""
         assert Path(result["markdown_path"]).exists()
 
+    def test_save_and_render_with_filename(self, mock_config, tmp_path):
+        """Test save and render with an explicit file name."""
+        mock_config.slide_format = ""
+        renderer = ReportRenderer(mock_config, str(tmp_path))
+
+        result = renderer.save_and_render(
+            MOCK_SLIDE_CONTENT, "Test Report", "cloud-security.md"
+        )
+
+        assert Path(result["markdown_path"]).name == "cloud-security.md"
+
     def test_save_and_render_with_pdf(self, mock_config, tmp_path):
         """Test save and render with PDF output."""
         mock_config.slide_format = "pdf"
@@ -263,6 +444,84 @@ class TestReportRenderer:
                 assert result["rendered_path"] is None
                 assert "Rendering failed" in result["error"]
 
+    def test_save_and_render_multiple_formats(self, mock_config, tmp_path):
+        """Test that several formats are rendered concurrently."""
+        mock_config.slide_format = "pdf,html,png"
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_render(md_path, output_format):
+            barrier.wait()  # Only passes if all three run at once
+            return md_path.with_suffix(f".{output_format}")
+
+        with patch("shutil.which", return_value="/usr/bin/marp"):
+            renderer = ReportRenderer(mock_config, str(tmp_path))
+
+        with patch.object(renderer, "render_with_marp", side_effect=fake_render):
+            result = renderer.save_and_render(
+                MOCK_SLIDE_CONTENT, "Test Report", "deck.md"
+            )
+
+        assert result["error"] is None
+        assert result["rendered_paths"] == {
+            "pdf": str(tmp_path / "deck.pdf"),
+            "html": str(tmp_path / "deck.html"),
+            "png": str(tmp_path / "deck.png"),
+        }
+        assert result["rendered_path"] == str(tmp_path / "deck.pdf")
+        assert set(result["render_seconds"]) == {"pdf", "html", "png"}
+
+    def test_save_and_render_partial_failure(self, mock_config, tmp_path):
+        """Test that one failing format does not stop the others."""
+        mock_config.slide_format = "pdf,html"
+
+        def fake_render(md_path, output_format):
+            if output_format == "pdf":
+                raise RenderError("Chromium crashed")
+            return md_path.with_suffix(f".{output_format}")
+
+        with patch("shutil.which", return_value="/usr/bin/marp"):
+            renderer = ReportRenderer(mock_config, str(tmp_path))
+
+        with patch.object(renderer, "render_with_marp", side_effect=fake_render):
+            result = renderer.save_and_render(
+                MOCK_SLIDE_CONTENT, "Test Report", "deck.md"
+            )
+
+        assert result["success"] is True
+        assert result["rendered_path"] is None
+        assert list(result["rendered_paths"]) == ["html"]
+        assert result["error"] == "pdf: Chromium crashed"
+        assert set(result["render_seconds"]) == {"pdf", "html"}
+
+    def test_save_and_render_compression(self, mock_config, tmp_path):
+        """Test that markdown and HTML are archived after rendering."""
+        mock_config.slide_format = "html,pdf"
+        mock_config.report_compression = "gzip"
+
+        def fake_render(md_path, output_format):
+            output_path = md_path.with_suffix(f".{output_format}")
+            output_path.write_text(f"<{output_format}>")
+            return output_path
+
+        with patch("shutil.which", return_value="/usr/bin/marp"):
+            renderer = ReportRenderer(mock_config, str(tmp_path))
+
+        with patch.object(renderer, "render_with_marp", side_effect=fake_render):
+            result = renderer.save_and_render(
+                MOCK_SLIDE_CONTENT, "Test Report", "deck.md"
+            )
+
+        assert result["markdown_path"] == str(tmp_path / "deck.md.gz")
+        assert result["rendered_path"] == str(tmp_path / "deck.html.gz")
+        assert result["rendered_paths"]["pdf"] == str(tmp_path / "deck.pdf")
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "deck.html.gz",
+            "deck.md.gz",
+            "deck.pdf",
+        ]
+        with gzip.open(tmp_path / "deck.md.gz", "rt", encoding="utf-8") as f:
+            assert f.read() == MOCK_SLIDE_CONTENT
+
     def test_save_and_render_save_failure(self, mock_config, tmp_path):
         """Test save and render when saving fails."""
         renderer = ReportRenderer(mock_config, str(tmp_path))
@@ -282,33 +541,46 @@ class TestReportRenderer:
         """Test cleanup of old files."""
         renderer = ReportRenderer(mock_config, str(tmp_path))
 
-        # Create mock file objects
-        mock_files = []
+        files = []
         for i in range(15):
-            mock_file = Mock(spec=Path)
-            mock_file.name = f"report_{i:02d}.md"
-            # Attach a stat mock to each file mock
-            mock_stat_result = Mock()
-            mock_stat_result.st_mtime = 1000000 - i  # Newest first
-            mock_file.stat.return_value = mock_stat_result
-            mock_files.append(mock_file)
-
-        # The glob should return .md files, and we can ignore other patterns
-        def glob_side_effect(pattern):
-            if pattern == "*.md":
-                return mock_files
-            return []
-
-        with patch.object(Path, "glob", side_effect=glob_side_effect):
-            deleted_count = renderer.cleanup_old_files(keep_count=10)
-            assert deleted_count == 5
-
-        # Verify that unlink was called on the 5 oldest files
+            file_path = tmp_path / f"report_{i:02d}.md"
+            file_path.write_text(f"Content {i}")
+            os.utime(file_path, (1000000 - i, 1000000 - i))  # Newest first
+            files.append(file_path)
+
+        deleted_count = renderer.cleanup_old_files(keep_count=10)
+        assert deleted_count == 5
+
+        # The 5 oldest files are gone, the 10 newest are kept
         for i in range(10, 15):
-            mock_files[i].unlink.assert_called_once()
-        # Verify that unlink was NOT called on the 10 newest files
+            assert not files[i].exists()
         for i in range(10):
-            mock_files[i].unlink.assert_not_called()
+            assert files[i].exists()
+
+    def test_cleanup_old_files_keeps_reports_together(
+        self, mock_config, tmp_path
+    ):
+        """Test that a report's markdown and renders share its fate."""
+        renderer = ReportRenderer(mock_config, str(tmp_path))
+        for i in range(3):
+            for extension in ("md", "pdf", "html"):
+                file_path = tmp_path / f"report_{i}.{extension}"
+                file_path.write_text("x")
+                os.utime(file_path, (1000 + i, 1000 + i))
+        (tmp_path / "notes.txt").write_text("not a report")
+
+        deleted_count = renderer.cleanup_old_files(keep_count=2)
+
+        assert deleted_count == 3
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "notes.txt",
+            "report_1.html",
+            "report_1.md",
+            "report_1.pdf",
+            "report_2.html",
+            "report_2.md",
+            "report_2.pdf",
+        ]
 
     def test_cleanup_old_files_no_directory(self, mock_config, tmp_path):
         """Test cleanup when output directory doesn't exist."""
@@ -418,3 +690,229 @@ class TestReportRenderer:
 
         assert validation["valid"] is True
         assert any("Content is very long" in w for w in validation["warnings"])
+
+
+class TestMarpRenderServer:
+    """Test cases for MarpRenderServer class."""
+
+    def test_render_reuses_one_process(self, fake_marp, tmp_path):
+        """Test that several renders share one server process."""
+        slides = tmp_path / "slides"
+        slides.mkdir()
+        decks = []
+        for name in ("a", "b", "c"):
+            deck = slides / f"{name}.md"
+            deck.write_text(f"# Deck {name}")
+            decks.append(deck)
+
+        server = MarpRenderServer(fake_marp, slides, max_workers=2)
+        try:
+            futures = [server.submit(deck, "pdf") for deck in decks]
+            paths = [future.result(timeout=30) for future in futures]
+            process = server._process
+            html = server.render(decks[0], "html")
+        finally:
+            server.close()
+
+        assert paths == [slides / "a.pdf", slides / "b.pdf", slides / "c.pdf"]
+        assert (slides / "b.pdf").read_text() == "PDF:# Deck b"
+        assert html.read_text() == ":# Deck a"
+        assert server._process is None
+        assert process is not None and process.poll() is not None
+
+    def test_render_outside_root(self, fake_marp, tmp_path):
+        """Test that decks outside the served directory are rejected."""
+        slides = tmp_path / "slides"
+        slides.mkdir()
+        deck = tmp_path / "other.md"
+        deck.write_text("# Other")
+
+        server = MarpRenderServer(fake_marp, slides)
+        try:
+            assert not server.serves(deck)
+            with pytest.raises(MarpServerError, match="outside"):
+                server.render(deck, "pdf")
+            assert not server.running
+        finally:
+            server.close()
+
+    def test_render_missing_deck(self, fake_marp, tmp_path):
+        """Test that a failed request raises MarpServerError."""
+        server = MarpRenderServer(fake_marp, tmp_path)
+        try:
+            with pytest.raises(MarpServerError, match="render failed"):
+                server.render(tmp_path / "missing.md", "pdf")
+        finally:
+            server.close()
+
+    def test_start_failure(self, tmp_path):
+        """Test that a server exiting during start-up is reported."""
+        server = MarpRenderServer("/bin/false", tmp_path, startup_timeout=5)
+        try:
+            with pytest.raises(MarpServerError, match="exited"):
+                server.start()
+        finally:
+            server.close()
+
+
+class TestRenderCache:
+    """Test cases for RenderCache class."""
+
+    def test_make_key_covers_render_inputs(self):
+        """Test that every render input changes the key."""
+        base = RenderCache.make_key(b"# Deck", "default", True, "pdf")
+
+        assert base == RenderCache.make_key(b"# Deck", "default", True, "pdf")
+        assert base != RenderCache.make_key(b"# Deck!", "default", True, "pdf")
+        assert base != RenderCache.make_key(b"# Deck", "gaia", True, "pdf")
+        assert base != RenderCache.make_key(b"# Deck", "default", False, "pdf")
+        assert base != RenderCache.make_key(b"# Deck", "default", True, "png")
+
+    def test_fetch_miss(self, tmp_path):
+        """Test that a miss leaves the destination alone."""
+        cache = RenderCache(str(tmp_path / "cache"))
+
+        assert cache.fetch("ab" * 32, "pdf", tmp_path / "out.pdf") is False
+        assert not (tmp_path / "out.pdf").exists()
+        assert cache.stats()["misses"] == 1
+
+    def test_store_and_fetch(self, tmp_path):
+        """Test that a stored artifact is copied to the requested path."""
+        cache = RenderCache(str(tmp_path / "cache"))
+        rendered = tmp_path / "deck.pdf"
+        rendered.write_bytes(b"%PDF")
+        key = cache.make_key(b"# Deck", "default", True, "pdf")
+
+        cache.store(key, "pdf", rendered)
+        dest = tmp_path / "copy.pdf"
+        assert cache.fetch(key, "pdf", dest) is True
+
+        assert dest.read_bytes() == b"%PDF"
+        assert cache.stats() == {
+            "hits": 1,
+            "misses": 0,
+            "entries": 1,
+            "bytes": 4,
+        }
+
+    def test_hit_leaves_outputs_independent(self, tmp_path):
+        """Test that outputs share no inode or mtime with the cache entry."""
+        cache = RenderCache(str(tmp_path / "cache"))
+        rendered = tmp_path / "deck.pdf"
+        rendered.write_bytes(b"%PDF")
+        key = cache.make_key(b"# Deck", "default", True, "pdf")
+        cache.store(key, "pdf", rendered)
+        os.utime(rendered, (1000, 1000))
+
+        dest = tmp_path / "old.pdf"
+        assert cache.fetch(key, "pdf", dest) is True
+        os.utime(dest, (2000, 2000))
+        assert cache.fetch(key, "pdf", tmp_path / "new.pdf") is True
+
+        # Refreshing the entry on each hit must not age or touch the reports
+        assert rendered.stat().st_mtime == 1000
+        assert dest.stat().st_mtime == 2000
+        assert rendered.stat().st_nlink == 1
+        assert dest.stat().st_nlink == 1
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test that the oldest artifacts are evicted over the limit."""
+        cache = RenderCache(str(tmp_path / "cache"), max_bytes=12)
+        keys = []
+        for index in range(3):
+            rendered = tmp_path / f"deck{index}.pdf"
+            rendered.write_bytes(b"x" * 4)
+            key = cache.make_key(str(index).encode(), "default", True, "pdf")
+            keys.append(key)
+            cache.store(key, "pdf", rendered)
+            entry = cache._entry(key, "pdf")
+            os.utime(entry, (index, index))
+
+        assert cache.fetch(keys[0], "pdf", tmp_path / "hit.pdf") is True
+        rendered = tmp_path / "deck3.pdf"
+        rendered.write_bytes(b"x" * 4)
+        cache.store(cache.make_key(b"3", "default", True, "pdf"), "pdf", rendered)
+
+        # deck0 was just used, so deck1 is the least recently used
+        assert cache.fetch(keys[0], "pdf", tmp_path / "a.pdf") is True
+        assert cache.fetch(keys[1], "pdf", tmp_path / "b.pdf") is False
+        assert cache.stats()["bytes"] <= 12
+
+
+class TestRetention:
+    """Test cases for the report retention engine."""
+
+    @staticmethod
+    def make_reports(directory, sizes):
+        """Create one .md/.pdf report per size, newest first."""
+        for index, size in enumerate(sizes):
+            for extension in (".md", ".pdf"):
+                path = directory / f"report_{index}{extension}"
+                path.write_bytes(b"x" * size)
+                os.utime(path, (10000 - index * 100, 10000 - index * 100))
+
+    def test_scan_reports_groups_by_stem(self, tmp_path):
+        """Test that artifacts are grouped by stem in one pass."""
+        self.make_reports(tmp_path, [3, 5])
+        (tmp_path / "report_0.md.tmp").write_text("partial")
+
+        with patch("os.scandir", wraps=os.scandir) as mock_scandir:
+            reports = scan_reports(str(tmp_path))
+
+        mock_scandir.assert_called_once()
+        assert [r.stem for r in reports] == ["report_0", "report_1"]
+        assert [r.size for r in reports] == [6, 10]
+        assert len(reports[0].files) == 2
+
+    def test_scan_reports_includes_compressed(self, tmp_path):
+        """Test that compressed artifacts belong to their report."""
+        self.make_reports(tmp_path, [3])
+        compress_file(tmp_path / "report_0.md", "gzip")
+
+        reports = scan_reports(str(tmp_path))
+
+        assert [r.stem for r in reports] == ["report_0"]
+        assert sorted(os.path.basename(p) for p, _ in reports[0].files) == [
+            "report_0.md.gz",
+            "report_0.pdf",
+        ]
+
+    def test_max_age(self, tmp_path):
+        """Test that reports older than the limit are selected."""
+        self.make_reports(tmp_path, [1, 1, 1])
+        reports = scan_reports(str(tmp_path))
+        policy = RetentionPolicy(max_age_days=150 / 86400)
+
+        expired = select_expired(reports, policy, now=10000 + 60)
+
+        assert [r.stem for r in expired] == ["report_1", "report_2"]
+
+    def test_max_total_bytes(self, tmp_path):
+        """Test that the newest reports fitting the size budget are kept."""
+        self.make_reports(tmp_path, [50, 30, 20])
+        reports = scan_reports(str(tmp_path))
+
+        expired = select_expired(reports, RetentionPolicy(max_total_bytes=170))
+        assert [r.stem for r in expired] == ["report_2"]
+
+        # The newest report is kept even if it alone is over the budget
+        expired = select_expired(reports, RetentionPolicy(max_total_bytes=10))
+        assert [r.stem for r in expired] == ["report_1", "report_2"]
+
+    def test_apply_retention(self, tmp_path):
+        """Test deleting the files of expired reports."""
+        self.make_reports(tmp_path, [4, 4, 4])
+
+        deleted, freed = apply_retention(str(tmp_path), RetentionPolicy(keep=1))
+
+        assert (deleted, freed) == (4, 16)
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "report_0.md",
+            "report_0.pdf",
+        ]
+
+    def test_no_limits_keeps_everything(self, tmp_path):
+        """Test that an empty policy deletes nothing."""
+        self.make_reports(tmp_path, [1, 1])
+
+        assert apply_retention(str(tmp_path), RetentionPolicy()) == (0, 0)
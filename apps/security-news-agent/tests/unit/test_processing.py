@@ -1,10 +1,26 @@
 """Unit tests for processing modules."""
 
+import os
+import threading
+import time
 from unittest.mock import Mock, patch
 
+import pytest
+
+from security_news_agent.processing.checkpoint import SQLiteCheckpointer
+from security_news_agent.processing.llm_cache import LLMResponseCache
 from security_news_agent.processing.nodes import WorkflowNodes
+from security_news_agent.processing.sources import SourceStore
+from security_news_agent.processing.state import (
+    append_log,
+    keep_error,
+    state_nbytes,
+)
 from security_news_agent.processing.workflow import SecurityNewsWorkflow
-from security_news_agent.search.tavily_client import TavilyError
+from security_news_agent.search.cache import SearchCache
+from security_news_agent.search.tavily_client import TavilyClient, TavilyError
+from security_news_agent.utils.error_handling import ProcessingError
+from security_news_agent.utils.metrics import RunMetrics
 from tests.fixtures.mock_data import (
     MOCK_CONTEXT_DATA,
     MOCK_EVALUATION_RESPONSE,
@@ -14,41 +30,130 @@ from tests.fixtures.mock_data import (
 )
 
 
+def _with_context(state, context_md, sources=None):
+    """Store news for a state; returns the store the nodes should read."""
+    store = SourceStore(render=lambda _: context_md)
+    state["sources_id"] = store.put(
+        sources if sources is not None else {"test": []}
+    )
+    return store
+
+
 class TestWorkflowNodes:
     """Test cases for WorkflowNodes class."""
 
     def test_collect_info_success(self, mock_initial_state, mock_config):
         """Test successful news collection."""
         mock_tavily = Mock()
-        mock_tavily.collect_context.return_value = MOCK_CONTEXT_DATA
-        mock_tavily.format_context_as_markdown.return_value = (
-            "### Query: test\n- Article 1"
+        mock_tavily.iter_context.return_value = iter(MOCK_CONTEXT_DATA.items())
+        mock_tavily.format_query_markdown.side_effect = (
+            lambda query, items: f"### Query: {query}\n- Article\n"
         )
         mock_tavily.get_total_results_count.return_value = 3
+        store = SourceStore(render=mock_tavily.format_context_as_markdown)
 
         result = WorkflowNodes.collect_info(
-            mock_initial_state, mock_tavily, mock_config
+            mock_initial_state, mock_tavily, mock_config, store
         )
 
-        assert "sources" in result
-        assert "context_md" in result
         assert "log" in result
         assert "error" not in result
-        mock_tavily.collect_context.assert_called_once()
+        source_set = store.get(result["sources_id"])
+        assert source_set.sources == MOCK_CONTEXT_DATA
+        # Built section by section while collecting
+        assert source_set.context_md.count("### Query:") == len(MOCK_CONTEXT_DATA)
+        mock_tavily.format_context_as_markdown.assert_not_called()
+        mock_tavily.iter_context.assert_called_once()
+
+    def test_collect_info_logs_cache_stats(
+        self, mock_initial_state, mock_config, tmp_path
+    ):
+        """Test that cache hits and misses appear in the collect_info log."""
+        cache = SearchCache(str(tmp_path / "cache.sqlite3"))
+        cache.hits, cache.misses = 4, 1
+
+        def fake_iter(*args, **kwargs):
+            cache.hits += 3
+            cache.misses += 2
+            yield from MOCK_CONTEXT_DATA.items()
+
+        mock_tavily = Mock()
+        mock_tavily.cache = cache
+        mock_tavily.iter_context.side_effect = fake_iter
+        mock_tavily.format_query_markdown.return_value = "### Query: test\n"
+        mock_tavily.get_total_results_count.return_value = 3
+
+        result = WorkflowNodes.collect_info(
+            mock_initial_state,
+            mock_tavily,
+            mock_config,
+            SourceStore(render=mock_tavily.format_context_as_markdown),
+        )
+
+        assert "Cache: 3 hits, 2 misses." in result["log"][-1]
+
+    def test_collect_info_renders_late_links(self, mock_initial_state, mock_config):
+        """Test that sections gaining links from later queries are redone."""
+        story = {
+            "title": "Story",
+            "url": "https://a.com/x",
+            "content": "",
+            "sources": ["https://a.com/x"],
+        }
+
+        def fake_iter(*args, late_links, **kwargs):
+            yield "query1", [story]
+            yield "query2", []
+            late_links["https://a.com/x"] = ["https://b.com/x"]
+
+        client = TavilyClient("test-key")
+        with patch.object(client, "iter_context", side_effect=fake_iter):
+            store = SourceStore(render=client.format_context_as_markdown)
+            result = WorkflowNodes.collect_info(
+                mock_initial_state, client, mock_config, store
+            )
+
+        source_set = store.get(result["sources_id"])
+        assert story["sources"] == ["https://a.com/x"]
+        assert source_set.sources["query1"][0]["sources"] == [
+            "https://a.com/x",
+            "https://b.com/x",
+        ]
+        assert source_set.context_md == client.format_context_as_markdown(
+            source_set.sources
+        )
+        assert "[source](https://b.com/x)" in source_set.context_md
 
     def test_collect_info_tavily_error(self, mock_initial_state, mock_config):
         """Test handling of Tavily API errors."""
         mock_tavily = Mock()
-        mock_tavily.collect_context.side_effect = TavilyError("API Error")
+        mock_tavily.iter_context.side_effect = TavilyError("API Error")
 
         result = WorkflowNodes.collect_info(
-            mock_initial_state, mock_tavily, mock_config
+            mock_initial_state,
+            mock_tavily,
+            mock_config,
+            SourceStore(render=mock_tavily.format_context_as_markdown),
         )
 
         assert "error" in result
         assert "tavily_error" in result["error"]
         assert "log" in result
 
+    def test_collect_info_reuses_shared_results(
+        self, mock_initial_state, mock_config
+    ):
+        """Test that prefilled sources skip the search."""
+        mock_tavily = Mock()
+        state = dict(mock_initial_state)
+        store = _with_context(state, "### Query: test\n", MOCK_CONTEXT_DATA)
+
+        result = WorkflowNodes.collect_info(state, mock_tavily, mock_config, store)
+
+        assert "sources_id" not in result
+        assert "reused shared results" in result["log"][-1]
+        mock_tavily.iter_context.assert_not_called()
+
     def test_make_outline_success(self, mock_initial_state):
         """Test successful outline generation."""
         mock_llm = Mock()
@@ -57,15 +162,48 @@ class TestWorkflowNodes:
         mock_llm.invoke.return_value = mock_response
 
         state = mock_initial_state.copy()
-        state["context_md"] = "### Query: test\n- Security news article"
+        store = _with_context(state, "### Query: test\n- Security news article")
 
-        result = WorkflowNodes.make_outline(state, mock_llm)
+        result = WorkflowNodes.make_outline(state, mock_llm, source_store=store)
 
         assert "outline" in result
         assert len(result["outline"]) > 0
         assert "log" in result
         assert "error" not in result
 
+    def test_make_outline_packs_context_to_budget(self, mock_initial_state):
+        """Test that the outline prompt only carries the top-ranked results."""
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content=MOCK_OUTLINE_RESPONSE)
+
+        filler = "word " * 200
+        state = mock_initial_state.copy()
+        sources = {
+            "test": [
+                {
+                    "title": "Minor story",
+                    "url": "https://example.com/minor",
+                    "content": filler,
+                    "score": 0.1,
+                },
+                {
+                    "title": "Major story",
+                    "url": "https://example.com/major",
+                    "content": filler,
+                    "score": 0.9,
+                },
+            ]
+        }
+        store = _with_context(state, "### Query: test\n- placeholder\n", sources)
+
+        WorkflowNodes.make_outline(
+            state, mock_llm, context_tokens=300, source_store=store
+        )
+
+        prompt = mock_llm.invoke.call_args[0][0]
+        assert "Major story" in prompt
+        assert "Minor story" not in prompt
+
     def test_make_outline_no_context(self, mock_initial_state):
         """Test outline generation with no context."""
         mock_llm = Mock()
@@ -82,9 +220,9 @@ class TestWorkflowNodes:
         mock_llm.invoke.side_effect = Exception("LLM Error")
 
         state = mock_initial_state.copy()
-        state["context_md"] = "### Query: test\n- Security news article"
+        store = _with_context(state, "### Query: test\n- Security news article")
 
-        result = WorkflowNodes.make_outline(state, mock_llm)
+        result = WorkflowNodes.make_outline(state, mock_llm, source_store=store)
 
         assert "error" in result
         assert "outline_error" in result["error"]
@@ -106,6 +244,37 @@ class TestWorkflowNodes:
         assert "error" in result  # Should be empty string
         assert result["error"] == ""
 
+    def test_make_toc_records_metrics(self, mock_initial_state):
+        """Test that the LLM call is recorded with the provider's usage."""
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(
+            content=MOCK_TOC_RESPONSE,
+            usage_metadata={"input_tokens": 120, "output_tokens": 30},
+        )
+        state = mock_initial_state.copy()
+        state["outline"] = ["Item 1", "Item 2", "Item 3"]
+        metrics = RunMetrics()
+
+        WorkflowNodes.make_toc(state, mock_llm, metrics=metrics)
+
+        stats = metrics.report()["nodes"]["make_toc"]
+        assert stats["llm_calls"] == 1
+        assert stats["prompt_tokens"] == 120
+        assert stats["completion_tokens"] == 30
+
+    def test_node_returns_only_new_log_entries(self, mock_initial_state):
+        """Test that a node does not copy the existing log into its output."""
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content=MOCK_TOC_RESPONSE)
+        state = mock_initial_state.copy()
+        state["outline"] = ["Item 1", "Item 2"]
+        state["log"] = ["[collect_info] earlier", "[outline] earlier"]
+
+        result = WorkflowNodes.make_toc(state, mock_llm)
+
+        assert len(result["log"]) == 1
+        assert result["log"][0].startswith("[toc]")
+
     def test_make_toc_no_outline(self, mock_initial_state):
         """Test TOC generation with no outline."""
         mock_llm = Mock()
@@ -165,14 +334,14 @@ class TestWorkflowNodes:
         mock_llm.invoke.return_value = mock_response
 
         state = mock_initial_state.copy()
-        state["context_md"] = "### Query: test\n- Security news article"
+        store = _with_context(state, "### Query: test\n- Security news article")
 
         with patch(
             "security_news_agent.processing.nodes.today_iso"
         ) as mock_today:
             mock_today.return_value = "2025-09-14"
 
-            result = WorkflowNodes.write_slides(state, mock_llm)
+            result = WorkflowNodes.write_slides(state, mock_llm, source_store=store)
 
             assert "slide_md" in result
             assert "title" in result
@@ -180,6 +349,34 @@ class TestWorkflowNodes:
             assert "error" in result
             assert result["error"] == ""
 
+    def test_write_slides_streaming(self, mock_initial_state, tmp_path):
+        """Test that streamed slides match the non-streaming output."""
+        chunks = [
+            MOCK_SLIDE_CONTENT[i:i + 7]
+            for i in range(0, len(MOCK_SLIDE_CONTENT), 7)
+        ]
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(content=MOCK_SLIDE_CONTENT)
+        mock_llm.stream.return_value = iter(Mock(content=c) for c in chunks)
+        partial = tmp_path / "partial" / "deck.md"
+
+        state = mock_initial_state.copy()
+        store = _with_context(state, "### Query: test\n- Security news article")
+
+        expected = WorkflowNodes.write_slides(state, mock_llm, source_store=store)
+        result = WorkflowNodes.write_slides(
+            state,
+            mock_llm,
+            stream=True,
+            partial_path=str(partial),
+            source_store=store,
+        )
+
+        assert result["error"] == ""
+        assert result["slide_md"] == expected["slide_md"]
+        assert partial.read_text(encoding="utf-8") == result["slide_md"]
+        mock_llm.invoke.assert_called_once()
+
     def test_write_slides_no_context(self, mock_initial_state):
         """Test slide generation with no context."""
         mock_llm = Mock()
@@ -279,6 +476,87 @@ class TestWorkflowNodes:
 
         assert result == "retry"
 
+    def test_route_after_eval_error_ends_run(self, mock_initial_state):
+        """Test that an error ends the run instead of retrying."""
+        state = mock_initial_state.copy()
+        state["attempts"] = 0
+        state["error"] = "eval_error: network down"
+
+        assert WorkflowNodes.route_after_eval(state) == "ok"
+
+    def test_route_after_eval_repair(self, mock_initial_state):
+        """Test routing to repair when slides were flagged."""
+        state = mock_initial_state.copy()
+        state["attempts"] = 1
+        state["passed"] = False
+        state["slide_md"] = "---\nmarp: true\n---\n# Title"
+        state["flagged_slides"] = [{"slide": 1, "issue": "vague"}]
+
+        assert WorkflowNodes.route_after_eval(state, repair=True) == "repair"
+        assert WorkflowNodes.route_after_eval(state, repair=False) == "retry"
+
+        state["flagged_slides"] = []
+        assert WorkflowNodes.route_after_eval(state, repair=True) == "retry"
+
+    def test_parse_flagged_slides(self):
+        """Test that flagged slides are validated, deduplicated and sorted."""
+        raw = [
+            {"slide": "3", "issue": " too long "},
+            {"slide": 1, "issue": "no sources"},
+            {"slide": 3, "issue": "duplicate"},
+            {"slide": 9, "issue": "out of range"},
+            {"issue": "missing number"},
+            "not a dict",
+        ]
+
+        result = WorkflowNodes._parse_flagged_slides(raw, slide_count=4)
+
+        assert result == [
+            {"slide": 1, "issue": "no sources"},
+            {"slide": 3, "issue": "too long"},
+        ]
+        assert WorkflowNodes._parse_flagged_slides("bad", slide_count=4) == []
+
+    def test_repair_slides_rewrites_only_flagged(self, mock_initial_state):
+        """Test that only the flagged slide is rewritten and spliced back."""
+        state = mock_initial_state.copy()
+        state["slide_md"] = (
+            "---\nmarp: true\n---\n\n# Title\n\n---\n\n"
+            "## Bad slide\n\n---\n\n## Good slide\n"
+        )
+        state["flagged_slides"] = [{"slide": 2, "issue": "vague"}]
+        store = _with_context(state, "### Query: test\n", MOCK_CONTEXT_DATA)
+
+        mock_llm = Mock()
+        mock_llm.invoke.return_value = Mock(
+            content="```markdown\n## Fixed slide\n---\n```"
+        )
+
+        result = WorkflowNodes.repair_slides(state, mock_llm, source_store=store)
+
+        assert mock_llm.invoke.call_count == 1
+        assert "## Bad slide" in mock_llm.invoke.call_args[0][0]
+        assert result["slide_md"] == (
+            "---\nmarp: true\n---\n\n# Title\n\n---\n\n"
+            "## Fixed slide\n\n---\n\n## Good slide\n"
+        )
+        assert result["flagged_slides"] == []
+        assert "[repair] rewrote 1/1 slides" in result["log"][-1]
+
+    def test_repair_slides_keeps_slide_on_failure(self, mock_initial_state):
+        """Test that a failed rewrite leaves the deck unchanged."""
+        state = mock_initial_state.copy()
+        state["slide_md"] = "---\nmarp: true\n---\n\n# Title\n"
+        state["flagged_slides"] = [{"slide": 1, "issue": "vague"}]
+
+        mock_llm = Mock()
+        mock_llm.invoke.side_effect = Exception("API Error")
+
+        result = WorkflowNodes.repair_slides(state, mock_llm)
+
+        assert result["slide_md"] == state["slide_md"]
+        assert "rewrote 0/1 slides" in result["log"][-1]
+
 
 class TestSecurityNewsWorkflow:
     """Test cases for SecurityNewsWorkflow class."""
@@ -298,6 +576,19 @@ class TestSecurityNewsWorkflow:
             assert workflow.graph is not None
             mock_llm_class.assert_called_once()
 
+    def test_init_keeps_empty_source_store(self, mock_config, tmp_path):
+        """Test that a given store is used even before it holds anything."""
+        store = SourceStore(render=str, directory=str(tmp_path))
+
+        with patch(
+            "security_news_agent.processing.workflow.ChatGoogleGenerativeAI"
+        ):
+            workflow = SecurityNewsWorkflow(
+                mock_config, Mock(), source_store=store
+            )
+
+        assert workflow.source_store is store
+
     def test_create_initial_state(self, mock_config):
         """Test initial state creation."""
         mock_tavily = Mock()
@@ -355,6 +646,57 @@ class TestSecurityNewsWorkflow:
 
             assert config["run_name"] == "custom-run"
 
+    def test_run_batch_collects_once(self, mock_config):
+        """Test that a batch shares one news collection between topics."""
+        mock_tavily = Mock()
+        mock_tavily.iter_context.return_value = iter(MOCK_CONTEXT_DATA.items())
+        mock_tavily.format_query_markdown.side_effect = (
+            lambda query, items: f"### Query: {query}\n"
+        )
+        mock_tavily.get_total_results_count.return_value = 3
+
+        with patch(
+            "security_news_agent.processing.workflow.ChatGoogleGenerativeAI"
+        ):
+            workflow = SecurityNewsWorkflow(mock_config, mock_tavily)
+
+        seen = []
+
+        def fake_run(state):
+            seen.append(state)
+            return {"topic": state["topic"], "error": ""}
+
+        with patch.object(workflow, "run", side_effect=fake_run):
+            results = workflow.run_batch(["Alpha", "Beta", "Gamma"], 2)
+
+        assert [r["topic"] for r in results] == ["Alpha", "Beta", "Gamma"]
+        mock_tavily.iter_context.assert_called_once()
+        assert len(seen) == 3
+        sources_ids = {state["sources_id"] for state in seen}
+        assert len(sources_ids) == 1
+        shared = workflow.source_store.get(sources_ids.pop())
+        assert shared.sources == MOCK_CONTEXT_DATA
+        assert shared.context_md == "\n".join(
+            f"### Query: {query}\n" for query in MOCK_CONTEXT_DATA
+        )
+
+    def test_run_batch_collection_error(self, mock_config):
+        """Test that a failed shared collection fails every topic."""
+        mock_tavily = Mock()
+        mock_tavily.iter_context.side_effect = TavilyError("API Error")
+
+        with patch(
+            "security_news_agent.processing.workflow.ChatGoogleGenerativeAI"
+        ):
+            workflow = SecurityNewsWorkflow(mock_config, mock_tavily)
+
+        with patch.object(workflow, "run") as mock_run:
+            results = workflow.run_batch(["Alpha", "Beta"])
+
+        mock_run.assert_not_called()
+        assert [r["topic"] for r in results] == ["Alpha", "Beta"]
+        assert all("tavily_error" in r["error"] for r in results)
+
     def test_validate_prerequisites_success(self, mock_config):
         """Test successful prerequisites validation."""
         mock_tavily = Mock()
@@ -412,7 +754,81 @@ class TestSecurityNewsWorkflow:
             assert "model" in summary
             assert "max_attempts" in summary
             assert "nodes" in summary
-            assert len(summary["nodes"]) == 5
+            assert len(summary["nodes"]) == 6
+
+    def test_slides_run_in_parallel_with_outline(self, mock_config):
+        """Test that write_slides does not wait for the outline branch."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def invoke(prompt):
+            if "presentation outline" in prompt:
+                barrier.wait()  # Only passes if slides are generated meanwhile
+                return Mock(content=MOCK_OUTLINE_RESPONSE)
+            if "Marp Markdown format" in prompt:
+                barrier.wait()
+                return Mock(content=MOCK_SLIDE_CONTENT)
+            if "table of contents" in prompt:
+                return Mock(content=MOCK_TOC_RESPONSE)
+            return Mock(content=MOCK_EVALUATION_RESPONSE)
+
+        mock_tavily = Mock()
+        mock_tavily.iter_context.return_value = iter(MOCK_CONTEXT_DATA.items())
+        mock_tavily.format_query_markdown.return_value = "### Query: q\n- A\n"
+        mock_tavily.get_total_results_count.return_value = 3
+        mock_llm = Mock()
+        mock_llm.invoke.side_effect = invoke
+        mock_config.slides_context_tokens = 0
+
+        workflow = SecurityNewsWorkflow(mock_config, mock_tavily, llm_client=mock_llm)
+        result = workflow.run()
+
+        assert result["error"] == ""
+        assert result["passed"] is True
+        assert result["toc"]
+        assert any(line.startswith("[outline]") for line in result["log"])
+        assert any(line.startswith("[slides]") for line in result["log"])
+        assert any(line.startswith("[toc]") for line in result["log"])
+        assert mock_llm.invoke.call_count == 4
+
+    def test_run_records_node_metrics(self, mock_config):
+        """Test that every node of a run is timed and its LLM calls counted."""
+        mock_tavily = Mock()
+        mock_tavily.iter_context.return_value = iter(MOCK_CONTEXT_DATA.items())
+        mock_tavily.format_query_markdown.return_value = "### Query: q\n- A\n"
+        mock_tavily.get_total_results_count.return_value = 3
+        responses = {
+            "presentation outline": MOCK_OUTLINE_RESPONSE,
+            "Marp Markdown format": MOCK_SLIDE_CONTENT,
+            "table of contents": MOCK_TOC_RESPONSE,
+        }
+
+        def invoke(prompt):
+            for marker, content in responses.items():
+                if marker in prompt:
+                    return Mock(content=content)
+            return Mock(content=MOCK_EVALUATION_RESPONSE)
+
+        mock_llm = Mock()
+        mock_llm.invoke.side_effect = invoke
+        metrics = RunMetrics()
+
+        workflow = SecurityNewsWorkflow(
+            mock_config, mock_tavily, llm_client=mock_llm, metrics=metrics
+        )
+        workflow.run()
+
+        nodes = metrics.report()["nodes"]
+        assert set(nodes) == {
+            "collect_info",
+            "make_outline",
+            "make_toc",
+            "write_slides",
+            "evaluate_slides",
+        }
+        assert all(stats["runs"] == 1 for stats in nodes.values())
+        assert nodes["collect_info"]["llm_calls"] == 0
+        assert nodes["write_slides"]["llm_calls"] == 1
+        assert metrics.report()["totals"]["llm_calls"] == 4
 
     @patch("security_news_agent.processing.workflow.StateGraph")
     def test_run_success(self, mock_state_graph, mock_config):
@@ -477,3 +893,291 @@ class TestSecurityNewsWorkflow:
 
             assert "error" in result
             assert "workflow_execution_error" in result["error"]
+
+
+class TestStateReducers:
+    """Test cases for the state channel reducers."""
+
+    def test_append_log(self):
+        """Test that new entries are appended without touching the log."""
+        log = ["a"]
+        updated = append_log(log, ["b"])
+
+        assert updated == ["a", "b"]
+        assert log == ["a"]
+        assert append_log(log, []) is log
+
+    def test_append_log_parallel_updates(self):
+        """Test that parallel branches keep each other's entries."""
+        log = append_log(["a"], ["outline"])
+        log = append_log(log, ["slides"])
+
+        assert log == ["a", "outline", "slides"]
+
+    def test_keep_error(self):
+        """Test that an empty error does not clear a sibling's failure."""
+        assert keep_error("", "boom") == "boom"
+        assert keep_error("boom", "") == "boom"
+        assert keep_error("", "") == ""
+
+    def test_state_nbytes_ignores_memory_report(self):
+        """Test that the memory report does not count towards the state."""
+        state = {"slide_md": "x" * 10_000, "log": ["a"]}
+        size = state_nbytes(state)
+
+        assert size > 10_000
+        assert state_nbytes({**state, "memory": [{"node": "n"}] * 50}) == size
+
+
+class TestSourceStore:
+    """Test cases for the shared source store."""
+
+    def test_put_interns_equal_collections(self):
+        """Test that equal results are stored once under one id."""
+        store = SourceStore(render=lambda sources: "md")
+
+        first = store.put(MOCK_CONTEXT_DATA)
+        second = store.put({k: list(v) for k, v in MOCK_CONTEXT_DATA.items()})
+
+        assert first == second
+        assert len(store) == 1
+        assert store.get(first).sources is MOCK_CONTEXT_DATA
+        assert store.get("unknown") is None
+
+    def test_context_rendered_once(self):
+        """Test that the context is rendered lazily and then reused."""
+        render = Mock(return_value="### Query: test\n")
+        store = SourceStore(render=render)
+        source_set = store.get(store.put(MOCK_CONTEXT_DATA))
+
+        render.assert_not_called()
+        assert source_set.context_md == "### Query: test\n"
+        assert source_set.context_md == "### Query: test\n"
+        render.assert_called_once_with(MOCK_CONTEXT_DATA)
+
+    def test_evicts_least_recently_used(self):
+        """Test that only max_entries collections stay in memory."""
+        store = SourceStore(render=str, max_entries=2)
+        a = store.put({"a": []})
+        b = store.put({"b": []})
+        store.get(a)
+        store.put({"c": []})
+
+        assert len(store) == 2
+        assert store.get(a) is not None
+        assert store.get(b) is None
+
+    def test_reloads_from_directory(self, tmp_path):
+        """Test that a new store finds collections saved by another."""
+        source_id = SourceStore(render=str, directory=str(tmp_path)).put(
+            MOCK_CONTEXT_DATA
+        )
+
+        reloaded = SourceStore(render=lambda sources: "md", directory=str(tmp_path))
+
+        assert reloaded.get(source_id).sources == MOCK_CONTEXT_DATA
+        assert reloaded.get(source_id).context_md == "md"
+
+    def test_prunes_old_collections(self, tmp_path):
+        """Test that saved collections older than max_age_days are deleted."""
+        store = SourceStore(render=str, directory=str(tmp_path))
+        source_id = store.put(MOCK_CONTEXT_DATA)
+        old = time.time() - 10 * 86400
+        for path in tmp_path.glob("*.json.gz"):
+            os.utime(path, (old, old))
+
+        SourceStore(render=str, directory=str(tmp_path), max_age_days=7)
+
+        assert list(tmp_path.glob("*.json.gz")) == []
+        assert SourceStore(render=str, directory=str(tmp_path)).get(source_id) is None
+
+
+class TestSQLiteCheckpointer:
+    """Test cases for the SQLite workflow checkpointer."""
+
+    @staticmethod
+    def _checkpoint(checkpoint_id, topic):
+        return {
+            "v": 1,
+            "id": checkpoint_id,
+            "ts": "2025-09-14T00:00:00+00:00",
+            "channel_values": {"topic": topic},
+            "channel_versions": {"topic": 1},
+            "versions_seen": {},
+            "pending_sends": [],
+        }
+
+    def _put(self, saver, thread_id, checkpoint_id, parent_id=None):
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        if parent_id:
+            config["configurable"]["checkpoint_id"] = parent_id
+        return saver.put(
+            config,
+            self._checkpoint(checkpoint_id, f"topic {checkpoint_id}"),
+            {"step": int(checkpoint_id[-1])},
+            {"topic": 1},
+        )
+
+    def test_put_and_get_latest(self, tmp_path):
+        """Test that checkpoints survive reopening the database."""
+        path = str(tmp_path / "runs.sqlite3")
+        saver = SQLiteCheckpointer(path)
+        self._put(saver, "run", "cp-1")
+        config = self._put(saver, "run", "cp-2", parent_id="cp-1")
+        saver.put_writes(config, [("topic", "pending")], task_id="task")
+        saver.close()
+
+        saver = SQLiteCheckpointer(path)
+        latest = saver.get_tuple({"configurable": {"thread_id": "run"}})
+
+        assert latest.checkpoint["channel_values"] == {"topic": "topic cp-2"}
+        assert latest.metadata["step"] == 2
+        assert latest.parent_config["configurable"]["checkpoint_id"] == "cp-1"
+        assert latest.pending_writes == [("task", "topic", "pending")]
+        assert saver.get_tuple({"configurable": {"thread_id": "other"}}) is None
+
+    def test_list_newest_first(self, tmp_path):
+        """Test listing a run's checkpoints with filters."""
+        saver = SQLiteCheckpointer(str(tmp_path / "runs.sqlite3"))
+        for index in range(1, 4):
+            self._put(saver, "run", f"cp-{index}")
+        config = {"configurable": {"thread_id": "run"}}
+
+        def ids(**kwargs):
+            return [
+                item.config["configurable"]["checkpoint_id"]
+                for item in saver.list(config, **kwargs)
+            ]
+
+        assert ids() == ["cp-3", "cp-2", "cp-1"]
+        assert ids(limit=2) == ["cp-3", "cp-2"]
+        assert ids(filter={"step": 1}) == ["cp-1"]
+        before = {"configurable": {"checkpoint_id": "cp-3"}}
+        assert ids(before=before) == ["cp-2", "cp-1"]
+
+    def test_prune_old_runs(self, tmp_path):
+        """Test that runs past the age limit are deleted."""
+        saver = SQLiteCheckpointer(str(tmp_path / "runs.sqlite3"))
+        with patch("security_news_agent.processing.checkpoint.time.time") as now:
+            now.return_value = 1000.0
+            self._put(saver, "old", "cp-1")
+            now.return_value = 5000.0
+            self._put(saver, "new", "cp-1")
+
+        assert saver.prune(before=2000.0) == 1
+        assert saver.get_tuple({"configurable": {"thread_id": "old"}}) is None
+        assert saver.get_tuple({"configurable": {"thread_id": "new"}})
+
+    def test_resume_requires_checkpointer(self, mock_config):
+        """Test that resuming without a checkpointer or run fails clearly."""
+        with patch("security_news_agent.processing.workflow.ChatGoogleGenerativeAI"):
+            workflow = SecurityNewsWorkflow(mock_config, Mock())
+            with pytest.raises(ProcessingError, match="checkpointer"):
+                workflow.resume("run")
+
+            workflow = SecurityNewsWorkflow(
+                mock_config,
+                Mock(),
+                checkpointer=SQLiteCheckpointer(":memory:"),
+            )
+            with pytest.raises(ProcessingError, match="No checkpoints"):
+                workflow.resume("missing")
+
+
+class TestLLMResponseCache:
+    """Test cases for the LLM response cache."""
+
+    @staticmethod
+    def _llm(content=MOCK_TOC_RESPONSE):
+        llm = Mock()
+        llm.model = "gemini-1.5-flash-latest"
+        llm.temperature = 0.2
+        llm.invoke.return_value = Mock(content=content)
+        return llm
+
+    def test_make_key(self):
+        """Test that every key component changes the key."""
+        key = LLMResponseCache.make_key("model", 0.2, "prompt")
+
+        assert key == LLMResponseCache.make_key("model", 0.2, "prompt")
+        assert key != LLMResponseCache.make_key("other", 0.2, "prompt")
+        assert key != LLMResponseCache.make_key("model", 0.7, "prompt")
+        assert key != LLMResponseCache.make_key("model", 0.2, "prompt!")
+        assert key != LLMResponseCache.make_key("model", 0.2, "prompt", sample=1)
+
+    def test_hit_skips_model_call(self, tmp_path):
+        """Test that a repeated prompt is answered from the cache."""
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+        llm = self._llm()
+
+        assert cache.invoke(llm, "prompt") == (MOCK_TOC_RESPONSE, False)
+        assert cache.invoke(llm, "prompt") == (MOCK_TOC_RESPONSE, True)
+        llm.invoke.assert_called_once_with("prompt")
+
+        messages = []
+        cache.invoke(llm, "prompt", on_message=messages.append)
+        assert messages == []
+
+        cache.invoke(llm, "prompt", sample=1, on_message=messages.append)
+        assert len(messages) == 1
+        assert llm.invoke.call_count == 2
+
+    def test_entries_expire(self, tmp_path):
+        """Test that responses are not reused after the TTL."""
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"), ttl=60)
+        llm = self._llm()
+
+        with patch("security_news_agent.utils.sqlite_cache.time.time") as mock_time:
+            mock_time.return_value = 1000.0
+            cache.invoke(llm, "prompt")
+            mock_time.return_value = 1061.0
+            _, cached = cache.invoke(llm, "prompt")
+
+        assert cached is False
+        assert llm.invoke.call_count == 2
+
+    def test_stream_caches_full_response(self, tmp_path):
+        """Test that a consumed stream is cached and replayed as one chunk."""
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+        llm = self._llm()
+        llm.stream.return_value = iter([Mock(content="ab"), Mock(content="c")])
+
+        chunks, cached = cache.stream(llm, "prompt")
+        assert cached is False
+        assert list(chunks) == ["ab", "c"]
+
+        chunks, cached = cache.stream(llm, "prompt")
+        assert cached is True
+        assert list(chunks) == ["abc"]
+        llm.stream.assert_called_once_with("prompt")
+
+    def test_node_logs_cache_hit(self, mock_initial_state, tmp_path):
+        """Test that a cached node response is recorded in the state log."""
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+        llm = self._llm()
+        state = mock_initial_state.copy()
+        state["outline"] = ["Item 1", "Item 2"]
+
+        first = WorkflowNodes.make_toc(state, llm, llm_cache=cache)
+        second = WorkflowNodes.make_toc(state, llm, llm_cache=cache)
+
+        assert first["toc"] == second["toc"]
+        assert "(cache hit)" not in first["log"][-1]
+        assert second["log"][-1].endswith("(cache hit)")
+        llm.invoke.assert_called_once()
+
+    def test_retry_attempt_is_not_served_from_cache(
+        self, mock_initial_state, tmp_path
+    ):
+        """Test that a retry asks the model again for an identical prompt."""
+        cache = LLMResponseCache(str(tmp_path / "llm.sqlite3"))
+        llm = self._llm()
+        state = mock_initial_state.copy()
+        state["outline"] = ["Item 1", "Item 2"]
+
+        WorkflowNodes.make_toc(state, llm, llm_cache=cache)
+        state["attempts"] = 1
+        result = WorkflowNodes.make_toc(state, llm, llm_cache=cache)
+
+        assert "(cache hit)" not in result["log"][-1]
+        assert llm.invoke.call_count == 2
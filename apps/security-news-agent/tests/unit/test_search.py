@@ -1,15 +1,39 @@
 """Unit tests for Tavily search functionality."""
 
+import asyncio
+import copy
+import json
+import time
+from datetime import datetime, timezone
 from unittest.mock import Mock, patch
 
+import httpx
 import pytest
 import requests
 
+from security_news_agent.search.cache import SearchCache
+from security_news_agent.search.dedup import (
+    NearDuplicateIndex,
+    apply_late_links,
+    canonicalize_url,
+    hamming_distance,
+    simhash,
+)
+from security_news_agent.search.packing import (
+    estimate_tokens,
+    pack_context,
+    rank_result,
+)
+from security_news_agent.search.rate_limit import RequestBudget, TokenBucket
 from security_news_agent.search.tavily_client import (
     TavilyAPIError,
     TavilyClient,
     TavilyNetworkError,
+    TavilyQuotaError,
+    TavilyRateLimitError,
 )
+from security_news_agent.utils.error_handling import RateLimitError
+from security_news_agent.utils.metrics import RunMetrics
 from tests.fixtures.mock_data import MOCK_SEARCH_QUERIES, MOCK_TAVILY_RESPONSE
 
 
@@ -30,7 +54,7 @@ class TestTavilyClient:
 
         assert client.timeout == 60
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_search_success(self, mock_post):
         """Test successful search operation."""
         mock_response = Mock()
@@ -52,7 +76,7 @@ class TestTavilyClient:
         assert payload["max_results"] == 8
         assert payload["time_range"] == "day"
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_search_with_options(self, mock_post):
         """Test search with custom options."""
         mock_response = Mock()
@@ -78,7 +102,7 @@ class TestTavilyClient:
         assert payload["time_range"] == "week"
         assert payload["search_depth"] == "basic"
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_search_api_error(self, mock_post):
         """Test handling of API error response."""
         mock_response = Mock()
@@ -93,9 +117,10 @@ class TestTavilyClient:
 
         assert "Invalid API key" in str(exc_info.value)
 
-    @patch("requests.post")
-    def test_search_network_error(self, mock_post):
-        """Test handling of network errors."""
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_search_network_error(self, mock_post, mock_sleep):
+        """Test that network errors are retried before giving up."""
         mock_post.side_effect = requests.RequestException("Network error")
 
         client = TavilyClient("test-api-key")
@@ -104,9 +129,11 @@ class TestTavilyClient:
             client.search("test query")
 
         assert "Network error" in str(exc_info.value)
+        assert mock_post.call_count == 3
 
-    @patch("requests.post")
-    def test_search_timeout_error(self, mock_post):
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_search_timeout_error(self, mock_post, mock_sleep):
         """Test handling of timeout errors."""
         mock_post.side_effect = requests.Timeout("Request timeout")
 
@@ -116,21 +143,42 @@ class TestTavilyClient:
             client.search("test query")
 
         assert "Request timeout" in str(exc_info.value)
+        assert mock_post.call_count == 3
+
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_search_recovers_from_network_error(self, mock_post, mock_sleep):
+        """Test that a search succeeds when a retry gets through."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = MOCK_TAVILY_RESPONSE
+        mock_response.raise_for_status.return_value = None
+        mock_post.side_effect = [requests.ConnectionError("reset"), mock_response]
 
-    @patch("requests.post")
-    def test_search_http_error(self, mock_post):
-        """Test handling of HTTP errors."""
+        client = TavilyClient("test-api-key")
+
+        assert client.search("test query") == MOCK_TAVILY_RESPONSE
+        assert mock_post.call_count == 2
+
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_search_http_error(self, mock_post, mock_sleep):
+        """Test that a 4xx response raises without being retried."""
         mock_response = Mock()
+        mock_response.status_code = 404
         mock_response.raise_for_status.side_effect = requests.HTTPError(
-            "404 Not Found"
+            "404 Not Found", response=mock_response
         )
         mock_post.return_value = mock_response
 
         client = TavilyClient("test-api-key")
 
-        with pytest.raises(TavilyNetworkError):
+        with pytest.raises(TavilyNetworkError) as exc_info:
             client.search("test query")
 
+        assert exc_info.value.status_code == 404
+        assert mock_post.call_count == 1
+
     @patch.object(TavilyClient, "search")
     def test_collect_context_string_queries(self, mock_search):
         """Test collect_context with string queries."""
@@ -231,6 +279,165 @@ class TestTavilyClient:
         # Second query failed but didn't crash
         assert len(result["query2"]) == 0
 
+    def test_init_max_workers(self):
+        """Test that max_workers defaults to sequential and is clamped."""
+        assert TavilyClient("test-api-key").max_workers == 1
+        assert TavilyClient("test-api-key", max_workers=4).max_workers == 4
+        assert TavilyClient("test-api-key", max_workers=0).max_workers == 1
+
+    def test_pool_size_covers_max_workers(self):
+        """Test that the connection pool is never smaller than the worker pool."""
+        assert TavilyClient("test-api-key").pool_size == 10
+        client = TavilyClient("test-api-key", max_workers=16, pool_size=4)
+        assert client.pool_size == 16
+
+    def test_session_is_reused(self):
+        """Test that the pooled session is created once and reused."""
+        client = TavilyClient("test-api-key", pool_size=3)
+
+        session = client.session
+        adapter = session.get_adapter("https://api.tavily.com/search")
+
+        assert client.session is session
+        assert adapter._pool_maxsize == 3
+
+    @patch("requests.Session.post")
+    def test_search_reuses_session(self, mock_post):
+        """Test that repeated searches go through one session."""
+        mock_response = Mock()
+        mock_response.json.return_value = MOCK_TAVILY_RESPONSE
+        mock_response.raise_for_status.return_value = None
+        mock_post.return_value = mock_response
+
+        client = TavilyClient("test-api-key")
+        client.search("query1")
+        session = client.session
+        client.search("query2")
+
+        assert client.session is session
+        assert mock_post.call_count == 2
+
+    def test_close_and_context_manager(self):
+        """Test that close() releases the session and the client stays usable."""
+        with TavilyClient("test-api-key") as client:
+            session = client.session
+
+        assert client._session is None
+        assert client.session is not session
+
+        client.close()
+        client.close()  # Closing twice is harmless
+        assert client._session is None
+
+    def test_collect_context_concurrent_matches_sequential(self):
+        """Test that concurrent collection keeps first-seen-wins order."""
+        responses = {
+            "query1": {
+                "results": [
+                    {"title": "A", "url": "https://example.com/a", "content": "a"},
+                    {"title": "B", "url": "https://example.com/b", "content": "b"},
+                ]
+            },
+            "query2": {
+                "results": [
+                    {"title": "B2", "url": "https://example.com/b", "content": "b"},
+                    {"title": "C", "url": "https://example.com/c", "content": "c"},
+                ]
+            },
+            "query3": {
+                "results": [
+                    {"title": "A3", "url": "https://example.com/a", "content": "a"},
+                ]
+            },
+        }
+        delays = {"query1": 0.05, "query2": 0.0, "query3": 0.02}
+
+        def fake_search(query, **kwargs):
+            time.sleep(delays[query])
+            return responses[query]
+
+        queries = ["query1", "query2", "query3"]
+        sequential = TavilyClient("test-api-key")
+        concurrent = TavilyClient("test-api-key", max_workers=3)
+
+        with patch.object(sequential, "search", side_effect=fake_search):
+            expected = sequential.collect_context(queries)
+        with patch.object(concurrent, "search", side_effect=fake_search):
+            result = concurrent.collect_context(queries)
+
+        assert result == expected
+        assert list(result) == queries
+        assert [item["title"] for item in result["query2"]] == ["C"]
+        assert result["query3"] == []
+
+    def test_collect_context_concurrent_failure_isolated(self):
+        """Test that a failing query does not affect concurrent siblings."""
+
+        def fake_search(query, **kwargs):
+            if query == "query2":
+                raise TavilyNetworkError("boom")
+            return MOCK_TAVILY_RESPONSE
+
+        client = TavilyClient("test-api-key", max_workers=4)
+        with patch.object(client, "search", side_effect=fake_search):
+            result = client.collect_context(["query1", "query2"])
+
+        assert len(result["query1"]) > 0
+        assert result["query2"] == []
+
+    def test_iter_context_streams_in_query_order(self):
+        """Test that early queries are yielded before slow later ones finish."""
+        events = []
+
+        def fake_search(query, **kwargs):
+            if query == "slow":
+                time.sleep(0.1)
+            events.append(f"done:{query}")
+            return {
+                "results": [
+                    {"title": query, "url": f"https://example.com/{query}", "content": ""}
+                ]
+            }
+
+        client = TavilyClient("test-api-key", max_workers=2)
+        with patch.object(client, "search", side_effect=fake_search):
+            for query, items in client.iter_context(["fast", "slow"]):
+                events.append(f"yield:{query}")
+
+        assert events.index("yield:fast") < events.index("done:slow")
+        assert events[-1] == "yield:slow"
+
+    def test_iter_context_matches_collect_context(self):
+        """Test that streaming and batch collection produce the same data."""
+        client = TavilyClient("test-api-key", max_workers=3)
+        queries = MOCK_SEARCH_QUERIES[:3]
+
+        with patch.object(client, "search", return_value=MOCK_TAVILY_RESPONSE):
+            streamed = list(client.iter_context(queries))
+            collected = client.collect_context(queries)
+
+        assert streamed == list(collected.items())
+
+    def test_format_query_markdown_sections_join_to_context(self):
+        """Test that incremental sections reproduce the full markdown."""
+        context = {
+            "query1": [
+                {"title": "A", "url": "https://example.com/a", "content": "x\ny"}
+            ],
+            "query2": [],
+        }
+        client = TavilyClient("test-api-key")
+
+        sections = [
+            client.format_query_markdown(query, items)
+            for query, items in context.items()
+        ]
+
+        assert "\n".join(sections) == client.format_context_as_markdown(context)
+        assert sections[0] == (
+            "### Query: query1\n- A — x y [source](https://example.com/a)\n"
+        )
+
     def test_format_context_as_markdown(self):
         """Test formatting context as markdown."""
         context = {
@@ -320,3 +527,779 @@ class TestTavilyClient:
         )
         # "security" != "SECURITY"
         assert len(filtered_sensitive["query1"]) == 0
+
+
+class TestAsyncTavilyClient:
+    """Test cases for the asyncio API of TavilyClient."""
+
+    @staticmethod
+    def _client_with_transport(handler, **kwargs):
+        client = TavilyClient("test-api-key", **kwargs)
+        client._async_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        return client
+
+    def test_asearch_success(self):
+        """Test successful async search and payload."""
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json=MOCK_TAVILY_RESPONSE)
+
+        async def run():
+            async with self._client_with_transport(handler) as client:
+                result = await client.asearch(
+                    "security news", include_domains=["example.com"]
+                )
+            return client, result
+
+        client, result = asyncio.run(run())
+
+        assert result == MOCK_TAVILY_RESPONSE
+        assert client._async_client is None
+        payload = json.loads(requests_seen[0].content)
+        assert payload["query"] == "security news"
+        assert payload["include_domains"] == ["example.com"]
+        assert payload["max_results"] == 8
+
+    def test_asearch_api_error(self):
+        """Test that API-level errors raise TavilyAPIError."""
+
+        def handler(request):
+            return httpx.Response(200, json={"error": "Invalid API key"})
+
+        client = self._client_with_transport(handler)
+
+        with pytest.raises(TavilyAPIError):
+            asyncio.run(client.asearch("test query"))
+
+    @staticmethod
+    async def _no_wait(seconds):
+        return None
+
+    def test_asearch_http_error(self):
+        """Test that 5xx responses are retried, then raise TavilyNetworkError."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500)
+
+        client = self._client_with_transport(handler)
+
+        with patch("asyncio.sleep", side_effect=self._no_wait):
+            with pytest.raises(TavilyNetworkError) as exc_info:
+                asyncio.run(client.asearch("test query"))
+
+        assert exc_info.value.status_code == 500
+        assert len(calls) == 3
+
+    def test_asearch_client_error_not_retried(self):
+        """Test that a 4xx response is not retried."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(403)
+
+        client = self._client_with_transport(handler)
+
+        with pytest.raises(TavilyNetworkError) as exc_info:
+            asyncio.run(client.asearch("test query"))
+
+        assert exc_info.value.status_code == 403
+        assert len(calls) == 1
+
+    def test_asearch_timeout(self):
+        """Test that timeouts raise TavilyNetworkError."""
+
+        def handler(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        client = self._client_with_transport(handler)
+
+        with patch("asyncio.sleep", side_effect=self._no_wait):
+            with pytest.raises(TavilyNetworkError) as exc_info:
+                asyncio.run(client.asearch("test query"))
+
+        assert "Request timeout" in str(exc_info.value)
+
+    def test_asearch_uses_cache(self, tmp_path):
+        """Test that asearch shares the cache with the sync path."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json=MOCK_TAVILY_RESPONSE)
+
+        cache = SearchCache(str(tmp_path / "cache.sqlite3"))
+        client = self._client_with_transport(handler, cache=cache)
+
+        async def run():
+            await client.asearch("query")
+            return await client.asearch("query")
+
+        assert asyncio.run(run()) == MOCK_TAVILY_RESPONSE
+        assert len(calls) == 1
+        assert cache.hits == 1
+
+    def test_acollect_context_matches_sync(self):
+        """Test that acollect_context output equals collect_context output."""
+        responses = {
+            "query1": {
+                "results": [
+                    {"title": "A", "url": "https://example.com/a", "content": "a"}
+                ]
+            },
+            "query2": {
+                "results": [
+                    {"title": "A2", "url": "https://example.com/a", "content": "a"},
+                    {"title": "B", "url": "https://example.com/b", "content": "b"},
+                ]
+            },
+        }
+
+        async def fake_asearch(query, **kwargs):
+            await asyncio.sleep(0.02 if query == "query1" else 0)
+            return responses[query]
+
+        def fake_search(query, **kwargs):
+            return responses[query]
+
+        queries = ["query1", "", "query2"]
+        client = TavilyClient("test-api-key", max_workers=2)
+
+        with patch.object(client, "search", side_effect=fake_search):
+            expected = client.collect_context(queries)
+        with patch.object(client, "asearch", side_effect=fake_asearch):
+            result = asyncio.run(client.acollect_context(queries))
+
+        assert result == expected
+        assert [item["title"] for item in result["query2"]] == ["B"]
+
+    def test_acollect_context_failure_isolated(self):
+        """Test that a failing async query yields an empty result list."""
+
+        async def fake_asearch(query, **kwargs):
+            if query == "query2":
+                raise TavilyNetworkError("boom")
+            return MOCK_TAVILY_RESPONSE
+
+        client = TavilyClient("test-api-key", max_workers=2)
+        with patch.object(client, "asearch", side_effect=fake_asearch):
+            result = asyncio.run(client.acollect_context(["query1", "query2"]))
+
+        assert len(result["query1"]) > 0
+        assert result["query2"] == []
+
+    def test_acollect_context_bounds_concurrency(self):
+        """Test that no more than max_workers searches run at once."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_asearch(query, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"results": []}
+
+        client = TavilyClient("test-api-key", max_workers=2)
+        with patch.object(client, "asearch", side_effect=fake_asearch):
+            asyncio.run(
+                client.acollect_context([f"query{i}" for i in range(6)])
+            )
+
+        assert peak == 2
+
+
+class TestSearchCache:
+    """Test cases for SearchCache class."""
+
+    def test_make_key_is_stable(self):
+        """Test that keys ignore domain order but not other parameters."""
+        key = SearchCache.make_key("q", ["a.com", "b.com"], "day", "advanced", 5)
+
+        assert key == SearchCache.make_key(
+            "q", ["b.com", "a.com"], "day", "advanced", 5
+        )
+        assert key != SearchCache.make_key(
+            "q", ["a.com", "b.com"], "week", "advanced", 5
+        )
+        assert key != SearchCache.make_key(
+            "q", ["a.com", "b.com"], "day", "advanced", 8
+        )
+
+    def test_get_set_roundtrip(self, tmp_path):
+        """Test storing and retrieving a response."""
+        cache = SearchCache(str(tmp_path / "cache.sqlite3"))
+
+        assert cache.get("key") is None
+        cache.set("key", MOCK_TAVILY_RESPONSE, "day")
+
+        assert cache.get("key") == MOCK_TAVILY_RESPONSE
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_entries_persist_across_instances(self, tmp_path):
+        """Test that the cache survives reopening the database."""
+        path = str(tmp_path / "cache.sqlite3")
+        cache = SearchCache(path)
+        cache.set("key", MOCK_TAVILY_RESPONSE, "day")
+        cache.close()
+
+        assert SearchCache(path).get("key") == MOCK_TAVILY_RESPONSE
+
+    def test_ttl_follows_time_range(self, tmp_path):
+        """Test TTL selection and expiry."""
+        cache = SearchCache(
+            str(tmp_path / "cache.sqlite3"), ttl_by_time_range={"day": 60}
+        )
+
+        assert cache.get_ttl("day") == 60
+        assert cache.get_ttl("week") == 12 * 60 * 60
+        assert cache.get_ttl("unknown") == 60
+
+        with patch("security_news_agent.utils.sqlite_cache.time.time") as mock_time:
+            mock_time.return_value = 1000.0
+            cache.set("key", MOCK_TAVILY_RESPONSE, "day")
+
+            mock_time.return_value = 1059.0
+            assert cache.get("key") is not None
+
+            mock_time.return_value = 1061.0
+            assert cache.get("key") is None
+
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        """Test that the least recently used entries are evicted first."""
+        value = {"results": [{"content": "x" * 100}]}
+        cache = SearchCache(str(tmp_path / "cache.sqlite3"), max_bytes=300)
+
+        with patch("security_news_agent.utils.sqlite_cache.time.time") as mock_time:
+            mock_time.return_value = 1000.0
+            cache.set("a", value, "day")
+            mock_time.return_value = 1001.0
+            cache.set("b", value, "day")
+            mock_time.return_value = 1002.0
+            cache.get("a")  # "b" is now least recently used
+            mock_time.return_value = 1003.0
+            cache.set("c", value, "day")
+
+            assert cache.get("a") is not None
+            assert cache.get("b") is None
+            assert cache.get("c") is not None
+
+        assert cache.stats()["bytes"] <= 300
+
+    def test_oversized_value_not_cached(self, tmp_path):
+        """Test that a value larger than the cache is skipped."""
+        cache = SearchCache(str(tmp_path / "cache.sqlite3"), max_bytes=10)
+        cache.set("key", MOCK_TAVILY_RESPONSE, "day")
+
+        assert cache.stats()["entries"] == 0
+
+    def test_unwritable_path_disables_cache(self, tmp_path):
+        """Test that a cache that cannot be opened always misses."""
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+
+        # A file in place of the parent directory, and a directory as the db
+        for path in (blocker / "cache.sqlite3", tmp_path):
+            cache = SearchCache(str(path))
+
+            assert not cache.enabled
+            cache.set("key", MOCK_TAVILY_RESPONSE, "day")
+            assert cache.get("key") is None
+            assert cache.stats() == {
+                "hits": 0,
+                "misses": 1,
+                "entries": 0,
+                "bytes": 0,
+            }
+            cache.clear()
+            cache.close()
+
+    @patch("requests.Session.post")
+    def test_client_serves_repeated_search_from_cache(self, mock_post, tmp_path):
+        """Test that TavilyClient only hits the network on a cache miss."""
+        mock_response = Mock()
+        mock_response.json.return_value = MOCK_TAVILY_RESPONSE
+        mock_response.raise_for_status.return_value = None
+        mock_post.return_value = mock_response
+
+        cache = SearchCache(str(tmp_path / "cache.sqlite3"))
+        client = TavilyClient("test-api-key", cache=cache)
+
+        first = client.search("query", include_domains=["a.com"])
+        second = client.search("query", include_domains=["a.com"])
+        client.search("query", include_domains=["a.com"], time_range="week")
+
+        assert first == second == MOCK_TAVILY_RESPONSE
+        assert mock_post.call_count == 2
+        assert client.get_cache_stats()["hits"] == 1
+        assert client.get_cache_stats()["misses"] == 2
+
+    @patch("requests.Session.post")
+    def test_client_does_not_cache_failures(self, mock_post, tmp_path):
+        """Test that failed searches are not stored."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"error": "Invalid API key"}
+        mock_response.raise_for_status.return_value = None
+        mock_post.return_value = mock_response
+
+        cache = SearchCache(str(tmp_path / "cache.sqlite3"))
+        client = TavilyClient("test-api-key", cache=cache)
+
+        with pytest.raises(TavilyAPIError):
+            client.search("query")
+
+        assert cache.stats()["entries"] == 0
+
+    def test_client_without_cache_has_no_stats(self):
+        """Test cache stats when caching is disabled."""
+        assert TavilyClient("test-api-key").get_cache_stats() == {}
+
+
+class TestRateLimiting:
+    """Test cases for client-side rate limiting and request budgets."""
+
+    @staticmethod
+    def _response(status_code=200, json_data=None, headers=None):
+        response = Mock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        response.json.return_value = json_data or MOCK_TAVILY_RESPONSE
+        if status_code >= 400:
+            response.raise_for_status.side_effect = requests.HTTPError(
+                f"{status_code} Error", response=response
+            )
+        else:
+            response.raise_for_status.return_value = None
+        return response
+
+    def test_token_bucket_paces_after_burst(self):
+        """Test that the bucket allows a burst, then spaces requests out."""
+        with patch("security_news_agent.search.rate_limit.time.monotonic") as now:
+            now.return_value = 100.0
+            bucket = TokenBucket(rate_per_minute=60, burst=2)
+
+            assert bucket.reserve() == 0
+            assert bucket.reserve() == 0
+            assert bucket.reserve() == pytest.approx(1.0)
+            assert bucket.reserve() == pytest.approx(2.0)
+
+            now.return_value = 110.0  # Refilled to capacity
+            assert bucket.reserve() == 0
+
+    def test_token_bucket_defer(self):
+        """Test that defer() holds back every caller."""
+        with patch("security_news_agent.search.rate_limit.time.monotonic") as now:
+            now.return_value = 100.0
+            bucket = TokenBucket(rate_per_minute=600, burst=5)
+            bucket.defer(7)
+
+            assert bucket.reserve() == pytest.approx(7.0)
+            now.return_value = 108.0
+            assert bucket.reserve() == 0
+
+    def test_budget_per_run(self):
+        """Test the per-run budget and its reset."""
+        budget = RequestBudget(per_run=2)
+
+        assert budget.consume() and budget.consume()
+        assert not budget.consume()
+
+        budget.start_run()
+        assert budget.consume()
+
+    def test_budget_per_day_is_shared_through_store(self, tmp_path):
+        """Test that daily counts persist across budget instances."""
+        path = str(tmp_path / "budget.sqlite3")
+        first = RequestBudget(per_day=3, path=path)
+        assert first.consume() and first.consume()
+        first.close()
+
+        second = RequestBudget(per_day=3, path=path)
+        assert second.used_today() == 2
+        assert second.consume()
+        assert not second.consume()
+
+    def test_budget_per_day_rolls_over(self):
+        """Test that the in-memory daily count is keyed by date."""
+        budget = RequestBudget(per_day=1)
+        with patch(
+            "security_news_agent.search.rate_limit.today_iso",
+            side_effect=["2025-01-01", "2025-01-01", "2025-01-02"],
+        ):
+            assert budget.consume()
+            assert not budget.consume()
+            assert budget.consume()
+
+    def test_rate_limit_error_hierarchy(self):
+        """Test that the Tavily 429 error carries retry_after."""
+        error = TavilyRateLimitError(retry_after=5)
+
+        assert isinstance(error, RateLimitError)
+        assert error.retry_after == 5
+        assert error.service == "Tavily"
+        assert error.status_code == 429
+
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_search_honours_retry_after(self, mock_post, mock_sleep):
+        """Test that a 429 is retried after the server's Retry-After."""
+        mock_post.side_effect = [
+            self._response(429, headers={"Retry-After": "7"}),
+            self._response(),
+        ]
+
+        client = TavilyClient("test-api-key")
+        result = client.search("test query")
+
+        assert result == MOCK_TAVILY_RESPONSE
+        assert mock_post.call_count == 2
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_search_records_metrics(self, mock_post, mock_sleep):
+        """Test that a search is recorded with its retries and results."""
+        mock_post.side_effect = [
+            self._response(429, headers={"Retry-After": "1"}),
+            self._response(),
+        ]
+        metrics = RunMetrics()
+
+        client = TavilyClient("test-api-key", metrics=metrics)
+        client.search("test query")
+
+        (search,) = metrics.report()["searches"]
+        assert search["query"] == "test query"
+        assert search["retries"] == 1
+        assert search["results"] == len(MOCK_TAVILY_RESPONSE["results"])
+        assert search["cached"] is False
+        assert search["error"] == ""
+
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_search_gives_up_on_long_retry_after(self, mock_post, mock_sleep):
+        """Test that an excessive Retry-After is not waited for."""
+        mock_post.return_value = self._response(
+            429, headers={"Retry-After": "3600"}
+        )
+        bucket = TokenBucket(rate_per_minute=600, burst=5)
+
+        client = TavilyClient("test-api-key", rate_limiter=bucket)
+        with pytest.raises(TavilyRateLimitError) as exc_info:
+            client.search("test query")
+
+        assert exc_info.value.retry_after == 3600
+        assert mock_post.call_count == 1
+        assert bucket._blocked_until > 0
+
+    @patch("requests.Session.post")
+    def test_search_budget_exhausted(self, mock_post):
+        """Test that searches stop once the budget is spent."""
+        mock_post.return_value = self._response()
+
+        client = TavilyClient("test-api-key", budget=RequestBudget(per_run=1))
+        client.search("query1")
+
+        with pytest.raises(TavilyQuotaError):
+            client.search("query2")
+
+        assert mock_post.call_count == 1
+
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_retries_charge_budget_once(self, mock_post, mock_sleep):
+        """Test that a retried search costs one request from the budget."""
+        mock_post.side_effect = [
+            self._response(503),
+            self._response(429, headers={"Retry-After": "1"}),
+            self._response(),
+        ]
+        budget = RequestBudget(per_run=2)
+
+        client = TavilyClient("test-api-key", budget=budget)
+
+        assert client.search("query1") == MOCK_TAVILY_RESPONSE
+        assert mock_post.call_count == 3
+        assert budget.consume()
+        assert not budget.consume()
+
+    @patch("requests.Session.post")
+    def test_collect_context_resets_run_budget(self, mock_post):
+        """Test that each collection run gets a fresh per-run budget."""
+        mock_post.return_value = self._response()
+        client = TavilyClient("test-api-key", budget=RequestBudget(per_run=1))
+
+        first = client.collect_context(["query1", "query2"])
+        second = client.collect_context(["query3"])
+
+        assert len(first["query1"]) > 0
+        assert first["query2"] == []
+        assert len(second["query3"]) > 0
+
+    @patch("requests.Session.post")
+    def test_cache_hits_do_not_consume_budget(self, mock_post, tmp_path):
+        """Test that cached responses bypass the budget and limiter."""
+        mock_post.return_value = self._response()
+        client = TavilyClient(
+            "test-api-key",
+            cache=SearchCache(str(tmp_path / "cache.sqlite3")),
+            budget=RequestBudget(per_run=1),
+        )
+
+        client.search("query")
+        assert client.search("query") == MOCK_TAVILY_RESPONSE
+        assert mock_post.call_count == 1
+
+    def test_asearch_honours_retry_after(self):
+        """Test that the async path retries a 429 after Retry-After."""
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, json=MOCK_TAVILY_RESPONSE),
+        ]
+
+        def handler(request):
+            return responses.pop(0)
+
+        client = TavilyClient("test-api-key")
+        client._async_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+
+        async def no_wait(seconds):
+            return None
+
+        with patch("asyncio.sleep", side_effect=no_wait) as mock_sleep:
+            result = asyncio.run(client.asearch("test query"))
+
+        assert result == MOCK_TAVILY_RESPONSE
+        mock_sleep.assert_called_once_with(2.0)
+
+
+SYNDICATED_TEXT = (
+    "Google has released an emergency update for Chrome to fix a zero-day "
+    "vulnerability actively exploited in attacks, the company said on Tuesday."
+)
+
+
+class TestNearDuplicateDetection:
+    """Test cases for URL canonicalisation and near-duplicate collapsing."""
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://example.com/news/story?a=1",
+            "http://www.Example.com/news/story/?a=1#comments",
+            "https://example.com/news/story?utm_source=x&a=1&fbclid=abc",
+            "https://amp.example.com/news/story/amp/?a=1",
+            "https://m.example.com/news/story?a=1",
+        ],
+    )
+    def test_canonicalize_url_variants(self, url):
+        """Test that URL variants of one article share a canonical form."""
+        assert canonicalize_url(url) == "https://example.com/news/story?a=1"
+
+    def test_canonicalize_url_keeps_meaningful_parts(self):
+        """Test that distinct articles keep distinct canonical URLs."""
+        assert canonicalize_url("https://example.com/a?id=1") != canonicalize_url(
+            "https://example.com/a?id=2"
+        )
+        assert canonicalize_url("https://example.com:8080/x/") == (
+            "https://example.com:8080/x"
+        )
+        assert canonicalize_url("not a url") == "not a url"
+
+    def test_simhash_distance(self):
+        """Test that reworded copies are close and unrelated texts are far."""
+        reworded = SYNDICATED_TEXT.replace("on Tuesday", "Tuesday")
+        unrelated = (
+            "Microsoft Patch Tuesday fixes 60 flaws including two zero-days "
+            "in the Windows kernel and Hyper-V."
+        )
+
+        base = simhash(SYNDICATED_TEXT)
+        assert hamming_distance(base, simhash(reworded)) <= 10
+        assert hamming_distance(base, simhash(unrelated)) > 10
+
+    def test_index_collapses_syndicated_story(self):
+        """Test that copies are merged into the first item with all links."""
+        index = NearDuplicateIndex()
+        first = {
+            "title": "Chrome zero-day exploited",
+            "url": "https://thehackernews.com/chrome",
+            "content": SYNDICATED_TEXT,
+        }
+        copy = {
+            "title": "Chrome zero-day exploited",
+            "url": "https://www.bleepingcomputer.com/chrome",
+            "content": SYNDICATED_TEXT.replace("on Tuesday", "Tuesday"),
+        }
+        amp = {"title": "", "url": "https://thehackernews.com/chrome/amp/", "content": ""}
+
+        assert index.add(first) is True
+        assert index.add(copy) is False
+        assert index.add(amp) is False
+        assert first["sources"] == [
+            "https://thehackernews.com/chrome",
+            "https://www.bleepingcomputer.com/chrome",
+            "https://thehackernews.com/chrome/amp/",
+        ]
+        assert index.collapsed == 2
+
+    def test_index_without_text_matching(self):
+        """Test that a None distance only merges matching URLs."""
+        index = NearDuplicateIndex(max_distance=None)
+        first = {"title": "A", "url": "https://a.com/x", "content": SYNDICATED_TEXT}
+        other = {"title": "A", "url": "https://b.com/x", "content": SYNDICATED_TEXT}
+
+        assert index.add(first) is True
+        assert index.add(other) is True
+
+    @patch.object(TavilyClient, "search")
+    def test_collect_context_collapses_across_queries(self, mock_search):
+        """Test that a story found by two queries is listed once with both links."""
+        mock_search.side_effect = [
+            {
+                "results": [
+                    {
+                        "title": "Chrome zero-day exploited",
+                        "url": "https://thehackernews.com/chrome",
+                        "content": SYNDICATED_TEXT,
+                    }
+                ]
+            },
+            {
+                "results": [
+                    {
+                        "title": "Chrome zero-day exploited",
+                        "url": "https://securityweek.com/chrome?utm_medium=rss",
+                        "content": SYNDICATED_TEXT,
+                    }
+                ]
+            },
+        ]
+        client = TavilyClient("test-api-key")
+
+        result = client.collect_context(["query1", "query2"])
+        markdown = client.format_context_as_markdown(result)
+
+        assert result["query2"] == []
+        assert result["query1"][0]["sources"] == [
+            "https://thehackernews.com/chrome",
+            "https://securityweek.com/chrome?utm_medium=rss",
+        ]
+        assert markdown.count("Chrome zero-day exploited") == 1
+        assert "[source](https://securityweek.com/chrome?utm_medium=rss)" in markdown
+
+    @patch.object(TavilyClient, "search")
+    def test_iter_context_never_changes_yielded_results(self, mock_search):
+        """Test that links found later are reported, not merged into yields."""
+        story = {
+            "title": "Chrome zero-day exploited",
+            "url": "https://thehackernews.com/chrome",
+            "content": SYNDICATED_TEXT,
+        }
+        mock_search.side_effect = [
+            {"results": [story]},
+            {"results": [{**story, "url": "https://securityweek.com/chrome"}]},
+        ]
+        client = TavilyClient("test-api-key")
+        late_links = {}
+
+        streamed, snapshots = {}, {}
+        for query, items in client.iter_context(
+            ["query1", "query2"], late_links=late_links
+        ):
+            streamed[query] = items
+            snapshots[query] = copy.deepcopy(items)
+
+        assert streamed == snapshots
+        assert late_links == {
+            "https://thehackernews.com/chrome": ["https://securityweek.com/chrome"]
+        }
+        merged = apply_late_links(streamed, late_links)
+        assert merged["query1"][0]["sources"] == [
+            "https://thehackernews.com/chrome",
+            "https://securityweek.com/chrome",
+        ]
+        assert streamed == snapshots
+
+
+def _result(title, score=0.5, published_date=None, content="x " * 150):
+    item = {
+        "title": title,
+        "url": f"https://example.com/{title.replace(' ', '-')}",
+        "content": content,
+        "score": score,
+    }
+    if published_date:
+        item["published_date"] = published_date
+    return item
+
+
+class TestContextPacking:
+    """Test cases for token-budgeted context packing."""
+
+    NOW = datetime(2025, 9, 15, 12, 0, tzinfo=timezone.utc)
+
+    def test_estimate_tokens(self):
+        """Test the local token estimate for ASCII and CJK text."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd" * 10) == 10
+        assert estimate_tokens("脆弱性") == 3
+
+    def test_rank_prefers_relevant_and_recent(self):
+        """Test that relevance and recency both raise the rank."""
+        fresh = _result("fresh", published_date="Mon, 15 Sep 2025 10:00:00 GMT")
+        stale = _result("stale", published_date="2025-09-10T10:00:00Z")
+        relevant = _result("relevant", score=0.95)
+
+        assert rank_result(fresh, self.NOW) > rank_result(stale, self.NOW)
+        assert rank_result(relevant, self.NOW) > rank_result(_result("a"), self.NOW)
+
+    def test_pack_unlimited_matches_full_markdown(self):
+        """Test that a sufficient budget reproduces the unpacked markdown."""
+        context = {"q1": [_result("a")], "q2": []}
+        client = TavilyClient("test-api-key")
+
+        expected = client.format_context_as_markdown(context)
+        assert pack_context(context, 0) == expected
+        assert pack_context(context, 100_000) == expected
+
+    def test_pack_respects_budget_and_ranking(self):
+        """Test that the best results are kept within the budget."""
+        context = {
+            "q1": [_result("low one", 0.1), _result("high one", 0.9)],
+            "q2": [_result("low two", 0.2)],
+            "q3": [_result("high two", 0.8)],
+        }
+
+        packed = pack_context(context, 220, now=self.NOW)
+
+        assert estimate_tokens(packed) <= 220
+        assert "high one" in packed
+        assert "high two" in packed
+        assert "low one" not in packed
+        assert "### Query: q2" not in packed
+        assert packed.index("q1") < packed.index("q3")
+
+    def test_pack_shortens_snippet_to_fit(self):
+        """Test that a result that does not fit in full is truncated."""
+        context = {"q": [_result("story", content="word " * 400)]}
+
+        packed = pack_context(context, 120, now=self.NOW)
+
+        assert "story" in packed
+        assert "…" in packed
+        assert estimate_tokens(packed) <= 120
@@ -1,29 +1,50 @@
 """Unit tests for utility functions."""
 
+import json
+import subprocess  # nosec B404
+import sys
 from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
 
+import pytest
+
+from security_news_agent.processing.state import append_log
+from security_news_agent.utils.fileio import (
+    atomic_write_bytes,
+    atomic_write_text,
+    reserve_path,
+)
 from security_news_agent.utils.helpers import (
     clean_title,
     count_words,
     dedupe_separators,
+    deep_sizeof,
     ensure_marp_header,
     extract_urls_from_text,
     find_json,
     format_file_size,
     insert_separators,
+    join_slides,
     log_message,
     merge_dicts,
+    normalize_marp_markdown,
     now_jst,
     parse_json_safely,
+    read_topics_file,
     remove_presenter_lines,
     sanitize_filename,
     slugify_en,
+    split_slides,
     strip_bullets,
     strip_whole_code_fence,
     today_iso,
     truncate_text,
     validate_url,
 )
+from security_news_agent.utils.lazy import lazy_exports, lazy_traceable
+from security_news_agent.utils.marp_stream import MarpStreamNormalizer
+from security_news_agent.utils.metrics import RunMetrics
 
 
 class TestLogMessage:
@@ -37,11 +58,12 @@ class TestLogMessage:
         assert result == ["Test message"]
 
     def test_log_message_existing_log(self):
-        """Test adding log message to state with existing log."""
+        """Test that only the new entry is returned for an existing log."""
         state = {"log": ["Previous message"]}
         result = log_message(state, "New message")
 
-        assert result == ["Previous message", "New message"]
+        assert result == ["New message"]
+        assert state["log"] == ["Previous message"]
 
     def test_log_message_none_log(self):
         """Test adding log message when log is None."""
@@ -50,6 +72,14 @@ class TestLogMessage:
 
         assert result == ["Test message"]
 
+    def test_log_message_with_reducer(self):
+        """Test that the log channel reducer appends the returned entry."""
+        state = {"log": ["Previous message"]}
+
+        log = append_log(state["log"], log_message(state, "New message"))
+
+        assert log == ["Previous message", "New message"]
+
 
 class TestStripBullets:
     """Test cases for strip_bullets function."""
@@ -258,6 +288,113 @@ class TestDedupeSeperators:
         assert result == content
 
 
+class TestSplitSlides:
+    """Test cases for split_slides and join_slides functions."""
+
+    def test_split_slides_front_matter(self):
+        """Test splitting a deck with front matter."""
+        md = "---\nmarp: true\n---\n\n# Title\n\n---\n\n## Slide 2\n"
+        front, slides = split_slides(md)
+
+        assert front == "---\nmarp: true\n---"
+        assert len(slides) == 2
+        assert slides[0].strip() == "# Title"
+        assert slides[1].strip() == "## Slide 2"
+        assert join_slides(front, slides) == md
+
+    def test_split_slides_ignores_separators_in_code(self):
+        """Test that --- inside a fenced code block is not a separator."""
+        md = "# Title\n```yaml\n---\nkey: value\n```\n---\n## Next"
+        front, slides = split_slides(md, has_front_matter=False)
+
+        assert front == ""
+        assert len(slides) == 2
+        assert "key: value" in slides[0]
+        assert join_slides(front, slides) == md
+
+
+class TestMarpStreamNormalizer:
+    """Test cases for MarpStreamNormalizer class."""
+
+    DECKS = [
+        "# Title\nSubtitle\n## Agenda\n- One\n## News\nText",
+        "```markdown\n# Title\n\n## A\n```python\n## not a slide\n```\n## B\n```",
+        "---\nmarp: true\n---\n# Title\n---\n\n---\n## A\ntext ---\n---\n## B",
+        "\r\n  # Title\r\nPresenter: Someone\r\n## A  \r\n",
+        "## Starts with a slide\nbody\n## Next\n",
+        "",
+    ]
+
+    @staticmethod
+    def _batch(md, title="Deck"):
+        md = strip_whole_code_fence(md.strip())
+        md = dedupe_separators(insert_separators(md))
+        return remove_presenter_lines(ensure_marp_header(md, title))
+
+    @staticmethod
+    def _stream(md, size, title="Deck", on_slide=None):
+        normalizer = MarpStreamNormalizer(title, on_slide=on_slide)
+        for start in range(0, len(md), size):
+            normalizer.feed(md[start:start + size])
+        return normalizer.close()
+
+    def test_matches_batch_helpers(self):
+        """Test that any chunking gives the output of the batch helpers."""
+        for md in self.DECKS:
+            for size in (1, 3, 16, 1000):
+                assert self._stream(md, size) == self._batch(md), repr(md)
+
+    def test_on_slide_pieces(self):
+        """Test that slides are reported as they complete."""
+        pieces = []
+        deck = self._stream(self.DECKS[0], 5, on_slide=pieces.append)
+
+        assert "".join(pieces) == deck
+        assert len(pieces) == 3
+        assert pieces[0].startswith("---\nmarp: true")
+        assert pieces[0].endswith("Subtitle\n---\n")
+
+
+class TestNormalizeMarpMarkdown:
+    """Test cases for normalize_marp_markdown function."""
+
+    CASES = [
+        "```markdown\n# Title\n## Slide\n```",
+        "# Title\n## Slide 1\nContent\n## Slide 2\n```python\n## Not a slide\n```",
+        "Content\n---\n---\n---\nMore content",
+        "---\n---\nContent",
+        "---\ntitle: Old\n---\n\n# Content",
+        "# Title\n\n発表者: 田中太郎\nPresenter: John Doe\n---\n## Slide 2",
+        "text ---\n\n  ---\n\n## Heading",
+        "## Starts with a slide\n\n---\n## Next",
+        "\r\n  # Title\r\n## A  \r\n## ",
+        "",
+    ]
+
+    @staticmethod
+    def _chained(md, title):
+        md = strip_whole_code_fence(md.strip())
+        md = dedupe_separators(insert_separators(md))
+        return remove_presenter_lines(ensure_marp_header(md, title))
+
+    def test_matches_chained_helpers(self):
+        """Test that the output is identical to the chained helpers."""
+        for md in self.CASES + TestMarpStreamNormalizer.DECKS:
+            assert normalize_marp_markdown(md, "Deck") == self._chained(
+                md, "Deck"
+            ), repr(md)
+
+    def test_large_deck(self):
+        """Test a deck of many slides with code blocks."""
+        slide = "## News\n\n- item\n\n```bash\n---\n## not a slide\n```\n"
+        md = "# Title\n" + slide * 500
+
+        result = normalize_marp_markdown(md, "Deck")
+
+        assert result == self._chained(md, "Deck")
+        assert result.count("\n---\n## News") == 500
+
+
 class TestStripWholeCodeFence:
     """Test cases for strip_whole_code_fence function."""
 
@@ -514,6 +651,288 @@ class TestFormatFileSize:
         assert result == "0 B"
 
 
+class TestDeepSizeof:
+    """Test cases for deep_sizeof function."""
+
+    def test_counts_nested_values(self):
+        """Test that contained values are included."""
+        nested = {"items": [{"content": "x" * 1000}]}
+
+        assert deep_sizeof(nested) > sys.getsizeof(nested) + 1000
+
+    def test_counts_shared_values_once(self):
+        """Test that a value reachable twice is counted once."""
+        text = "x" * 1000
+        once = deep_sizeof([text])
+
+        assert deep_sizeof([text, text]) == once + 8
+
+
+class TestReadTopicsFile:
+    """Test cases for read_topics_file function."""
+
+    def test_read_topics_file(self, tmp_path):
+        """Test that comments, blank lines and repeats are skipped."""
+        path = tmp_path / "topics.txt"
+        path.write_text(
+            "# Weekly briefings\n"
+            "Ransomware Roundup\n"
+            "\n"
+            "  Cloud Security  \n"
+            "Ransomware Roundup\n",
+            encoding="utf-8",
+        )
+
+        assert read_topics_file(str(path)) == [
+            "Ransomware Roundup",
+            "Cloud Security",
+        ]
+
+    def test_read_topics_file_empty(self, tmp_path):
+        """Test a file with only comments."""
+        path = tmp_path / "topics.txt"
+        path.write_text("# nothing yet\n\n", encoding="utf-8")
+
+        assert read_topics_file(str(path)) == []
+
+
+class TestLazyImports:
+    """Test cases for deferred imports."""
+
+    def test_lazy_exports_imports_on_first_use(self):
+        """Test that an export is imported once and then cached."""
+        namespace = {"__name__": "pkg", "__package__": "pkg"}
+        getattr_ = lazy_exports(namespace, {"dumps": "json"})
+
+        assert "dumps" not in namespace
+        dumps = getattr_("dumps")
+
+        assert dumps([1]) == "[1]"
+        assert namespace["dumps"] is dumps
+
+    def test_lazy_exports_unknown_name(self):
+        """Test that unknown names raise AttributeError."""
+        getattr_ = lazy_exports({"__name__": "pkg"}, {})
+
+        with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+            getattr_("missing")
+
+    def test_lazy_traceable_defers_langsmith(self):
+        """Test that langsmith's decorator is applied on the first call."""
+        calls = []
+
+        def fake_traceable(**kwargs):
+            calls.append(kwargs)
+            return lambda func: func
+
+        @lazy_traceable(name="node")
+        def node(value):
+            """Node docstring."""
+            return value * 2
+
+        assert node.__doc__ == "Node docstring."
+        with patch("langsmith.traceable", fake_traceable):
+            assert node(2) == 4
+            assert node(3) == 6
+
+        assert calls == [{"name": "node"}]
+
+    def test_cli_help_skips_heavy_imports(self):
+        """Test that --help does not import LangChain or the HTTP stack."""
+        src = Path(__file__).parents[2] / "src"
+        code = (
+            "import sys; sys.argv = ['security_news_agent', '--help']\n"
+            "import runpy\n"
+            "try:\n"
+            "    runpy.run_module('security_news_agent', run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "heavy = ('langchain_google_genai', 'langgraph', 'langsmith',"
+            " 'requests', 'tenacity')\n"
+            "print(sorted(m for m in heavy if m in sys.modules))\n"
+        )
+        result = subprocess.run(  # nosec B603
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env={"PYTHONPATH": str(src)},
+            check=True,
+        )
+
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+
+    def test_cli_validate_only_writes_nothing(self, tmp_path):
+        """Test that --validate-only creates no caches, checkpoints or files."""
+        src = Path(__file__).parents[2] / "src"
+        env = {
+            "PYTHONPATH": str(src),
+            "LANGCHAIN_TRACING_V2": "false",
+            "CHECKPOINT_PATH": ".cache/checkpoints.sqlite3",
+            "METRICS_PATH": "metrics.json",
+            "RENDER_CACHE_PATH": ".cache/renders",
+        }
+        result = subprocess.run(  # nosec B603
+            [
+                sys.executable,
+                "-m",
+                "security_news_agent",
+                "--test-mode",
+                "--validate-only",
+                "--output-dir",
+                "slides",
+            ],
+            capture_output=True,
+            text=True,
+            cwd=tmp_path,
+            env=env,
+        )
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Validation complete" in result.stdout
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestArgumentParser:
+    """Test cases for the command line argument parser."""
+
+    def test_resume_rejects_topics_file(self, capsys):
+        """Test that a batch run cannot be combined with --resume."""
+        from security_news_agent.__main__ import create_argument_parser
+
+        parser = create_argument_parser()
+
+        with pytest.raises(SystemExit) as exc_info:
+            parser.parse_args(["--resume", "run-1", "--topics-file", "t.txt"])
+
+        assert exc_info.value.code == 2
+        assert "not allowed with argument --resume" in capsys.readouterr().err
+        assert parser.parse_args(["--resume", "run-1"]).resume == "run-1"
+
+
+class TestFileIO:
+    """Test cases for atomic writes and file name reservation."""
+
+    def test_atomic_write_replaces_file(self, tmp_path):
+        """Test that a write replaces the file and leaves no temp files."""
+        path = tmp_path / "report.md"
+        path.write_text("old")
+
+        atomic_write_text(path, "new")
+
+        assert path.read_text(encoding="utf-8") == "new"
+        assert [p.name for p in tmp_path.iterdir()] == ["report.md"]
+
+    def test_atomic_write_no_overwrite(self, tmp_path):
+        """Test that overwrite=False keeps an existing file."""
+        path = tmp_path / "report.md.gz"
+        path.write_bytes(b"first")
+
+        with pytest.raises(FileExistsError):
+            atomic_write_bytes(path, b"second", overwrite=False)
+
+        assert path.read_bytes() == b"first"
+        assert [p.name for p in tmp_path.iterdir()] == ["report.md.gz"]
+
+    def test_atomic_write_failure_keeps_old_file(self, tmp_path):
+        """Test that a failed write leaves the old contents in place."""
+        path = tmp_path / "report.md"
+        path.write_text("old")
+
+        with patch("os.fsync", side_effect=OSError("disk full")):
+            with pytest.raises(OSError, match="disk full"):
+                atomic_write_text(path, "new")
+
+        assert path.read_text() == "old"
+        assert [p.name for p in tmp_path.iterdir()] == ["report.md"]
+
+    def test_reserve_path_adds_suffix(self, tmp_path):
+        """Test that taken names get -2, -3, ... suffixes."""
+        preferred = tmp_path / "deck.md"
+
+        assert reserve_path(preferred) == preferred
+        assert reserve_path(preferred) == tmp_path / "deck-2.md"
+        (tmp_path / "deck-3.md.zst").write_bytes(b"")
+        assert reserve_path(preferred, (".zst",)) == tmp_path / "deck-4.md"
+        assert preferred.exists()
+
+
+class TestRunMetrics:
+    """Test cases for the per-run metrics collector."""
+
+    def test_llm_tokens_from_usage_or_estimate(self):
+        """Test that usage metadata wins and text length is the fallback."""
+        metrics = RunMetrics(input_cost_per_mtok=2.0, output_cost_per_mtok=10.0)
+
+        usage = {"input_tokens": 100, "output_tokens": 50}
+        metrics.record_llm("make_toc", "p" * 40, "c" * 8, usage=usage)
+        metrics.record_llm("write_slides", "p" * 40, "c" * 8)
+        metrics.record_llm("write_slides", "p" * 40, "c" * 8, cached=True)
+
+        nodes = metrics.report()["nodes"]
+        assert nodes["make_toc"]["prompt_tokens"] == 100
+        assert nodes["make_toc"]["estimated_tokens"] is False
+        assert nodes["make_toc"]["cost"] == pytest.approx(0.0007)
+        assert nodes["write_slides"]["llm_calls"] == 2
+        assert nodes["write_slides"]["cache_hits"] == 1
+        assert nodes["write_slides"]["prompt_tokens"] == 10
+        assert nodes["write_slides"]["completion_tokens"] == 2
+        assert nodes["write_slides"]["estimated_tokens"] is True
+        assert nodes["write_slides"]["chars_in"] == 80
+
+    def test_node_runs_and_errors(self):
+        """Test node timing, retry and error counts."""
+        metrics = RunMetrics()
+
+        for _ in range(3):
+            with metrics.time_node("evaluate_slides"):
+                pass
+        metrics.record_node_error("evaluate_slides")
+
+        stats = metrics.report()["nodes"]["evaluate_slides"]
+        assert stats["runs"] == 3
+        assert stats["retries"] == 2
+        assert stats["errors"] == 1
+        assert stats["seconds"] >= 0
+
+    def test_search_retries_attributed_to_query(self):
+        """Test that retries are counted on the search that needed them."""
+        metrics = RunMetrics()
+
+        metrics.record_search_retry("q1")
+        metrics.record_search_retry("q1")
+        metrics.record_search("q2", 0.1, results=3, cached=True)
+        metrics.record_search("q1", 1.5, results=5)
+        metrics.record_search("q3", 0.2, error="boom")
+
+        report = metrics.report()
+        assert [s["retries"] for s in report["searches"]] == [0, 2, 0]
+        totals = report["totals"]
+        assert totals["searches"] == 3
+        assert totals["search_cache_hits"] == 1
+        assert totals["search_retries"] == 2
+        assert totals["search_errors"] == 1
+
+    def test_write_json_and_prometheus(self, tmp_path):
+        """Test the JSON report and the Prometheus textfile."""
+        metrics = RunMetrics()
+        with metrics.time_node("make_toc"):
+            metrics.record_llm("make_toc", "prompt", "answer")
+        metrics.record_search("q", 0.5, results=2)
+
+        json_path = tmp_path / "metrics" / "run.json"
+        prom_path = tmp_path / "metrics" / "run.prom"
+        metrics.write_json(str(json_path))
+        metrics.write_prometheus(str(prom_path))
+
+        report = json.loads(json_path.read_text(encoding="utf-8"))
+        assert report["totals"]["llm_calls"] == 1
+        text = prom_path.read_text(encoding="utf-8")
+        assert "# TYPE security_news_node_runs gauge" in text
+        assert 'security_news_node_runs{node="make_toc"} 1' in text
+        assert "security_news_search_requests 1" in text
+        assert text.endswith("\n")
+
+
 class TestSanitizeFilename:
     """Test cases for sanitize_filename function."""
 